@@ -0,0 +1,5 @@
+"""Performance benchmarks for the Bitaxe integration against a simulated fleet."""
+from pathlib import Path
+
+DOMAIN = "bitaxe"
+INTEGRATION_PATH = Path(__file__).parent.parent / "custom_components" / DOMAIN
@@ -0,0 +1,772 @@
+"""Command line entry point: ``python -m benchmarks``."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+from datetime import UTC, datetime
+from ipaddress import IPv4Network
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from . import INTEGRATION_PATH
+
+if TYPE_CHECKING:
+    from .fake_axeos import FakeFleetConfig
+
+# Benchmarks are imported by their command, so ``parse`` and ``autotune``
+# run without Home Assistant installed
+
+# Metrics where a higher value is worse, compared by ``compare``
+COMPARED_METRICS = (
+    "setup_seconds",
+    "cycle_seconds_p95",
+    "cpu_ms_per_miner_cycle",
+    "state_writes_per_cycle",
+    "loop_lag_ms_p95",
+    "memory_bytes_per_miner",
+)
+
+
+def _versions() -> dict[str, str | None]:
+    """Return the versions the results were measured with."""
+    try:
+        from homeassistant.const import __version__ as ha_version
+    except ImportError:
+        ha_version = None
+
+    manifest = json.loads((INTEGRATION_PATH / "manifest.json").read_text())
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=INTEGRATION_PATH,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "integration": manifest.get("version"),
+        "commit": commit,
+        "homeassistant": ha_version,
+        "python": platform.python_version(),
+    }
+
+
+def _fleet_config(
+    args: argparse.Namespace, asic_count: int | None = None
+) -> FakeFleetConfig:
+    """Return the simulated fleet described by the command line."""
+    from .fake_axeos import FakeFleetConfig
+
+    return FakeFleetConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        asic_count=args.asics if asic_count is None else asic_count,
+        payload_bytes=args.payload_bytes,
+        statistics=not args.no_statistics,
+        log_interval=args.log_interval,
+        seed=args.seed,
+    )
+
+
+def _write(report: dict[str, Any], output: str | None) -> None:
+    """Write a report as JSON to a file, or to stdout."""
+    text = json.dumps(report, indent=2)
+    if output:
+        Path(output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+def _run(args: argparse.Namespace) -> int:
+    """Run the benchmark for each fleet size and write the results."""
+    from .harness import async_run_benchmark
+
+    fleet_config = _fleet_config(args)
+    options: dict[str, Any] = json.loads(args.options) if args.options else {}
+
+    results = []
+    for miners in args.miners:
+        result = asyncio.run(
+            async_run_benchmark(
+                miners, args.cycles, fleet_config, options, args.trace_memory
+            )
+        )
+        results.append(result.as_dict())
+        print(
+            f"{miners:>5} miners: setup {result.setup_seconds:.2f}s, "
+            f"cycle p95 {result.cycle_seconds_p95 * 1000:.1f}ms, "
+            f"{result.cpu_ms_per_miner_cycle:.3f}ms CPU/miner, "
+            f"{result.state_writes_per_cycle:.0f} writes/cycle, "
+            f"lag p95 {result.loop_lag_ms_p95:.1f}ms",
+            file=sys.stderr,
+        )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "fleet": vars(fleet_config),
+        "options": options,
+        "cycles": args.cycles,
+        "trace_memory": args.trace_memory,
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _asics(args: argparse.Namespace) -> int:
+    """Compare per-ASIC sensors with the aggregates for each ASIC count."""
+    from .harness import async_run_benchmark
+
+    results = []
+    for asics in args.asics:
+        fleet_config = _fleet_config(args, asic_count=asics)
+        for per_asic in (False, True):
+            options = {"per_asic_sensors": per_asic}
+            result = asyncio.run(
+                async_run_benchmark(
+                    args.miners, args.cycles, fleet_config, options, args.trace_memory
+                )
+            )
+            results.append({"asics": asics, **options, **result.as_dict()})
+            memory = result.memory_bytes_per_miner
+            print(
+                f"{asics:>3} ASICs, {'per-ASIC' if per_asic else 'aggregate'}: "
+                f"reload {result.reload_seconds:.2f}s, "
+                f"{result.registry_entries} registry entries, "
+                f"{result.entities} entities, "
+                + (
+                    f"{memory / 1024:.0f} KiB/miner ({result.memory_method})"
+                    if memory is not None
+                    else "memory unavailable"
+                ),
+                file=sys.stderr,
+            )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "miners": args.miners,
+        "cycles": args.cycles,
+        "trace_memory": args.trace_memory,
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _polling(args: argparse.Namespace) -> int:
+    """Compare coordinator timers with the fleet scheduler for each fleet size."""
+    from .polling import async_run_polling
+
+    fleet_config = _fleet_config(args)
+    results = []
+    for miners in args.miners:
+        for fleet_polling in (False, True):
+            result = asyncio.run(
+                async_run_polling(miners, args.duration, fleet_config, fleet_polling)
+            )
+            results.append(result.as_dict())
+            print(
+                f"{miners:>5} miners, {'fleet' if fleet_polling else 'timers'}: "
+                f"{result.refreshes} refreshes, "
+                f"refresh p95 {result.refresh_seconds_p95 * 1000:.1f}ms, "
+                f"cycle max {result.cycle_seconds_max * 1000:.1f}ms, "
+                f"{result.max_concurrent_refreshes} concurrent, "
+                f"lag p95 {result.loop_lag_ms_p95:.1f}ms "
+                f"max {result.loop_lag_ms_max:.1f}ms",
+                file=sys.stderr,
+            )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "fleet": vars(fleet_config),
+        "duration": args.duration,
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _push(args: argparse.Namespace) -> int:
+    """Compare overheat detection latency of push updates and polling."""
+    from .push import async_run_push
+
+    fleet_config = _fleet_config(args)
+    results = []
+    for miners in args.miners:
+        for push_updates in (False, True):
+            result = asyncio.run(
+                async_run_push(
+                    miners, fleet_config, push_updates, args.quiet, args.spread
+                )
+            )
+            results.append(result.as_dict())
+            print(
+                f"{miners:>5} miners, {'push' if push_updates else 'polling'}: "
+                f"{result.detected}/{miners} detected, "
+                f"latency p50 {result.latency_seconds_p50:.2f}s "
+                f"p95 {result.latency_seconds_p95:.2f}s, "
+                f"{result.info_requests_per_miner_minute:.2f} requests/miner/min",
+                file=sys.stderr,
+            )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "fleet": vars(fleet_config),
+        "quiet": args.quiet,
+        "spread": args.spread,
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _connections(args: argparse.Namespace) -> int:
+    """Compare the connections of the integration's pool and the shared session."""
+    from .connections import async_run_connections
+
+    fleet_config = _fleet_config(args)
+    results = []
+    for miners in args.miners:
+        for dedicated in (False, True):
+            result = asyncio.run(
+                async_run_connections(
+                    miners, args.cycles, args.interval, fleet_config, dedicated
+                )
+            )
+            results.append(result.as_dict())
+            print(
+                f"{miners:>5} miners, {result.session:<9}: "
+                f"{result.connections} connections for {result.requests} requests, "
+                f"refresh p50 {result.refresh_seconds_p50 * 1000:.1f}ms "
+                f"p95 {result.refresh_seconds_p95 * 1000:.1f}ms, "
+                f"{result.failed_refreshes} failed",
+                file=sys.stderr,
+            )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "fleet": vars(fleet_config),
+        "cycles": args.cycles,
+        "interval": args.interval,
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _startup(args: argparse.Namespace) -> int:
+    """Compare restarts with offline miners, with and without snapshots."""
+    from .startup import async_run_startup
+
+    fleet_config = _fleet_config(args)
+    results = []
+    for offline in args.offline:
+        for snapshots in (False, True):
+            result = asyncio.run(
+                async_run_startup(args.miners, offline, fleet_config, snapshots)
+            )
+            results.append(result.as_dict())
+            print(
+                f"{offline:>5}/{args.miners} offline, "
+                f"{'snapshots' if snapshots else 'no snapshots'}: "
+                f"startup {result.startup_seconds:.2f}s, "
+                f"setup {result.setup_seconds:.2f}s, "
+                f"{result.entries_loaded} loaded, {result.entries_retrying} retrying, "
+                f"{result.entities} entities "
+                f"({result.entities_unavailable} unavailable)",
+                file=sys.stderr,
+            )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "fleet": vars(fleet_config),
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _scan(args: argparse.Namespace) -> int:
+    """Scan a loopback network with simulated miners at each concurrency."""
+    from .scan import async_run_scan
+
+    fleet_config = _fleet_config(args)
+    network = IPv4Network(args.network)
+    results = []
+    for concurrency in args.concurrency:
+        result = asyncio.run(
+            async_run_scan(network, args.miners, args.silent, concurrency, fleet_config)
+        )
+        results.append(result.as_dict())
+        print(
+            f"{result.addresses} addresses, concurrency {concurrency:>4}: "
+            f"{result.found}/{args.miners} found in {result.scan_seconds:.2f}s, "
+            f"{result.addresses_per_second:.0f} addresses/s",
+            file=sys.stderr,
+        )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "fleet": vars(fleet_config),
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _memory(args: argparse.Namespace) -> int:
+    """Break the memory of each fleet size down with tracemalloc."""
+    from .memory import async_run_memory
+
+    fleet_config = _fleet_config(args)
+    results = []
+    for miners in args.miners:
+        result = asyncio.run(async_run_memory(miners, args.cycles, fleet_config, args.top))
+        results.append(result.as_dict())
+        print(
+            f"{miners:>5} miners: {result.bytes_per_miner / 1024:.0f} KiB/miner, "
+            f"{result.bytes_per_entity / 1024:.1f} KiB/entity, "
+            f"integration {result.integration_bytes_per_miner / 1024:.0f} KiB/miner",
+            file=sys.stderr,
+        )
+        for line in result.top:
+            print(
+                f"      {line['line']:<28} {line['bytes_per_miner'] / 1024:>8.1f} KiB/miner "
+                f"{line['blocks_per_miner']:>8.0f} blocks/miner",
+                file=sys.stderr,
+            )
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "fleet": vars(fleet_config),
+        "cycles": args.cycles,
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _parse(args: argparse.Namespace) -> int:
+    """Compare JSON decoders on the sample payloads."""
+    from .parse import run_parse
+
+    results = run_parse(args.repeat)
+    for result in results:
+        print(
+            f"{result.payload:<26} {result.payload_bytes:>6}B {result.decoder:<10} "
+            f"{result.microseconds_per_parse:>8.2f}us "
+            f"{result.peak_bytes_per_parse:>8}B peak",
+            file=sys.stderr,
+        )
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "results": [result.as_dict() for result in results],
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _extraction(args: argparse.Namespace) -> int:
+    """Compare per-entity value functions with the value table."""
+    from .extraction import run_extraction
+
+    results = []
+    for asics in args.asics:
+        for result in run_extraction(asics, args.refreshes, args.seed):
+            results.append(result.as_dict())
+            print(
+                f"{asics:>4} ASICs, {result.method:<18} {result.sensors:>4} sensors: "
+                f"{result.microseconds_per_refresh:>8.1f}us/refresh",
+                file=sys.stderr,
+            )
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "refreshes": args.refreshes,
+        "results": results,
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _energy(args: argparse.Namespace) -> int:
+    """Compare the energy error and CPU cost of the sample intervals."""
+    from .energy import load_trace, run_energy, synthetic_trace
+
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(args.hours, args.seed)
+    results = run_energy(trace, args.intervals, args.refresh_interval)
+    for result in results:
+        print(
+            f"interval {result.sample_interval or args.refresh_interval:>4}s"
+            f"{' (refreshes)' if not result.sample_interval else '':<12}"
+            f"{result.samples_per_hour:>7.0f} samples/h, "
+            f"error {result.error_percent:+.3f}%, "
+            f"{result.cpu_ms_per_hour:.2f}ms CPU/h",
+            file=sys.stderr,
+        )
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "versions": _versions(),
+        "trace": args.trace or {"hours": args.hours, "seed": args.seed},
+        "refresh_interval": args.refresh_interval,
+        "results": [result.as_dict() for result in results],
+    }
+    _write(report, args.output)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    """Compare two result files; fail if a metric regressed past the threshold."""
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    by_size = {result["miners"]: result for result in baseline["results"]}
+
+    regressed = False
+    for result in current["results"]:
+        if (base := by_size.get(result["miners"])) is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            flag = ""
+            if change > args.threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            print(
+                f"{result['miners']:>5} {metric:<28} {old:>12.3f} -> {new:>12.3f} "
+                f"({change:+.1f}%){flag}"
+            )
+    return 1 if regressed else 0
+
+
+def _load_integration_module(name: str) -> ModuleType:
+    """Load a module of the integration that does not need Home Assistant.
+
+    Importing it from the package would run the package's ``__init__``,
+    which does.
+    """
+    spec = importlib.util.spec_from_file_location(
+        f"bitaxe_{name}", INTEGRATION_PATH / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    # Dataclasses look their module up while they are created
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _autotune(args: argparse.Namespace) -> int:
+    """Run the autotuner's search against simulated miners."""
+    const = _load_integration_module("const")
+    tuning = _load_integration_module("tuning")
+
+    start = (args.frequency, args.voltage)
+    runs = []
+    for seed in range(args.seeds):
+        miner = tuning.BitaxeSimulatedMiner(noise=args.noise, seed=seed)
+        search = tuning.TuningSearch(
+            tuning.tuning_grid(
+                None,
+                args.frequency,
+                const.AUTOTUNE_FREQUENCY_STEP,
+                const.AUTOTUNE_FREQUENCY_SPREAD,
+            ),
+            tuning.tuning_grid(
+                None, args.voltage, const.AUTOTUNE_VOLTAGE_STEP, const.AUTOTUNE_VOLTAGE_SPREAD
+            ),
+            start,
+            tuning.TuningBounds(
+                max_temp=args.temp_target + const.AUTOTUNE_TEMP_MARGIN,
+                max_power=args.max_power,
+                max_vr_temp=const.AUTOTUNE_MAX_VR_TEMP,
+                min_hashrate_ratio=const.AUTOTUNE_MIN_HASHRATE_RATIO,
+                max_hashrate_cv=const.AUTOTUNE_MAX_HASHRATE_CV,
+            ),
+            const.AUTOTUNE_MAX_STEPS,
+            const.AUTOTUNE_EFFICIENCY_TOLERANCE,
+        )
+        best = tuning.simulate(search, miner)
+        # Compare on the noise-free model
+        exact = tuning.BitaxeSimulatedMiner(noise=0.0)
+        runs.append(
+            {
+                "seed": seed,
+                "settings_measured": len(search.history),
+                "result": best.as_dict() if best else None,
+                "result_efficiency": (
+                    round(exact.measure(best.frequency, best.core_voltage).efficiency, 2)
+                    if best
+                    else None
+                ),
+                "start_efficiency": round(exact.measure(*start).efficiency, 2),
+                "pareto": [m.as_dict() for m in search.pareto],
+                "history": [m.as_dict() for m in search.history],
+            }
+        )
+        print(
+            f"seed {seed}: {len(search.history)} settings, "
+            + (
+                f"{best.frequency} MHz at {best.core_voltage} mV, "
+                f"{runs[-1]['result_efficiency']} J/TH "
+                f"(start {runs[-1]['start_efficiency']} J/TH)"
+                if best
+                else "no acceptable setting"
+            ),
+            file=sys.stderr,
+        )
+
+    _write({"versions": _versions(), "runs": runs}, args.output)
+    return 0
+
+
+def _add_fleet_arguments(parser: argparse.ArgumentParser, asics: bool = True) -> None:
+    """Add the options of the simulated miners."""
+    parser.add_argument("--latency", type=float, default=0.02, help="response latency, s")
+    parser.add_argument("--jitter", type=float, default=0.01, help="latency jitter, s")
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0, help="share of failed requests"
+    )
+    if asics:
+        parser.add_argument("--asics", type=int, default=1, help="ASICs per miner")
+    parser.add_argument(
+        "--payload-bytes", type=int, default=0, help="minimum info payload size"
+    )
+    parser.add_argument(
+        "--no-statistics", action="store_true", help="firmware without statistics"
+    )
+    parser.add_argument(
+        "--log-interval", type=float, default=1.0, help="seconds between log lines"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+
+
+def main() -> int:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="benchmark a simulated fleet")
+    run.add_argument(
+        "--miners", type=int, nargs="+", default=[1, 10, 100], help="fleet sizes"
+    )
+    run.add_argument("--cycles", type=int, default=10, help="refresh cycles per size")
+    _add_fleet_arguments(run)
+    run.add_argument(
+        "--options", help='entry options as JSON, e.g. \'{"per_asic_sensors": true}\''
+    )
+    run.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="measure memory with tracemalloc (exact, but slows timings)",
+    )
+    run.add_argument("--output", help="write the JSON results to this file")
+    run.set_defaults(func=_run)
+
+    asics = commands.add_parser(
+        "asics", help="compare per-ASIC sensors with the aggregate sensors"
+    )
+    asics.add_argument("--miners", type=int, default=50, help="fleet size")
+    asics.add_argument(
+        "--asics", type=int, nargs="+", default=[1, 6, 16], help="ASICs per miner"
+    )
+    asics.add_argument("--cycles", type=int, default=3, help="refresh cycles")
+    _add_fleet_arguments(asics, asics=False)
+    asics.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="measure memory with tracemalloc (exact, but slows timings)",
+    )
+    asics.add_argument("--output", help="write the JSON results to this file")
+    asics.set_defaults(func=_asics)
+
+    polling = commands.add_parser(
+        "polling", help="compare coordinator timers with the fleet scheduler"
+    )
+    polling.add_argument(
+        "--miners", type=int, nargs="+", default=[10, 100, 500], help="fleet sizes"
+    )
+    polling.add_argument(
+        "--duration",
+        type=float,
+        default=65,
+        help="seconds to poll per size and mode (the poll interval is 30 s)",
+    )
+    _add_fleet_arguments(polling)
+    polling.add_argument("--output", help="write the JSON results to this file")
+    polling.set_defaults(func=_polling)
+
+    push = commands.add_parser(
+        "push", help="compare overheat detection latency of push and polling"
+    )
+    push.add_argument(
+        "--miners", type=int, nargs="+", default=[10, 100], help="fleet sizes"
+    )
+    push.add_argument(
+        "--quiet",
+        type=float,
+        default=60,
+        help="seconds of routine log lines before the overheats, to count requests",
+    )
+    push.add_argument(
+        "--spread", type=float, default=30, help="seconds to spread the overheats over"
+    )
+    _add_fleet_arguments(push)
+    push.add_argument("--output", help="write the JSON results to this file")
+    push.set_defaults(func=_push)
+
+    connections = commands.add_parser(
+        "connections", help="count connections with and without the integration's pool"
+    )
+    connections.add_argument(
+        "--miners", type=int, nargs="+", default=[10, 100], help="fleet sizes"
+    )
+    connections.add_argument("--cycles", type=int, default=4, help="refresh cycles")
+    connections.add_argument(
+        "--interval",
+        type=float,
+        default=20,
+        help="seconds between cycles (Home Assistant keeps connections alive 15 s)",
+    )
+    _add_fleet_arguments(connections)
+    connections.add_argument("--output", help="write the JSON results to this file")
+    connections.set_defaults(func=_connections)
+
+    startup = commands.add_parser(
+        "startup", help="compare restarts with offline miners, with and without snapshots"
+    )
+    startup.add_argument("--miners", type=int, default=50, help="fleet size")
+    startup.add_argument(
+        "--offline",
+        type=int,
+        nargs="+",
+        default=[0, 10, 50],
+        help="miners that do not answer after the restart",
+    )
+    _add_fleet_arguments(startup)
+    startup.add_argument("--output", help="write the JSON results to this file")
+    startup.set_defaults(func=_startup)
+
+    scan = commands.add_parser(
+        "scan", help="scan a loopback network with simulated miners (Linux)"
+    )
+    scan.add_argument(
+        "--network", default="127.77.0.0/22", help="network within 127.0.0.0/8"
+    )
+    scan.add_argument("--miners", type=int, default=100, help="miners in the network")
+    scan.add_argument(
+        "--silent",
+        type=int,
+        default=200,
+        help="addresses that never answer; the rest refuse connections",
+    )
+    scan.add_argument(
+        "--concurrency", type=int, nargs="+", default=[16, 64, 256], help="probes at once"
+    )
+    _add_fleet_arguments(scan)
+    scan.add_argument("--output", help="write the JSON results to this file")
+    scan.set_defaults(func=_scan)
+
+    memory = commands.add_parser(
+        "memory", help="break memory down by allocation site with tracemalloc"
+    )
+    memory.add_argument(
+        "--miners", type=int, nargs="+", default=[10, 100], help="fleet sizes"
+    )
+    memory.add_argument("--cycles", type=int, default=3, help="refresh cycles")
+    memory.add_argument("--top", type=int, default=10, help="integration lines to list")
+    _add_fleet_arguments(memory)
+    memory.add_argument("--output", help="write the JSON results to this file")
+    memory.set_defaults(func=_memory)
+
+    parse = commands.add_parser(
+        "parse", help="compare JSON decoders on sample payloads"
+    )
+    parse.add_argument("--repeat", type=int, default=5, help="timing runs, best is kept")
+    parse.add_argument("--output", help="write the JSON results to this file")
+    parse.set_defaults(func=_parse)
+
+    extraction = commands.add_parser(
+        "extraction", help="compare sensor value extraction for many-ASIC miners"
+    )
+    extraction.add_argument(
+        "--asics", type=int, nargs="+", default=[1, 6, 16], help="ASICs per miner"
+    )
+    extraction.add_argument(
+        "--refreshes", type=int, default=2000, help="payloads extracted per method"
+    )
+    extraction.add_argument("--seed", type=int, default=0, help="random seed")
+    extraction.add_argument("--output", help="write the JSON results to this file")
+    extraction.set_defaults(func=_extraction)
+
+    energy = commands.add_parser(
+        "energy", help="replay a power trace at several energy sample intervals"
+    )
+    energy.add_argument(
+        "--trace", help="CSV of seconds and W, one reading per row (default synthetic)"
+    )
+    energy.add_argument(
+        "--hours", type=float, default=6, help="length of the synthetic trace"
+    )
+    energy.add_argument(
+        "--intervals",
+        type=int,
+        nargs="+",
+        default=[0, 1, 5, 10],
+        help="sample intervals, s (0 samples on the regular refreshes only)",
+    )
+    energy.add_argument(
+        "--refresh-interval",
+        type=int,
+        default=30,
+        help="seconds between regular refreshes (the poll interval is 30 s)",
+    )
+    energy.add_argument("--seed", type=int, default=0, help="random seed")
+    energy.add_argument("--output", help="write the JSON results to this file")
+    energy.set_defaults(func=_energy)
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument(
+        "--threshold", type=float, default=10.0, help="allowed increase in percent"
+    )
+    compare.set_defaults(func=_compare)
+
+    autotune = commands.add_parser(
+        "autotune", help="run the autotuner search against simulated miners"
+    )
+    autotune.add_argument("--seeds", type=int, default=5, help="simulated miners")
+    autotune.add_argument("--noise", type=float, default=0.01, help="measurement noise")
+    autotune.add_argument("--frequency", type=int, default=525, help="start, MHz")
+    autotune.add_argument("--voltage", type=int, default=1150, help="start, mV")
+    autotune.add_argument("--temp-target", type=float, default=60, help="°C")
+    autotune.add_argument("--max-power", type=float, default=40, help="W")
+    autotune.add_argument("--output", help="write the JSON results to this file")
+    autotune.set_defaults(func=_autotune)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Count the TCP connections the miners accept, with and without the pool."""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.bitaxe.const import SESSION_DATA_KEY
+from custom_components.bitaxe.session import BitaxeConnectionStats, BitaxeSession
+
+from .fake_axeos import FakeAxeOSFleet, FakeFleetConfig
+from .harness import (
+    DOMAIN,
+    async_add_miner,
+    async_start_hass,
+    percentile,
+    raise_file_limit,
+)
+
+
+@dataclass
+class ConnectionsResult:
+    """Connections and refresh times of one fleet size and session."""
+
+    miners: int
+    # "dedicated" is the integration's pool, "shared" Home Assistant's session
+    session: str
+    cycles: int
+    interval_seconds: float
+    requests: int
+    connections: int
+    connections_per_request: float
+    failed_refreshes: int
+    refresh_seconds_p50: float
+    refresh_seconds_p95: float
+    # New and reused connections as counted by the integration's pool
+    client_created: int
+    client_reused: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+async def async_run_connections(
+    miners: int,
+    cycles: int,
+    interval: float,
+    fleet_config: FakeFleetConfig,
+    dedicated: bool,
+) -> ConnectionsResult:
+    """Refresh the fleet ``cycles`` times, ``interval`` seconds apart.
+
+    With ``dedicated`` false, the miners are polled through Home
+    Assistant's shared session, as before the integration had its own pool.
+    """
+    raise_file_limit()
+    fleet = FakeAxeOSFleet(miners, fleet_config)
+    fleet.start()
+    with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as config_dir:
+        hass = await async_start_hass(config_dir)
+        try:
+            if dedicated:
+                return await _async_measure(hass, fleet, cycles, interval, "dedicated")
+            shared = BitaxeSession(async_get_clientsession(hass), BitaxeConnectionStats())
+            with patch(
+                "custom_components.bitaxe.async_get_bitaxe_session",
+                return_value=shared,
+            ):
+                return await _async_measure(hass, fleet, cycles, interval, "shared")
+        finally:
+            await hass.async_stop(force=True)
+            fleet.stop()
+
+
+async def _async_measure(
+    hass: HomeAssistant,
+    fleet: FakeAxeOSFleet,
+    cycles: int,
+    interval: float,
+    session: str,
+) -> ConnectionsResult:
+    """Set the fleet up and count the connections of the refresh cycles."""
+    await asyncio.gather(*(async_add_miner(hass, miner.host) for miner in fleet.miners))
+    await hass.async_block_till_done()
+    coordinators = [
+        hass.data[DOMAIN][entry.entry_id]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+    async def _async_refresh(coordinator) -> None:
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        durations.append(time.perf_counter() - start)
+
+    durations: list[float] = []
+    failed = 0
+    # Home Assistant's session has no counts
+    bitaxe_session = hass.data.get(SESSION_DATA_KEY)
+    client = bitaxe_session.stats if bitaxe_session else BitaxeConnectionStats()
+    created, reused = client.created.total(), client.reused.total()
+    before = fleet.stats
+    for cycle in range(cycles):
+        if cycle:
+            # Longer than Home Assistant's keep-alive, like the poll interval
+            await asyncio.sleep(interval)
+        for coordinator in coordinators:
+            coordinator.client.invalidate_cache()
+        await asyncio.gather(*(_async_refresh(c) for c in coordinators))
+        failed += sum(not c.last_update_success for c in coordinators)
+    after = fleet.stats
+
+    requests = after.requests - before.requests
+    connections = after.connections - before.connections
+    return ConnectionsResult(
+        miners=len(fleet.miners),
+        session=session,
+        cycles=cycles,
+        interval_seconds=interval,
+        requests=requests,
+        connections=connections,
+        connections_per_request=connections / requests if requests else 0.0,
+        failed_refreshes=failed,
+        refresh_seconds_p50=percentile(durations, 50),
+        refresh_seconds_p95=percentile(durations, 95),
+        client_created=client.created.total() - created,
+        client_reused=client.reused.total() - reused,
+    )
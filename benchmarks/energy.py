@@ -0,0 +1,126 @@
+"""Replay a power trace to compare energy sample intervals."""
+from __future__ import annotations
+
+import csv
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from custom_components.bitaxe.backfill import trapezoid
+
+from .parse import decoders, load_payloads
+
+# Power of the synthetic trace, W: the autotuner steps between settings
+TRACE_SETTINGS = (12.0, 14.5, 17.0, 19.5, 22.0, 16.0)
+# Seconds at each setting, as the autotuner measures them
+TRACE_STEP_SECONDS = 600
+
+
+@dataclass
+class EnergyResult:
+    """Energy error and CPU cost of one sample interval."""
+
+    # 0 samples on the regular refreshes only, every ``refresh_interval``
+    sample_interval: int
+    samples_per_hour: float
+    energy_kwh: float
+    true_energy_kwh: float
+    error_percent: float
+    # Decoding a full /api/system/info payload per sample, and integrating it
+    cpu_ms_per_hour: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+def synthetic_trace(hours: float, seed: int) -> list[tuple[float, float]]:
+    """Return a 1 Hz trace of (seconds, W) of a miner being autotuned.
+
+    Every step ramps to the next setting within a few seconds; the
+    power is noisy and dips now and then, as when a share is rejected.
+    """
+    rng = random.Random(seed)
+    trace = []
+    power = TRACE_SETTINGS[0]
+    for second in range(int(hours * 3600) + 1):
+        target = TRACE_SETTINGS[second // TRACE_STEP_SECONDS % len(TRACE_SETTINGS)]
+        power += (target - power) * 0.3
+        reading = power + rng.gauss(0, 0.3)
+        if rng.random() < 0.002:
+            reading *= 0.6
+        trace.append((float(second), max(reading, 0.0)))
+    return trace
+
+
+def load_trace(path: str) -> list[tuple[float, float]]:
+    """Return a trace from a CSV of seconds and W, one reading per row."""
+    with Path(path).open(newline="") as file:
+        rows = [row for row in csv.reader(file) if row and not row[0].startswith("#")]
+    trace = []
+    for row in rows:
+        try:
+            trace.append((float(row[0]), float(row[1])))
+        except ValueError:
+            # A header
+            continue
+    trace.sort()
+    return trace
+
+
+def _integrate(trace: list[tuple[float, float]], interval: float) -> tuple[float, int]:
+    """Return the energy and sample count of sampling ``trace`` every ``interval``."""
+    epoch = datetime(2024, 1, 1, tzinfo=UTC)
+    energy = 0.0
+    samples = 0
+    previous: tuple[datetime, float] | None = None
+    due = trace[0][0]
+    for seconds, power in trace:
+        if seconds < due:
+            continue
+        due = seconds + interval
+        now = epoch + timedelta(seconds=seconds)
+        if previous is not None:
+            energy += trapezoid(previous[0], previous[1], now, power)
+        previous = (now, power)
+        samples += 1
+    return energy, samples
+
+
+def run_energy(
+    trace: list[tuple[float, float]],
+    intervals: list[int],
+    refresh_interval: int,
+) -> list[EnergyResult]:
+    """Sample ``trace`` at each interval and compare with every reading."""
+    hours = (trace[-1][0] - trace[0][0]) / 3600
+    true_energy, _ = _integrate(trace, 0)
+    # The client decodes with orjson when it is installed
+    available = decoders()
+    decode = available.get("orjson", available["json"])
+    payload = max(load_payloads().values(), key=len)
+
+    results = []
+    for interval in intervals:
+        energy, samples = _integrate(trace, interval or refresh_interval)
+        start = time.process_time()
+        for _ in range(samples):
+            decode(payload)
+        _integrate(trace, interval or refresh_interval)
+        cpu = time.process_time() - start
+        results.append(
+            EnergyResult(
+                sample_interval=interval,
+                samples_per_hour=samples / hours,
+                energy_kwh=energy,
+                true_energy_kwh=true_energy,
+                error_percent=(
+                    (energy - true_energy) / true_energy * 100 if true_energy else 0.0
+                ),
+                cpu_ms_per_hour=cpu * 1000 / hours,
+            )
+        )
+    return results
@@ -0,0 +1,149 @@
+"""CPU per refresh of sensor value extraction for a miner with many ASICs."""
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from operator import itemgetter
+from typing import Any
+
+from custom_components.bitaxe.coordinator import BitaxeValueTable
+from custom_components.bitaxe.sensor import ASIC_SENSOR_DESCRIPTIONS, SENSOR_DESCRIPTIONS
+
+from .fake_axeos import FakeFleetConfig, FakeMiner
+
+
+@dataclass
+class ExtractionResult:
+    """Extraction cost of one method."""
+
+    method: str
+    asics: int
+    sensors: int
+    refreshes: int
+    microseconds_per_refresh: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+Sensor = tuple[Callable[[dict[str, Any]], Any], tuple[str, ...]]
+
+
+def _lambdas(data: dict[str, Any]) -> list[Sensor]:
+    """Return the value function and source keys every entity used to have."""
+    sensors: list[Sensor] = [
+        (
+            description.value_fn or (lambda d, key=description.key: d.get(key)),
+            description.source_keys or (description.key,),
+        )
+        for description in SENSOR_DESCRIPTIONS
+        if description.key in data or description.always_create
+    ]
+    for index in range(len(data.get("asicTemps", []))):
+        sensors.append(
+            (
+                lambda d, idx=index: (
+                    d.get("asicTemps", [])[idx]
+                    if len(d.get("asicTemps", [])) > idx
+                    else None
+                ),
+                ("asicTemps",),
+            )
+        )
+    for index in range(len(data.get("hashrateMonitor", {}).get("asics", []))):
+        sensors.append(
+            (
+                lambda d, idx=index: (
+                    d.get("hashrateMonitor", {}).get("asics", [])[idx].get("total")
+                    if len(d.get("hashrateMonitor", {}).get("asics", [])) > idx
+                    else None
+                ),
+                ("hashrateMonitor",),
+            )
+        )
+        sensors.append(
+            (
+                lambda d, idx=index: (
+                    d.get("hashrateMonitor", {}).get("asics", [])[idx].get("errorCount")
+                    if len(d.get("hashrateMonitor", {}).get("asics", [])) > idx
+                    else None
+                ),
+                ("hashrateMonitor",),
+            )
+        )
+    return sensors
+
+
+def _value_table(
+    data: dict[str, Any],
+) -> tuple[BitaxeValueTable, list[tuple[int, tuple[str, ...]]]]:
+    """Register the extractors like the sensor platform does.
+
+    Return the table and the slot and source keys of every sensor.
+    """
+    table = BitaxeValueTable()
+    sensors: list[tuple[int, tuple[str, ...]]] = []
+    for description in SENSOR_DESCRIPTIONS:
+        if description.key in data or description.always_create:
+            keys = description.source_keys or (description.key,)
+            slot = table.register(description.value_fn or itemgetter(description.key), keys)
+            sensors.append((slot, keys))
+    # The aggregate sensors are left out, the per-entity lambdas had none
+    for description in ASIC_SENSOR_DESCRIPTIONS:
+        keys = description.source_keys
+        count = len(description.array_fn(data))
+        slot = table.register_array(description.array_fn, keys, count)
+        sensors.extend((slot + index, keys) for index in range(count))
+    return table, sensors
+
+
+def run_extraction(asics: int, refreshes: int, seed: int) -> list[ExtractionResult]:
+    """Extract every sensor value from ``refreshes`` changing payloads.
+
+    Both methods diff the payload once per refresh. Before the value table,
+    every entity whose source keys changed called its own value function,
+    so each per-ASIC entity walked the ASIC list again. The value table
+    evaluates each changed extractor once, and sensors read their slot.
+    """
+    config = FakeFleetConfig(asic_count=asics, seed=seed)
+    miner = FakeMiner(0, config, random.Random(seed))
+    payloads = [miner.system_info() for _ in range(refreshes)]
+    results = []
+
+    lambdas = _lambdas(payloads[0])
+    previous: dict[str, Any] = {}
+    start = time.perf_counter()
+    for data in payloads:
+        # The diff of the former change tracker
+        changed = {
+            key
+            for key in previous.keys() | data.keys()
+            if previous.get(key) != data.get(key)
+        }
+        previous = data
+        for function, keys in lambdas:
+            if not changed.isdisjoint(keys):
+                function(data)
+    elapsed = time.perf_counter() - start
+    results.append(
+        ExtractionResult(
+            "per_entity_lambdas", asics, len(lambdas), refreshes, elapsed / refreshes * 1e6
+        )
+    )
+
+    table, sensors = _value_table(payloads[0])
+    start = time.perf_counter()
+    for data in payloads:
+        table.update(data)
+        values, changed = table.values, table.changed
+        for slot, keys in sensors:
+            if not changed.isdisjoint(keys):
+                values[slot]
+    elapsed = time.perf_counter() - start
+    results.append(
+        ExtractionResult("value_table", asics, len(sensors), refreshes, elapsed / refreshes * 1e6)
+    )
+    return results
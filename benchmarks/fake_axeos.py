@@ -0,0 +1,410 @@
+"""In-process fake AxeOS fleet serving realistic API payloads."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import random
+import socket
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+
+@dataclass(frozen=True)
+class FakeFleetConfig:
+    """How the simulated miners behave."""
+
+    # Base response latency and the random jitter added to it, in seconds
+    latency: float = 0.02
+    jitter: float = 0.01
+    # Share of requests answered with HTTP 503
+    failure_rate: float = 0.0
+    # Number of ASICs per miner reported in hashrateMonitor and asicTemps
+    asic_count: int = 1
+    # Minimum size of a /api/system/info response, padded if needed
+    payload_bytes: int = 0
+    # Serve /api/system/statistics/dashboard like newer firmware does
+    statistics: bool = True
+    # Seconds between routine lines on the /api/ws log stream
+    log_interval: float = 1.0
+    seed: int = 0
+
+
+@dataclass
+class FakeMinerStats:
+    """Requests served by a simulated miner."""
+
+    requests: int = 0
+    failures: int = 0
+    bytes_sent: int = 0
+    # Accepted TCP connections; fewer than requests when they are kept alive
+    connections: int = 0
+
+
+@dataclass
+class FakeMiner:
+    """State of one simulated miner, which drifts with every request."""
+
+    index: int
+    config: FakeFleetConfig
+    rng: random.Random
+    address: str = "127.0.0.1"
+    port: int = 0
+    started: float = field(default_factory=time.monotonic)
+    shares_accepted: int = 0
+    shares_rejected: int = 0
+    overheat_mode: int = 0
+    # Never answer, like a miner without power
+    offline: bool = False
+    stats: FakeMinerStats = field(default_factory=FakeMinerStats)
+    # Transports of the connections seen so far
+    transports: weakref.WeakSet[asyncio.Transport] = field(
+        default_factory=weakref.WeakSet, repr=False
+    )
+
+    @property
+    def host(self) -> str:
+        """Return the host the integration connects to."""
+        return f"{self.address}:{self.port}"
+
+    @property
+    def mac(self) -> str:
+        """Return a unique MAC address."""
+        return "02:ba:{:02x}:{:02x}:{:02x}:{:02x}".format(*self.index.to_bytes(4, "big"))
+
+    def system_info(self) -> dict[str, Any]:
+        """Return a /api/system/info payload for the current moment."""
+        rng = self.rng
+        asic_count = self.config.asic_count
+        self.shares_accepted += rng.randint(0, 3)
+        if rng.random() < 0.02:
+            self.shares_rejected += 1
+
+        per_asic = [500.0 * rng.uniform(0.95, 1.05) for _ in range(asic_count)]
+        temps = [round(rng.uniform(55.0, 65.0), 1) for _ in range(asic_count)]
+        payload: dict[str, Any] = {
+            "ASICModel": "BM1370",
+            "asicCount": asic_count,
+            "autofanspeed": 1,
+            "bestDiff": "4.29G",
+            "bestSessionDiff": "1.02G",
+            "blockFound": 0,
+            "blockHeight": 870000 + int(time.monotonic() - self.started) // 600,
+            "boardVersion": "601",
+            "coreVoltage": 1150,
+            "coreVoltageActual": rng.randint(1140, 1160),
+            "current": round(rng.uniform(9000, 10000), 1),
+            "errorPercentage": round(rng.uniform(0, 0.5), 2),
+            "expectedHashrate": 500.0 * asic_count,
+            "fanrpm": rng.randint(3900, 4100),
+            "fanspeed": 60,
+            "freeHeap": rng.randint(150000, 160000),
+            "frequency": 525,
+            "hashRate": round(sum(per_asic), 2),
+            "hashrateMonitor": {
+                "asics": [
+                    {
+                        "total": round(value, 2),
+                        "domains": [round(value / 4, 2)] * 4,
+                        "errorCount": rng.randint(0, 5),
+                    }
+                    for value in per_asic
+                ]
+            },
+            "asicTemps": temps,
+            "hostname": f"bitaxe-{self.index}",
+            "macAddr": self.mac,
+            "maxPower": 40,
+            "minFanSpeed": 25,
+            "networkDifficulty": 110450000000000,
+            "nominalVoltage": 5,
+            "overclockEnabled": 0,
+            "overheat_mode": self.overheat_mode,
+            "poolDifficulty": 1000,
+            "power": round(15.0 * asic_count * rng.uniform(0.97, 1.03), 2),
+            "responseTime": round(rng.uniform(10, 30), 1),
+            "sharesAccepted": self.shares_accepted,
+            "sharesRejected": self.shares_rejected,
+            "smallCoreCount": 2040,
+            "stratumURL": "public-pool.io",
+            "stratumPort": 21496,
+            "stratumUser": "bc1qexample.bitaxe",
+            "temp": max(temps),
+            "temptarget": 60,
+            "uptimeSeconds": int(time.monotonic() - self.started),
+            "version": "v2.5.0",
+            "voltage": round(rng.uniform(5000, 5100), 1),
+            "vrTemp": rng.randint(45, 55),
+            "wifiRSSI": rng.randint(-70, -50),
+            "wifiStatus": "Connected!",
+        }
+        return payload
+
+    def log_line(self) -> str:
+        """Return a routine line of the ESP-IDF log streamed on /api/ws."""
+        rng = self.rng
+        uptime_ms = int((time.monotonic() - self.started) * 1000)
+        return rng.choice(
+            (
+                f"I ({uptime_ms}) power_management: Vin: {rng.uniform(5.0, 5.1):.2f}V, "
+                f"Vout: 1.15V, Power: {rng.uniform(14.5, 15.5):.2f}W",
+                f"I ({uptime_ms}) asic_result: Ver: 20000000 Nonce {rng.getrandbits(32):08x} "
+                f"diff {rng.uniform(1, 5000):.1f} of 1000.",
+                f"I ({uptime_ms}) stratum_task: rx: "
+                '{"id":null,"method":"mining.notify","params":[]}',
+                f"I ({uptime_ms}) create_jobs_task: New Work Dequeued",
+            )
+        )
+
+    def overheat_line(self) -> str:
+        """Return the log line reporting an overheat."""
+        uptime_ms = int((time.monotonic() - self.started) * 1000)
+        return (
+            f"\x1b[0;31mE ({uptime_ms}) power_management: OVERHEAT! "
+            "VR: 105.0C ASIC: 75.0C\x1b[0m"
+        )
+
+    def asic_info(self) -> dict[str, Any]:
+        """Return a /api/system/asic payload."""
+        return {
+            "ASICModel": "BM1370",
+            "deviceModel": "Gamma",
+            "asicCount": self.config.asic_count,
+            "defaultFrequency": 525,
+            "defaultVoltage": 1150,
+            "frequencyOptions": [400, 490, 525, 575],
+            "voltageOptions": [1000, 1060, 1100, 1150, 1200],
+        }
+
+    def statistics(self) -> dict[str, Any]:
+        """Return a /api/system/statistics/dashboard payload of the last hour."""
+        now = int((time.monotonic() - self.started) * 1000) + 3_600_000
+        rows = [
+            [
+                round(500.0 * self.config.asic_count * self.rng.uniform(0.95, 1.05), 2),
+                round(self.rng.uniform(55.0, 65.0), 1),
+                round(15.0 * self.config.asic_count, 2),
+                now - age * 60_000,
+            ]
+            for age in range(60, 0, -1)
+        ]
+        return {
+            "currentTimestamp": now,
+            "labels": ["hashrate", "asicTemp", "power", "timestamp"],
+            "statistics": rows,
+        }
+
+
+class FakeAxeOSFleet:
+    """A fleet of simulated miners, each listening on its own port.
+
+    With ``addresses``, each miner listens on its own loopback address
+    instead, and all of them on the same port, like miners on a LAN. Linux
+    routes all of 127.0.0.0/8 to the loopback interface.
+
+    The servers run on an event loop in a separate thread, so their CPU
+    time is not counted as part of Home Assistant's event loop.
+    """
+
+    def __init__(
+        self, count: int, config: FakeFleetConfig, addresses: list[str] | None = None
+    ) -> None:
+        """Create the simulated miners."""
+        self.config = config
+        rng = random.Random(config.seed)
+        self._shared_port = addresses is not None
+        self.miners = [
+            FakeMiner(
+                index,
+                config,
+                random.Random(rng.random()),
+                **({"address": addresses[index]} if addresses else {}),
+            )
+            for index in range(count)
+        ]
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._runner: web.AppRunner | None = None
+        self._ready = threading.Event()
+        # Open log streams per miner index
+        self._websockets: dict[int, set[web.WebSocketResponse]] = {}
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="fake-axeos", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        """Stop serving and wait for the thread to exit."""
+        if self._loop is None or self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._async_stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    @property
+    def stats(self) -> FakeMinerStats:
+        """Return the requests served by the whole fleet."""
+        total = FakeMinerStats()
+        for miner in self.miners:
+            total.requests += miner.stats.requests
+            total.failures += miner.stats.failures
+            total.bytes_sent += miner.stats.bytes_sent
+            total.connections += miner.stats.connections
+        return total
+
+    async def async_overheat(self, miner: FakeMiner) -> None:
+        """Make a miner overheat and report it on its log stream.
+
+        Called from another event loop, such as Home Assistant's.
+        """
+        assert self._loop is not None
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._async_overheat(miner), self._loop)
+        )
+
+    async def _async_overheat(self, miner: FakeMiner) -> None:
+        """Set the overheat mode and send the log line."""
+        miner.overheat_mode = 1
+        line = miner.overheat_line()
+        for ws in list(self._websockets.get(miner.index, ())):
+            with contextlib.suppress(ConnectionResetError):
+                await ws.send_str(line)
+
+    def _run(self) -> None:
+        """Run the server event loop."""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._async_start())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _async_start(self) -> None:
+        """Bind a port per miner and start the sites."""
+        app = web.Application()
+        app.router.add_get("/api/system/info", self._handle_info)
+        app.router.add_get("/api/system/asic", self._handle_asic)
+        app.router.add_get(
+            "/api/system/statistics/dashboard", self._handle_statistics
+        )
+        app.router.add_get("/api/ws", self._handle_websocket)
+        app.on_shutdown.append(self._async_close_websockets)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        port = 0
+        for miner in self.miners:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((miner.address, port))
+            miner.port = sock.getsockname()[1]
+            if self._shared_port:
+                port = miner.port
+            site = web.SockSite(self._runner, sock)
+            await site.start()
+
+        self._by_address = {(miner.address, miner.port): miner for miner in self.miners}
+
+    async def _async_close_websockets(self, _app: web.Application) -> None:
+        """Close the open log streams, which would otherwise delay the shutdown."""
+        for websockets in self._websockets.values():
+            for ws in list(websockets):
+                await ws.close()
+
+    async def _async_stop(self) -> None:
+        """Shut the sites down."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def _miner(self, request: web.Request) -> FakeMiner:
+        """Return the miner listening on the request's address and port.
+
+        The request's connection is counted the first time it is seen.
+        """
+        transport = request.transport
+        miner = self._by_address[transport.get_extra_info("sockname")[:2]]
+        if transport not in miner.transports:
+            miner.transports.add(transport)
+            miner.stats.connections += 1
+        return miner
+
+    async def _async_respond(
+        self, request: web.Request, build: str
+    ) -> web.Response:
+        """Answer a request as the miner listening on the request's port."""
+        miner = self._miner(request)
+        config = self.config
+        if miner.offline:
+            # Hold the request until the client gives up
+            while (  # noqa: ASYNC110
+                transport := request.transport
+            ) is not None and not transport.is_closing():
+                await asyncio.sleep(0.5)
+            raise web.HTTPServiceUnavailable
+
+        delay = config.latency + miner.rng.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        miner.stats.requests += 1
+        if miner.rng.random() < config.failure_rate:
+            miner.stats.failures += 1
+            raise web.HTTPServiceUnavailable
+
+        payload = getattr(miner, build)()
+        body = json.dumps(payload, separators=(",", ":"))
+        if build == "system_info" and (missing := config.payload_bytes - len(body)) > 0:
+            # Extra keys stand in for fields of other firmware builds
+            payload["benchmarkPadding"] = "x" * missing
+            body = json.dumps(payload, separators=(",", ":"))
+        miner.stats.bytes_sent += len(body)
+        return web.Response(text=body, content_type="application/json")
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        """Serve /api/system/info."""
+        return await self._async_respond(request, "system_info")
+
+    async def _handle_asic(self, request: web.Request) -> web.Response:
+        """Serve /api/system/asic."""
+        return await self._async_respond(request, "asic_info")
+
+    async def _handle_statistics(self, request: web.Request) -> web.Response:
+        """Serve /api/system/statistics/dashboard."""
+        if not self.config.statistics:
+            raise web.HTTPNotFound
+        return await self._async_respond(request, "statistics")
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """Stream routine log lines on /api/ws until the client goes away."""
+        miner = self._miner(request)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        websockets = self._websockets.setdefault(miner.index, set())
+        websockets.add(ws)
+        sender = asyncio.create_task(self._async_send_log(miner, ws))
+        try:
+            # Reading answers the client's heartbeat pings
+            async for _msg in ws:
+                pass
+        finally:
+            sender.cancel()
+            websockets.discard(ws)
+        return ws
+
+    async def _async_send_log(self, miner: FakeMiner, ws: web.WebSocketResponse) -> None:
+        """Send a routine log line every log interval."""
+        while not ws.closed:
+            await asyncio.sleep(self.config.log_interval)
+            try:
+                await ws.send_str(miner.log_line())
+            except ConnectionResetError:
+                return
@@ -0,0 +1,308 @@
+"""Drive a simulated fleet through the real integration setup and measure it."""
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
+
+from . import DOMAIN, INTEGRATION_PATH
+from .fake_axeos import FakeAxeOSFleet, FakeFleetConfig
+
+# Interval of the event loop lag probe, in seconds
+LAG_PROBE_INTERVAL = 0.01
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one fleet size."""
+
+    miners: int
+    setup_seconds: float
+    setup_cpu_seconds: float
+    entries_loaded: int
+    # Reloading every entry with the final options, like a restart with the
+    # entities already in the entity registry
+    reload_seconds: float
+    registry_entries: int
+    entities: int
+    cycles: int
+    cycle_seconds_mean: float
+    cycle_seconds_p95: float
+    cycle_cpu_seconds_mean: float
+    cpu_ms_per_miner_cycle: float
+    state_changes_per_cycle: float
+    state_writes_per_cycle: float
+    state_writes_suppressed_per_cycle: float
+    failed_refreshes: int
+    loop_lag_ms_max: float
+    loop_lag_ms_p95: float
+    memory_bytes_per_miner: float | None
+    memory_method: str
+    server: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+class LoopLagProbe:
+    """Measure how late the event loop runs a periodically scheduled task."""
+
+    def __init__(self) -> None:
+        """Initialize the probe."""
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start probing."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        """Sleep in small steps and record the overshoot."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.samples.append(time.perf_counter() - start - LAG_PROBE_INTERVAL)
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Return a percentile of the values, 0 if there are none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+def rss_bytes() -> int | None:
+    """Return the resident set size of the process, if known."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def raise_file_limit() -> None:
+    """Allow a socket pair per miner on both ends."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a minimal Home Assistant with the integration available.
+
+    Starting again in the same ``config_dir`` sets the stored entries up,
+    like a restart.
+    """
+    custom_components = Path(config_dir) / "custom_components"
+    if not custom_components.exists():
+        custom_components.mkdir()
+        (custom_components / DOMAIN).symlink_to(
+            INTEGRATION_PATH, target_is_directory=True
+        )
+
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    await bootstrap.async_from_config_dict(
+        {"homeassistant": {"time_zone": "UTC"}, "logger": {"default": "warning"}}, hass
+    )
+    await hass.async_start()
+    return hass
+
+
+async def async_add_miner(hass: HomeAssistant, host: str) -> None:
+    """Add a miner through the config flow, as a user would."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    if result["type"] is FlowResultType.MENU:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"next_step_id": "manual"}
+        )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: host}
+    )
+    if result["type"] is not FlowResultType.CREATE_ENTRY:
+        raise RuntimeError(f"Adding {host} failed: {result.get('errors')}")
+
+
+async def async_run_benchmark(
+    miners: int,
+    cycles: int,
+    fleet_config: FakeFleetConfig,
+    options: dict[str, Any] | None = None,
+    trace_memory: bool = False,
+) -> BenchmarkResult:
+    """Set up ``miners`` simulated miners and refresh them ``cycles`` times.
+
+    Each cycle refreshes every miner concurrently, like a poll interval in
+    which all miners are due. Timing runs without tracemalloc unless
+    ``trace_memory`` is set, in which case memory is exact but slower.
+    """
+    raise_file_limit()
+    fleet = FakeAxeOSFleet(miners, fleet_config)
+    fleet.start()
+    with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as config_dir:
+        hass = await async_start_hass(config_dir)
+        try:
+            return await _async_measure(hass, fleet, cycles, options, trace_memory)
+        finally:
+            await hass.async_stop(force=True)
+            fleet.stop()
+
+
+async def _async_measure(
+    hass: HomeAssistant,
+    fleet: FakeAxeOSFleet,
+    cycles: int,
+    options: dict[str, Any] | None,
+    trace_memory: bool,
+) -> BenchmarkResult:
+    """Run setup and the refresh cycles, collecting the measurements."""
+    miners = len(fleet.miners)
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+        memory_before = tracemalloc.take_snapshot()
+    rss_before = rss_bytes()
+
+    # Setup, through the config flow and entry setup
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    await asyncio.gather(*(async_add_miner(hass, miner.host) for miner in fleet.miners))
+    await hass.async_block_till_done()
+    setup_cpu = time.thread_time() - cpu
+    setup_wall = time.perf_counter() - wall
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if options:
+        for entry in entries:
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, **options}
+            )
+        # The update listener reloads each entry with the new options
+        await hass.async_block_till_done()
+        entries = hass.config_entries.async_entries(DOMAIN)
+    wall = time.perf_counter()
+    await asyncio.gather(
+        *(hass.config_entries.async_reload(entry.entry_id) for entry in entries)
+    )
+    await hass.async_block_till_done()
+    reload_wall = time.perf_counter() - wall
+    registry = er.async_get(hass)
+    registry_entries = sum(
+        len(er.async_entries_for_config_entry(registry, entry.entry_id))
+        for entry in entries
+    )
+    loaded = [entry for entry in entries if entry.state is ConfigEntryState.LOADED]
+    coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in loaded]
+
+    state_changes = 0
+
+    @callback
+    def _async_count(_event: Event) -> None:
+        nonlocal state_changes
+        state_changes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_count)
+    writes_before = sum(c.write_stats.emitted for c in coordinators)
+    suppressed_before = sum(c.write_stats.suppressed for c in coordinators)
+
+    # Steady state: every miner refreshed once per cycle
+    probe = LoopLagProbe()
+    probe.start()
+    cycle_walls: list[float] = []
+    cycle_cpus: list[float] = []
+    failed = 0
+    for _ in range(cycles):
+        for coordinator in coordinators:
+            # Cycles run back to back, not a poll interval apart
+            coordinator.client.invalidate_cache()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+        await hass.async_block_till_done()
+        cycle_cpus.append(time.thread_time() - cpu)
+        cycle_walls.append(time.perf_counter() - wall)
+        failed += sum(not c.last_update_success for c in coordinators)
+    await probe.stop()
+    unsub()
+
+    writes = sum(c.write_stats.emitted for c in coordinators) - writes_before
+    suppressed = sum(c.write_stats.suppressed for c in coordinators) - suppressed_before
+
+    gc.collect()
+    if trace_memory:
+        memory_after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        # Leave out the simulated miners, which share the process
+        ignore = (tracemalloc.Filter(False, str(Path(__file__).parent / "*")),)
+        growth = sum(
+            stat.size_diff
+            for stat in memory_after.filter_traces(ignore).compare_to(
+                memory_before.filter_traces(ignore), "filename"
+            )
+        )
+        memory_per_miner: float | None = growth / miners
+        memory_method = "tracemalloc"
+    elif rss_before is not None and (rss_after := rss_bytes()) is not None:
+        memory_per_miner = (rss_after - rss_before) / miners
+        memory_method = "rss"
+    else:
+        memory_per_miner = None
+        memory_method = "unavailable"
+
+    server = fleet.stats
+    cycle_cpu_mean = statistics.fmean(cycle_cpus) if cycle_cpus else 0.0
+    return BenchmarkResult(
+        miners=miners,
+        setup_seconds=setup_wall,
+        setup_cpu_seconds=setup_cpu,
+        entries_loaded=len(loaded),
+        reload_seconds=reload_wall,
+        registry_entries=registry_entries,
+        entities=len(hass.states.async_entity_ids("sensor")),
+        cycles=cycles,
+        cycle_seconds_mean=statistics.fmean(cycle_walls) if cycle_walls else 0.0,
+        cycle_seconds_p95=percentile(cycle_walls, 95),
+        cycle_cpu_seconds_mean=cycle_cpu_mean,
+        cpu_ms_per_miner_cycle=cycle_cpu_mean * 1000 / miners,
+        state_changes_per_cycle=state_changes / cycles if cycles else 0.0,
+        state_writes_per_cycle=writes / cycles if cycles else 0.0,
+        state_writes_suppressed_per_cycle=suppressed / cycles if cycles else 0.0,
+        failed_refreshes=failed,
+        loop_lag_ms_max=max(probe.samples, default=0.0) * 1000,
+        loop_lag_ms_p95=percentile(probe.samples, 95) * 1000,
+        memory_bytes_per_miner=memory_per_miner,
+        memory_method=memory_method,
+        server=asdict(server),
+    )
@@ -0,0 +1,108 @@
+"""Break the memory of a simulated fleet down by allocation site with tracemalloc."""
+from __future__ import annotations
+
+import asyncio
+import gc
+import tempfile
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.helpers import entity_registry as er
+
+from .fake_axeos import FakeAxeOSFleet, FakeFleetConfig
+from .harness import DOMAIN, async_add_miner, async_start_hass, raise_file_limit
+
+# Allocations in the integration's code, wherever it was imported from
+INTEGRATION_FILES = f"*/custom_components/{DOMAIN}/*"
+
+
+@dataclass
+class MemoryResult:
+    """Memory held after setup and refreshes of one fleet size."""
+
+    miners: int
+    entities: int
+    # Growth of everything but the simulated miners, Home Assistant included
+    bytes_per_miner: float
+    bytes_per_entity: float
+    # Growth allocated by the integration's own code
+    integration_bytes_per_miner: float
+    # Integration lines holding the most memory, per miner
+    top: list[dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+async def async_run_memory(
+    miners: int, cycles: int, fleet_config: FakeFleetConfig, top: int
+) -> MemoryResult:
+    """Set up ``miners`` miners, refresh them and compare two snapshots."""
+    raise_file_limit()
+    fleet = FakeAxeOSFleet(miners, fleet_config)
+    fleet.start()
+    with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as config_dir:
+        hass = await async_start_hass(config_dir)
+        try:
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+
+            await asyncio.gather(
+                *(async_add_miner(hass, miner.host) for miner in fleet.miners)
+            )
+            await hass.async_block_till_done()
+            entries = [
+                entry
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.state is ConfigEntryState.LOADED
+            ]
+            coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in entries]
+            for _ in range(cycles):
+                for coordinator in coordinators:
+                    coordinator.client.invalidate_cache()
+                await asyncio.gather(*(c.async_refresh() for c in coordinators))
+                await hass.async_block_till_done()
+
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            registry = er.async_get(hass)
+            entities = sum(
+                len(er.async_entries_for_config_entry(registry, entry.entry_id))
+                for entry in entries
+            )
+        finally:
+            await hass.async_stop(force=True)
+            fleet.stop()
+
+    # Leave out the simulated miners, which share the process
+    ignore = (tracemalloc.Filter(False, str(Path(__file__).parent / "*")),)
+    before, after = before.filter_traces(ignore), after.filter_traces(ignore)
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    own = (tracemalloc.Filter(True, INTEGRATION_FILES),)
+    lines = after.filter_traces(own).compare_to(before.filter_traces(own), "lineno")
+    integration = sum(stat.size_diff for stat in lines)
+    lines.sort(key=lambda stat: stat.size_diff, reverse=True)
+
+    return MemoryResult(
+        miners=miners,
+        entities=entities,
+        bytes_per_miner=total / miners,
+        bytes_per_entity=total / entities if entities else 0.0,
+        integration_bytes_per_miner=integration / miners,
+        top=[
+            {
+                "line": f"{Path(stat.traceback[0].filename).name}:"
+                f"{stat.traceback[0].lineno}",
+                "bytes_per_miner": stat.size_diff / miners,
+                "blocks_per_miner": stat.count_diff / miners,
+            }
+            for stat in lines[:top]
+        ],
+    )
@@ -0,0 +1,90 @@
+"""Micro-benchmark of decoding /api/system/info payloads."""
+from __future__ import annotations
+
+import json
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+# Payloads of several firmware versions and boards, as the miners send them
+PAYLOADS = Path(__file__).parent / "payloads"
+
+
+@dataclass
+class ParseResult:
+    """Cost of decoding one payload with one decoder."""
+
+    payload: str
+    payload_bytes: int
+    decoder: str
+    microseconds_per_parse: float
+    # Peak memory traced while parsing, including the result
+    peak_bytes_per_parse: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+def decoders() -> dict[str, Callable[[bytes], Any]]:
+    """Return the decoders to compare, by name.
+
+    ``text+json`` is the former path (``response.text()``, then
+    ``json.loads``); the client now parses the raw bytes, with orjson when
+    it is installed.
+    """
+    found: dict[str, Callable[[bytes], Any]] = {
+        "text+json": lambda body: json.loads(body.decode()),
+        "json": json.loads,
+    }
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        found["orjson"] = orjson.loads
+    return found
+
+
+def load_payloads() -> dict[str, bytes]:
+    """Return the sample payloads, compacted like the firmware sends them."""
+    return {
+        path.stem: json.dumps(
+            json.loads(path.read_text()), separators=(",", ":")
+        ).encode()
+        for path in sorted(PAYLOADS.glob("*.json"))
+    }
+
+
+def run_parse(repeat: int) -> list[ParseResult]:
+    """Time every decoder on every payload, best of ``repeat`` runs."""
+    results = []
+    for name, body in load_payloads().items():
+        for decoder_name, decode in decoders().items():
+            timer = timeit.Timer(lambda decode=decode, body=body: decode(body))
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat, number)) / number
+
+            tracemalloc.start()
+            try:
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                result = decode(body)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            del result
+
+            results.append(
+                ParseResult(
+                    payload=name,
+                    payload_bytes=len(body),
+                    decoder=decoder_name,
+                    microseconds_per_parse=best * 1e6,
+                    peak_bytes_per_parse=peak - before,
+                )
+            )
+    return results
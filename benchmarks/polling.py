@@ -0,0 +1,166 @@
+"""Compare per-entry coordinator timers with the shared fleet scheduler."""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from .fake_axeos import FakeAxeOSFleet, FakeFleetConfig
+from .harness import (
+    DOMAIN,
+    LoopLagProbe,
+    async_add_miner,
+    async_start_hass,
+    percentile,
+    raise_file_limit,
+)
+
+FLEET_DATA_KEY = f"{DOMAIN}_fleet"
+
+
+@dataclass
+class PollingResult:
+    """Measurements of one fleet size and polling mode."""
+
+    miners: int
+    fleet_polling: bool
+    duration_seconds: float
+    refreshes: int
+    failed_refreshes: int
+    refresh_seconds_p50: float
+    refresh_seconds_p95: float
+    # Busy periods: stretches of time with at least one refresh in flight
+    cycles: int
+    cycle_seconds_mean: float
+    cycle_seconds_max: float
+    max_concurrent_refreshes: int
+    loop_lag_ms_p95: float
+    loop_lag_ms_max: float
+    scheduler: dict[str, Any] | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+async def async_run_polling(
+    miners: int, duration: float, fleet_config: FakeFleetConfig, fleet_polling: bool
+) -> PollingResult:
+    """Let ``miners`` poll on their own schedule for ``duration`` seconds.
+
+    Unlike ``async_run_benchmark``, refreshes are not driven by the benchmark:
+    either every entry's coordinator timer or the fleet scheduler's tick
+    starts them, as in a running Home Assistant.
+    """
+    raise_file_limit()
+    fleet = FakeAxeOSFleet(miners, fleet_config)
+    fleet.start()
+    with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as config_dir:
+        hass = await async_start_hass(config_dir)
+        try:
+            return await _async_measure(hass, fleet, duration, fleet_polling)
+        finally:
+            await hass.async_stop(force=True)
+            fleet.stop()
+
+
+async def _async_measure(
+    hass: HomeAssistant, fleet: FakeAxeOSFleet, duration: float, fleet_polling: bool
+) -> PollingResult:
+    """Set the fleet up, then record every refresh for ``duration`` seconds."""
+    await asyncio.gather(*(async_add_miner(hass, miner.host) for miner in fleet.miners))
+    await hass.async_block_till_done()
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, "fleet_polling": fleet_polling}
+        )
+    # Every entry is reloaded at once, like after a restart of Home Assistant
+    await hass.async_block_till_done()
+
+    coordinators = [
+        hass.data[DOMAIN][entry.entry_id]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    spans: list[tuple[float, float]] = []
+    failed = 0
+
+    def _timed(coordinator) -> None:
+        """Record the start and end of each refresh of a coordinator."""
+        update = coordinator._async_update_data
+
+        async def _async_timed_update() -> Any:
+            nonlocal failed
+            start = time.perf_counter()
+            try:
+                return await update()
+            except Exception:
+                failed += 1
+                raise
+            finally:
+                spans.append((start, time.perf_counter()))
+
+        coordinator._async_update_data = _async_timed_update
+
+    for coordinator in coordinators:
+        _timed(coordinator)
+
+    probe = LoopLagProbe()
+    probe.start()
+    await asyncio.sleep(duration)
+    await probe.stop()
+
+    durations = [end - start for start, end in spans]
+    cycles = _busy_periods(spans)
+    scheduler = hass.data.get(FLEET_DATA_KEY)
+    return PollingResult(
+        miners=len(fleet.miners),
+        fleet_polling=fleet_polling,
+        duration_seconds=duration,
+        refreshes=len(spans),
+        failed_refreshes=failed,
+        refresh_seconds_p50=percentile(durations, 50),
+        refresh_seconds_p95=percentile(durations, 95),
+        cycles=len(cycles),
+        cycle_seconds_mean=sum(cycles) / len(cycles) if cycles else 0.0,
+        cycle_seconds_max=max(cycles, default=0.0),
+        max_concurrent_refreshes=_max_concurrent(spans),
+        loop_lag_ms_p95=percentile(probe.samples, 95) * 1000,
+        loop_lag_ms_max=max(probe.samples, default=0.0) * 1000,
+        scheduler=scheduler.as_dict() if scheduler is not None else None,
+    )
+
+
+def _busy_periods(spans: list[tuple[float, float]]) -> list[float]:
+    """Return the lengths of the merged, overlapping refresh spans."""
+    periods: list[float] = []
+    current_start = current_end = None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                periods.append(current_end - current_start)
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        periods.append(current_end - current_start)
+    return periods
+
+
+def _max_concurrent(spans: list[tuple[float, float]]) -> int:
+    """Return the most refreshes in flight at the same time."""
+    events = sorted(
+        [(start, 1) for start, _ in spans] + [(end, -1) for _, end in spans],
+        # Ends before starts at the same instant
+        key=lambda event: (event[0], event[1]),
+    )
+    peak = running = 0
+    for _, change in events:
+        running += change
+        peak = max(peak, running)
+    return peak
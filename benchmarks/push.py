@@ -0,0 +1,161 @@
+"""Measure how quickly an overheat reaches Home Assistant, pushed or polled."""
+from __future__ import annotations
+
+import asyncio
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+
+from .fake_axeos import FakeAxeOSFleet, FakeFleetConfig
+from .harness import (
+    DOMAIN,
+    async_add_miner,
+    async_start_hass,
+    percentile,
+    raise_file_limit,
+)
+
+# Seconds to wait for the websockets to connect
+CONNECT_TIMEOUT = 30
+# Seconds to wait for an overheat to show up; polling takes up to 30 s
+DETECT_TIMEOUT = 40
+
+
+@dataclass
+class PushResult:
+    """Overheat detection latency of one fleet size and transport."""
+
+    miners: int
+    push_updates: bool
+    push_connected: int
+    detected: int
+    latency_seconds_mean: float
+    latency_seconds_p50: float
+    latency_seconds_p95: float
+    latency_seconds_max: float
+    # Requests for /api/system/info per miner and minute before the overheats,
+    # while the miners only stream routine log lines
+    info_requests_per_miner_minute: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+async def async_run_push(
+    miners: int,
+    fleet_config: FakeFleetConfig,
+    push_updates: bool,
+    quiet: float,
+    spread: float,
+) -> PushResult:
+    """Overheat every miner at a random moment and time until it is seen.
+
+    Requests are counted for ``quiet`` seconds first. Then the overheats are
+    spread over ``spread`` seconds, so polled miners are caught at random
+    points of their poll interval.
+    """
+    raise_file_limit()
+    fleet = FakeAxeOSFleet(miners, fleet_config)
+    fleet.start()
+    with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as config_dir:
+        hass = await async_start_hass(config_dir)
+        try:
+            return await _async_measure(hass, fleet, push_updates, quiet, spread)
+        finally:
+            await hass.async_stop(force=True)
+            fleet.stop()
+
+
+async def _async_measure(
+    hass: HomeAssistant,
+    fleet: FakeAxeOSFleet,
+    push_updates: bool,
+    quiet: float,
+    spread: float,
+) -> PushResult:
+    """Set the fleet up, trigger the overheats and wait for them."""
+    await asyncio.gather(*(async_add_miner(hass, miner.host) for miner in fleet.miners))
+    await hass.async_block_till_done()
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, "push_updates": push_updates}
+        )
+    await hass.async_block_till_done()
+
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    coordinators = {
+        coordinator.client.host: coordinator
+        for coordinator in (hass.data[DOMAIN][entry.entry_id] for entry in entries)
+    }
+    if push_updates:
+        # The coordinators do not announce connections, so check periodically
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while time.monotonic() < deadline and not all(  # noqa: ASYNC110
+            c.push_connected for c in coordinators.values()
+        ):
+            await asyncio.sleep(0.1)
+
+    triggered: dict[str, float] = {}
+    latencies: list[float] = []
+    done = asyncio.Event()
+    unsubs = []
+
+    for host, coordinator in coordinators.items():
+
+        @callback
+        def _async_check(host: str = host, coordinator=coordinator) -> None:
+            """Record when the coordinator first reports the overheat."""
+            if (
+                host in triggered
+                and coordinator.data
+                and coordinator.data.get("overheat_mode")
+            ):
+                latencies.append(time.perf_counter() - triggered.pop(host))
+                if len(latencies) == len(coordinators):
+                    done.set()
+
+        unsubs.append(coordinator.async_add_listener(_async_check))
+
+    requests_before = fleet.stats.requests
+    await asyncio.sleep(quiet)
+    requests = fleet.stats.requests - requests_before
+
+    rng = random.Random(fleet.config.seed)
+
+    async def _async_overheat(miner) -> None:
+        await asyncio.sleep(rng.uniform(0, spread))
+        triggered[miner.host] = time.perf_counter()
+        await fleet.async_overheat(miner)
+
+    await asyncio.gather(*(_async_overheat(miner) for miner in fleet.miners))
+    try:
+        await asyncio.wait_for(done.wait(), DETECT_TIMEOUT)
+    except TimeoutError:
+        pass
+    for unsub in unsubs:
+        unsub()
+
+    connected = sum(c.push_connected for c in coordinators.values())
+    return PushResult(
+        miners=len(fleet.miners),
+        push_updates=push_updates,
+        push_connected=connected,
+        detected=len(latencies),
+        latency_seconds_mean=sum(latencies) / len(latencies) if latencies else 0.0,
+        latency_seconds_p50=percentile(latencies, 50),
+        latency_seconds_p95=percentile(latencies, 95),
+        latency_seconds_max=max(latencies, default=0.0),
+        info_requests_per_miner_minute=requests / len(fleet.miners) / quiet * 60
+        if quiet
+        else 0.0,
+    )
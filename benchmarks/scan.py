@@ -0,0 +1,93 @@
+"""Measure the throughput of the network scan over loopback addresses."""
+from __future__ import annotations
+
+import random
+import socket
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from ipaddress import IPv4Network
+from typing import Any
+from unittest.mock import patch
+
+from custom_components.bitaxe.discovery import async_scan_network
+
+from .fake_axeos import FakeAxeOSFleet, FakeFleetConfig
+from .harness import async_start_hass, raise_file_limit
+
+
+@dataclass
+class ScanResult:
+    """Scan measurements of one network and concurrency."""
+
+    network: str
+    addresses: int
+    miners: int
+    # Addresses that accept connections but never answer, like on a LAN
+    # where unused addresses time out rather than refuse
+    silent: int
+    concurrency: int
+    found: int
+    scan_seconds: float
+    addresses_per_second: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+async def async_run_scan(
+    network: IPv4Network,
+    miners: int,
+    silent: int,
+    concurrency: int,
+    fleet_config: FakeFleetConfig,
+) -> ScanResult:
+    """Scan ``network`` with miners and silent hosts at random addresses.
+
+    The remaining addresses refuse connections. ``network`` must be within
+    127.0.0.0/8, which Linux routes to the loopback interface.
+    """
+    raise_file_limit()
+    hosts = [str(address) for address in network.hosts()]
+    random.Random(fleet_config.seed).shuffle(hosts)
+    fleet = FakeAxeOSFleet(miners, fleet_config, addresses=hosts[:miners])
+    fleet.start()
+    port = fleet.miners[0].port if fleet.miners else 0
+    listeners = []
+    try:
+        for address in hosts[miners : miners + silent]:
+            # The kernel completes the handshake; nothing ever reads the request
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((address, port))
+            sock.listen()
+            listeners.append(sock)
+
+        with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as config_dir:
+            hass = await async_start_hass(config_dir)
+            try:
+                with patch(
+                    "custom_components.bitaxe.discovery.DISCOVERY_CONCURRENCY",
+                    concurrency,
+                ):
+                    start = time.perf_counter()
+                    found = await async_scan_network(hass, network, port)
+                    elapsed = time.perf_counter() - start
+            finally:
+                await hass.async_stop(force=True)
+    finally:
+        for sock in listeners:
+            sock.close()
+        fleet.stop()
+
+    return ScanResult(
+        network=str(network),
+        addresses=len(hosts),
+        miners=miners,
+        silent=silent,
+        concurrency=concurrency,
+        found=len(found),
+        scan_seconds=elapsed,
+        addresses_per_second=len(hosts) / elapsed,
+    )
@@ -0,0 +1,102 @@
+"""Measure a Home Assistant restart with some of the miners offline."""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
+
+from custom_components.bitaxe.const import SNAPSHOT_STORAGE_KEY
+
+from .fake_axeos import FakeAxeOSFleet, FakeFleetConfig
+from .harness import DOMAIN, async_add_miner, async_start_hass, raise_file_limit
+
+# Seconds to wait for the entries to finish setting up after the restart
+SETUP_TIMEOUT = 120
+
+
+@dataclass
+class StartupResult:
+    """Restart measurements of one fleet and snapshot setting."""
+
+    miners: int
+    offline: int
+    snapshots: bool
+    # Bootstrap until Home Assistant reports it has started
+    startup_seconds: float
+    # Until every entry is loaded or waiting to retry
+    setup_seconds: float
+    entries_loaded: int
+    entries_retrying: int
+    entities: int
+    entities_unavailable: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as plain data."""
+        return asdict(self)
+
+
+async def async_run_startup(
+    miners: int, offline: int, fleet_config: FakeFleetConfig, snapshots: bool
+) -> StartupResult:
+    """Add the fleet, take ``offline`` miners down and restart Home Assistant.
+
+    Without ``snapshots`` the stored payloads are deleted before the restart,
+    so every entry waits for its first refresh, as before they existed.
+    """
+    raise_file_limit()
+    fleet = FakeAxeOSFleet(miners, fleet_config)
+    fleet.start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="bitaxe-bench-") as config_dir:
+            hass = await async_start_hass(config_dir)
+            await asyncio.gather(
+                *(async_add_miner(hass, miner.host) for miner in fleet.miners)
+            )
+            await hass.async_block_till_done()
+            # Stopping writes the config entries and the snapshots
+            await hass.async_stop(force=True)
+
+            for miner in fleet.miners[:offline]:
+                miner.offline = True
+            if not snapshots:
+                (Path(config_dir) / ".storage" / SNAPSHOT_STORAGE_KEY).unlink()
+
+            start = time.perf_counter()
+            hass = await async_start_hass(config_dir)
+            startup = time.perf_counter() - start
+            try:
+                entries = hass.config_entries.async_entries(DOMAIN)
+                # Home Assistant stops waiting for slow setups, so check periodically
+                while time.perf_counter() - start < SETUP_TIMEOUT and any(  # noqa: ASYNC110
+                    entry.state is ConfigEntryState.SETUP_IN_PROGRESS for entry in entries
+                ):
+                    await asyncio.sleep(0.1)
+                setup = time.perf_counter() - start
+                states = hass.states.async_all("sensor")
+                return StartupResult(
+                    miners=miners,
+                    offline=offline,
+                    snapshots=snapshots,
+                    startup_seconds=startup,
+                    setup_seconds=setup,
+                    entries_loaded=sum(
+                        entry.state is ConfigEntryState.LOADED for entry in entries
+                    ),
+                    entries_retrying=sum(
+                        entry.state is ConfigEntryState.SETUP_RETRY for entry in entries
+                    ),
+                    entities=len(states),
+                    entities_unavailable=sum(
+                        state.state == STATE_UNAVAILABLE for state in states
+                    ),
+                )
+            finally:
+                await hass.async_stop(force=True)
+    finally:
+        fleet.stop()
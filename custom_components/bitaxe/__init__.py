@@ -5,39 +5,245 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.typing import ConfigType
 
-from .api import BitaxeApiClient
-from .const import DOMAIN
-from .coordinator import BitaxeDataUpdateCoordinator
+from .api import BitaxeApiClient, BitaxeRequestCache
+from .autotune import BitaxeAutotuner, BitaxeAutotuneStore, async_discard_autotune
+from .backfill import BitaxeStatisticsBackfill
+from .const import (
+    AUTOTUNE_DATA_KEY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_AUTOTUNE,
+    CONF_CRITICAL,
+    CONF_FLEET_POLLING,
+    CONF_FLEET_TOTALS,
+    CONF_HISTORY_SIZE,
+    CONF_INSTRUMENTATION,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_TAGS,
+    CONTROL_DATA_KEY,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_AUTOTUNE,
+    DEFAULT_CRITICAL,
+    DEFAULT_FLEET_POLLING,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_INSTRUMENTATION,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_TAGS,
+    DOMAIN,
+    FLEET_DATA_KEY,
+    FLEET_TOTALS_DATA_KEY,
+    REQUEST_CACHE_DATA_KEY,
+    SCHEMA_DATA_KEY,
+    SNAPSHOT_DATA_KEY,
+    STATIC_SCAN_INTERVAL,
+    STATS_SCAN_INTERVAL,
+    TIER_STATIC,
+    TIER_STATS,
+)
+from .control import BitaxeFleetControl
+from .coordinator import BitaxeDataUpdateCoordinator, BitaxeTierCoordinator
+from .push import BitaxePushListener
+from .scheduler import BitaxeFleetScheduler
+from .schema import BitaxeSchemaIndex
+from .services import async_setup_services
+from .session import async_close_bitaxe_session, async_get_bitaxe_session
+from .snapshot import BitaxeSnapshotStore
+from .totals import BitaxeFleetTotals, parse_tags
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [
+    Platform.BINARY_SENSOR,
+    Platform.BUTTON,
+    Platform.NUMBER,
+    Platform.SELECT,
+    Platform.SENSOR,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Bitaxe integration."""
+    snapshots = BitaxeSnapshotStore(hass)
+    await snapshots.async_load()
+    hass.data[SNAPSHOT_DATA_KEY] = snapshots
+    schemas = BitaxeSchemaIndex(hass)
+    await schemas.async_load(
+        entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+    hass.data[SCHEMA_DATA_KEY] = schemas
+    hass.data[FLEET_TOTALS_DATA_KEY] = BitaxeFleetTotals(hass)
+    hass.data[REQUEST_CACHE_DATA_KEY] = BitaxeRequestCache()
+    hass.data[CONTROL_DATA_KEY] = BitaxeFleetControl(hass)
+    autotunes = BitaxeAutotuneStore(hass)
+    await autotunes.async_load()
+    hass.data[AUTOTUNE_DATA_KEY] = autotunes
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Bitaxe from a config entry."""
-    session = async_get_clientsession(hass)
-    client = BitaxeApiClient(entry.data[CONF_HOST], session)
-    
-    coordinator = BitaxeDataUpdateCoordinator(hass, client)
-    await coordinator.async_config_entry_first_refresh()
+    if entry.data.get(CONF_FLEET_TOTALS):
+        # The fleet device only has sensors reading the shared totals
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        return True
+
+    client = BitaxeApiClient(
+        entry.data[CONF_HOST],
+        async_get_bitaxe_session(hass).session,
+        ws_session=async_get_clientsession(hass),
+        request_cache=hass.data[REQUEST_CACHE_DATA_KEY],
+    )
+
+    adaptive_bounds = None
+    if entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+        adaptive_bounds = (
+            entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+        )
+
+    coordinator = BitaxeDataUpdateCoordinator(
+        hass,
+        client,
+        adaptive_bounds,
+        instrumentation=entry.options.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION),
+        history_size=entry.options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+    )
+    coordinator.critical = entry.options.get(CONF_CRITICAL, DEFAULT_CRITICAL)
+    fleet_polling = entry.options.get(CONF_FLEET_POLLING, DEFAULT_FLEET_POLLING)
+    if fleet_polling:
+        # The shared fleet scheduler drives refreshes, not the coordinator timer
+        coordinator.set_fleet_managed(True)
+
+    snapshots: BitaxeSnapshotStore = hass.data[SNAPSHOT_DATA_KEY]
+
+    @callback
+    def _async_save_snapshot() -> None:
+        """Remember the latest good payload for the next startup."""
+        if coordinator.last_update_success and coordinator.data is not None:
+            snapshots.async_update(entry.entry_id, coordinator.data)
+
+    if (snapshot := snapshots.async_get(entry.entry_id)) is not None:
+        # Set up entities from the cached payload and refresh in the background,
+        # so unreachable miners do not delay startup
+        coordinator.async_restore_data(snapshot)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"Bitaxe first refresh {entry.entry_id}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+        _async_save_snapshot()
+
+    coordinator.async_setup_device_info(entry)
+    coordinator.tiers = {
+        TIER_STATIC: BitaxeTierCoordinator(
+            hass, client, TIER_STATIC, client.async_get_asic_info, STATIC_SCAN_INTERVAL
+        ),
+        TIER_STATS: BitaxeTierCoordinator(
+            hass, client, TIER_STATS, client.async_get_statistics, STATS_SCAN_INTERVAL
+        ),
+    }
+    for tier in coordinator.tiers.values():
+        entry.async_create_background_task(
+            hass, tier.async_refresh(), f"Bitaxe {tier.tier} refresh {entry.entry_id}"
+        )
+    entry.async_on_unload(coordinator.async_add_listener(_async_save_snapshot))
+    backfill = coordinator.backfill = BitaxeStatisticsBackfill(hass, entry, coordinator)
+    control: BitaxeFleetControl = hass.data[CONTROL_DATA_KEY]
+    autotunes: BitaxeAutotuneStore = hass.data[AUTOTUNE_DATA_KEY]
+    if entry.options.get(CONF_AUTOTUNE, DEFAULT_AUTOTUNE):
+        autotuner = coordinator.autotuner = BitaxeAutotuner(
+            hass, entry, coordinator, control, autotunes
+        )
+        entry.async_on_unload(
+            coordinator.async_add_listener(autotuner.async_handle_update)
+        )
+    else:
+        entry.async_create_background_task(
+            hass,
+            async_discard_autotune(coordinator, control, autotunes, entry.entry_id),
+            f"Bitaxe autotune discard {entry.entry_id}",
+        )
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    if fleet_polling:
+        if (scheduler := hass.data.get(FLEET_DATA_KEY)) is None:
+            scheduler = hass.data[FLEET_DATA_KEY] = BitaxeFleetScheduler(hass)
+        scheduler.async_add(entry.entry_id, coordinator)
+
+    totals: BitaxeFleetTotals = hass.data[FLEET_TOTALS_DATA_KEY]
+    entry.async_on_unload(
+        totals.async_add_miner(
+            entry.entry_id,
+            coordinator,
+            parse_tags(entry.options.get(CONF_TAGS, DEFAULT_TAGS)),
+        )
+    )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Once the sensors exist, fill what was missed while Home Assistant was
+    # down and again whenever the miner comes back
+    entry.async_on_unload(coordinator.async_add_listener(backfill.async_handle_update))
+    backfill.async_handle_update()
+    if coordinator.autotuner is not None:
+        entry.async_create_background_task(
+            hass, coordinator.autotuner.async_start(), f"Bitaxe autotune {entry.entry_id}"
+        )
+
+    if entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES):
+        # Cancelled automatically when the entry is unloaded
+        listener = BitaxePushListener(hass, coordinator)
+        entry.async_create_background_task(
+            hass, listener.async_run(), f"Bitaxe push {entry.entry_id}"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    
-    if unload_ok:
+
+    if unload_ok and not entry.data.get(CONF_FLEET_TOTALS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            await async_close_bitaxe_session(hass)
+
+        scheduler: BitaxeFleetScheduler | None = hass.data.get(FLEET_DATA_KEY)
+        if scheduler is not None:
+            scheduler.async_remove(entry.entry_id)
+            if not scheduler.size:
+                await scheduler.async_shutdown()
+                hass.data.pop(FLEET_DATA_KEY)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached payload and schema of a deleted entry."""
+    snapshots: BitaxeSnapshotStore | None = hass.data.get(SNAPSHOT_DATA_KEY)
+    if snapshots is not None:
+        snapshots.async_remove(entry.entry_id)
+    schemas: BitaxeSchemaIndex | None = hass.data.get(SCHEMA_DATA_KEY)
+    if schemas is not None:
+        schemas.async_remove(entry.entry_id)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
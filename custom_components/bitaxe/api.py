@@ -1,10 +1,44 @@
 """API client for Bitaxe miner."""
+import asyncio
 import json
 import logging
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
 
 import aiohttp
 import async_timeout
 
+from .const import (
+    API_STATISTICS_DASHBOARD,
+    API_SYSTEM,
+    API_SYSTEM_ASIC,
+    API_SYSTEM_RESTART,
+    API_WEBSOCKET,
+    BREAKER_BACKOFF_MAX,
+    BREAKER_BACKOFF_MIN,
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_SAMPLES,
+    REQUEST_TIMEOUT,
+    REQUEST_TIMEOUT_MARGIN,
+    REQUEST_TIMEOUT_MIN,
+    RESPONSE_CACHE_TTL,
+    STAGE_PARSE,
+    STAGE_READ,
+    STAGE_REQUEST,
+)
+from .instrumentation import BitaxeStageTimings
+
+try:
+    # orjson ships with Home Assistant and parses bytes without decoding first
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -20,55 +54,284 @@ class BitaxeTimeoutError(BitaxeApiError):
     """Exception for timeout errors."""
 
 
+class BitaxeNotSupportedError(BitaxeApiError):
+    """Exception for features not supported by the miner firmware."""
+
+
+class BitaxeCircuitOpenError(BitaxeConnectionError):
+    """Exception raised without contacting a miner that is known to be down."""
+
+
+class BitaxeCircuitBreaker:
+    """Circuit breaker and adaptive timeout for a single miner.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive connection failures the
+    circuit opens and requests fail fast. Once the backoff has passed, one
+    request is let through (half-open) while the others keep failing fast;
+    if it fails again the backoff doubles, up to BREAKER_BACKOFF_MAX.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.backoff = BREAKER_BACKOFF_MIN
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def timeout(self) -> float:
+        """Return the request timeout based on the observed p99 latency."""
+        if len(self._latencies) < LATENCY_MIN_SAMPLES:
+            return REQUEST_TIMEOUT
+        latencies = sorted(self._latencies)
+        p99 = latencies[int(0.99 * (len(latencies) - 1))]
+        return min(max(p99 * REQUEST_TIMEOUT_MARGIN, REQUEST_TIMEOUT_MIN), REQUEST_TIMEOUT)
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until an open circuit allows a new attempt."""
+        if self.state == BREAKER_OPEN:
+            return max(self._opened_at + self.backoff - time.monotonic(), 0)
+        if self.state == BREAKER_HALF_OPEN:
+            # A probe that was cancelled never reports back, so it expires
+            return max(self._probe_at + REQUEST_TIMEOUT - time.monotonic(), 0)
+        return 0
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to the miner."""
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.retry_in:
+            return False
+        # Let a single probe through until it succeeds or fails
+        self.state = BREAKER_HALF_OPEN
+        self._probe_at = time.monotonic()
+        return True
+
+    def record_success(self, latency: float | None = None) -> None:
+        """Close the circuit after the miner responded."""
+        if latency is not None:
+            self._latencies.append(latency)
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.backoff = BREAKER_BACKOFF_MIN
+
+    def record_failure(self) -> None:
+        """Count a failed attempt and open the circuit when needed."""
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN:
+            self.backoff = min(self.backoff * 2, BREAKER_BACKOFF_MAX)
+        elif self.failures < BREAKER_FAILURE_THRESHOLD:
+            return
+        self.state = BREAKER_OPEN
+        self._opened_at = time.monotonic()
+
+
+class BitaxeRequestCache:
+    """Single-flight requests and short-lived responses per host and endpoint.
+
+    Concurrent callers asking a miner for the same endpoint share one
+    request, and a response is reused for RESPONSE_CACHE_TTL seconds. It is
+    shared by all clients (coordinator, config flow, power sampler), so they
+    don't query the same miner at nearly the same moment.
+    """
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL) -> None:
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.hits: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+        self.requests: Counter[str] = Counter()
+        self._in_flight: dict[tuple[str, str], asyncio.Task[dict]] = {}
+        self._responses: dict[tuple[str, str], tuple[float, dict]] = {}
+
+    async def async_get(
+        self, host: str, endpoint: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """Return a recent response, join a running request or start one."""
+        key = (host, endpoint)
+        if (cached := self._responses.get(key)) is not None:
+            if time.monotonic() - cached[0] < self.ttl:
+                self.hits[host] += 1
+                return cached[1]
+            del self._responses[key]
+
+        if (task := self._in_flight.get(key)) is not None:
+            self.coalesced[host] += 1
+        else:
+            self.requests[host] += 1
+            task = self._in_flight[key] = asyncio.ensure_future(fetch())
+            task.add_done_callback(lambda done: self._async_finished(key, done))
+
+        # Shielded so a cancelled caller does not cancel the request of others
+        return await asyncio.shield(task)
+
+    def _async_finished(self, key: tuple[str, str], task: asyncio.Task[dict]) -> None:
+        """Cache a successful response and clear the in-flight request."""
+        # Retrieving the exception also keeps it from being logged as unhandled
+        # when every caller was cancelled
+        failed = task.cancelled() or task.exception() is not None
+        if self._in_flight.get(key) is not task:
+            # Invalidated while it ran, so the response may be outdated
+            return
+        del self._in_flight[key]
+        if not failed:
+            self._responses[key] = (time.monotonic(), task.result())
+
+    def invalidate(self, host: str) -> None:
+        """Drop cached responses of a miner, for example after changing a setting.
+
+        Requests already running are left to finish for their callers, but
+        new callers start a fresh request and the old response isn't cached.
+        """
+        for cache in (self._responses, self._in_flight):
+            for key in [key for key in cache if key[0] == host]:
+                del cache[key]
+
+    def as_dict(self, host: str) -> dict[str, int]:
+        """Return the counts for a single host."""
+        return {
+            "requests": self.requests[host],
+            "hits": self.hits[host],
+            "coalesced": self.coalesced[host],
+        }
+
+
 class BitaxeApiClient:
     """API client for Bitaxe miner."""
 
-    def __init__(self, host: str, session: aiohttp.ClientSession) -> None:
-        """Initialize the API client."""
+    def __init__(
+        self,
+        host: str,
+        session: aiohttp.ClientSession,
+        ws_session: aiohttp.ClientSession | None = None,
+        request_cache: BitaxeRequestCache | None = None,
+    ) -> None:
+        """Initialize the API client.
+
+        A separate ``ws_session`` keeps the long-lived websocket from occupying
+        a connection in a pool limited to one connection per host. Clients of
+        the same miner should share a ``request_cache``.
+        """
         self.host = host
         self.session = session
+        self.ws_session = ws_session or session
+        self.request_cache = request_cache or BitaxeRequestCache()
+        self.breaker = BitaxeCircuitBreaker()
+        self.timings: BitaxeStageTimings | None = None
         self._base_url = f"http://{host}"
+        self._unreachable = False
+
+    def _record_failure(self, message: str, *args: object) -> None:
+        """Record a connection failure and log it without flooding the log.
+
+        The first failure is logged as an error. Later ones are logged at
+        debug level, with a reminder whenever a retry after the backoff fails.
+        """
+        retried = self.breaker.state == BREAKER_HALF_OPEN
+        self.breaker.record_failure()
+        if not self._unreachable:
+            self._unreachable = True
+            _LOGGER.error(message, *args)
+            return
+        _LOGGER.debug(message, *args)
+        if retried:
+            _LOGGER.warning(
+                "%s is still unreachable, retrying in %.0f seconds; "
+                "failures are logged at debug level",
+                self.host,
+                self.breaker.retry_in,
+            )
+
+    def _record_success(self, latency: float | None = None) -> None:
+        """Record a response from the miner with the circuit breaker."""
+        if self._unreachable:
+            self._unreachable = False
+            _LOGGER.info("%s is reachable again", self.host)
+        self.breaker.record_success(latency)
 
     async def async_get_data(self, endpoint: str) -> dict:
-        """Get data from the API."""
+        """Get data from the API, sharing concurrent and recent requests."""
+        return await self.request_cache.async_get(
+            self.host, endpoint, lambda: self._async_fetch(endpoint)
+        )
+
+    def invalidate_cache(self) -> None:
+        """Drop cached responses after a write to the miner."""
+        self.request_cache.invalidate(self.host)
+
+    async def _async_fetch(self, endpoint: str) -> dict:
+        """Request an endpoint from the miner."""
         url = f"{self._base_url}{endpoint}"
+        if not self.breaker.allow_request():
+            raise BitaxeCircuitOpenError(
+                f"{self.host} is unreachable, retrying in {self.breaker.retry_in:.0f} seconds"
+            )
+
+        timeout = self.breaker.timeout
+        timings = self.timings
+        start = time.monotonic()
         try:
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(timeout):
                 async with self.session.get(url, allow_redirects=False) as response:
+                    if timings is not None:
+                        headers_received = time.monotonic()
+                        timings.record(STAGE_REQUEST, headers_received - start)
+
                     response.raise_for_status()
-                    
-                    # Get response text first for debugging
-                    text = await response.text()
-                    
-                    # Log first 200 chars for debugging
-                    _LOGGER.debug("Response from %s (first 200 chars): %s", url, text[:200])
-                    
-                    # Try to parse as JSON
+
+                    # Parse the raw body directly, skipping the bytes-to-str decode
+                    body = await response.read()
+                    body_read = time.monotonic()
+                    self._record_success(body_read - start)
+                    if timings is not None:
+                        timings.record(STAGE_READ, body_read - headers_received)
+
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug(
+                            "Response from %s (first 200 bytes): %s", url, body[:200]
+                        )
+
                     try:
-                        data = json.loads(text)
-                        if not isinstance(data, dict):
-                            raise ValueError(f"Expected dict, got {type(data)}")
-                        return data
+                        data = _json_loads(body)
+                        if timings is not None:
+                            timings.record(STAGE_PARSE, time.monotonic() - body_read)
                     except json.JSONDecodeError as err:
                         _LOGGER.error(
                             "Invalid JSON from %s. Content-Type: %s, Response: %s",
                             url,
                             response.content_type,
-                            text[:500]
+                            body[:500].decode(errors="replace"),
                         )
                         raise BitaxeApiError(f"Invalid JSON response from {url}: {err}") from err
-                        
+
+                    if not isinstance(data, dict):
+                        raise BitaxeApiError(
+                            f"Expected JSON object from {url}, got {type(data).__name__}"
+                        )
+                    return data
+
         except TimeoutError as err:
-            _LOGGER.error("Timeout fetching data from %s after 10 seconds", url)
+            self._record_failure(
+                "Timeout fetching data from %s after %.1f seconds", url, timeout
+            )
             raise BitaxeTimeoutError(f"Timeout connecting to {self.host}") from err
         except aiohttp.ClientConnectionError as err:
-            _LOGGER.error("Connection error to %s: %s", url, err)
+            self._record_failure("Connection error to %s: %s", url, err)
             raise BitaxeConnectionError(f"Cannot connect to {self.host}: {err}") from err
         except aiohttp.ClientResponseError as err:
+            # The miner answered, so it is reachable
+            self._record_success()
+            if err.status == 404:
+                raise BitaxeNotSupportedError(
+                    f"{self.host} does not provide {endpoint}"
+                ) from err
             _LOGGER.error("HTTP %s error from %s: %s", err.status, url, err)
             raise BitaxeApiError(f"HTTP {err.status} error from {url}") from err
         except aiohttp.ClientError as err:
-            _LOGGER.error("HTTP client error from %s: %s", url, err)
+            self._record_failure("HTTP client error from %s: %s", url, err)
             raise BitaxeConnectionError(f"HTTP error connecting to {self.host}: {err}") from err
 
     async def async_get_system_info(self) -> dict:
@@ -78,3 +341,72 @@ class BitaxeApiClient:
     async def async_get_status(self) -> dict:
         """Get mining status - AxeOS returns all data from /api/system/info."""
         return await self.async_get_data("/api/system/info")
+
+    async def async_get_asic_info(self) -> dict:
+        """Get the static ASIC details (model, count, frequency and voltage options)."""
+        return await self.async_get_data(API_SYSTEM_ASIC)
+
+    async def async_get_statistics(self) -> dict:
+        """Get the recent history kept by the miner."""
+        return await self.async_get_data(API_STATISTICS_DASHBOARD)
+
+    async def _async_send(
+        self, method: str, endpoint: str, payload: dict | None = None
+    ) -> None:
+        """Send a write request to the miner; cached responses are dropped."""
+        url = f"{self._base_url}{endpoint}"
+        if not self.breaker.allow_request():
+            raise BitaxeCircuitOpenError(
+                f"{self.host} is unreachable, retrying in {self.breaker.retry_in:.0f} seconds"
+            )
+
+        try:
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                async with self.session.request(
+                    method, url, json=payload, allow_redirects=False
+                ) as response:
+                    response.raise_for_status()
+                    # The body is a short confirmation text, not JSON
+                    await response.read()
+                    self._record_success()
+        except TimeoutError as err:
+            self._record_failure("Timeout sending %s to %s", endpoint, self.host)
+            raise BitaxeTimeoutError(f"Timeout sending {endpoint} to {self.host}") from err
+        except aiohttp.ClientResponseError as err:
+            self._record_success()
+            if err.status == 404:
+                raise BitaxeNotSupportedError(
+                    f"{self.host} does not provide {endpoint}"
+                ) from err
+            _LOGGER.error("HTTP %s error from %s: %s", err.status, url, err)
+            raise BitaxeApiError(f"HTTP {err.status} error from {url}") from err
+        except aiohttp.ClientError as err:
+            self._record_failure("Error sending %s to %s: %s", endpoint, self.host, err)
+            raise BitaxeConnectionError(f"Cannot connect to {self.host}: {err}") from err
+        finally:
+            self.invalidate_cache()
+
+    async def async_update_settings(self, settings: dict) -> None:
+        """Change settings such as ``frequency``, ``coreVoltage`` or ``fanspeed``."""
+        await self._async_send("PATCH", API_SYSTEM, settings)
+
+    async def async_restart(self) -> None:
+        """Restart the miner."""
+        await self._async_send("POST", API_SYSTEM_RESTART)
+
+    async def async_ws_connect(self) -> aiohttp.ClientWebSocketResponse:
+        """Open the AxeOS websocket stream."""
+        url = f"ws://{self.host}{API_WEBSOCKET}"
+        try:
+            async with async_timeout.timeout(10):
+                return await self.ws_session.ws_connect(url, heartbeat=30)
+        except aiohttp.WSServerHandshakeError as err:
+            if err.status == 404:
+                raise BitaxeNotSupportedError(
+                    f"{self.host} does not provide a websocket stream"
+                ) from err
+            raise BitaxeConnectionError(f"Websocket handshake with {self.host} failed: {err}") from err
+        except TimeoutError as err:
+            raise BitaxeTimeoutError(f"Timeout opening websocket to {self.host}") from err
+        except aiohttp.ClientError as err:
+            raise BitaxeConnectionError(f"Cannot open websocket to {self.host}: {err}") from err
@@ -0,0 +1,445 @@
+"""Opt-in autotuner driving a TuningSearch with a miner's live telemetry."""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import BitaxeApiError
+from .const import (
+    AUTOTUNE_CONVERGED,
+    AUTOTUNE_DEFAULT_MAX_TEMP,
+    AUTOTUNE_EFFICIENCY_TOLERANCE,
+    AUTOTUNE_FAILED,
+    AUTOTUNE_FREQUENCY_SPREAD,
+    AUTOTUNE_FREQUENCY_STEP,
+    AUTOTUNE_IDLE,
+    AUTOTUNE_MAX_HASHRATE_CV,
+    AUTOTUNE_MAX_STEPS,
+    AUTOTUNE_MAX_VR_TEMP,
+    AUTOTUNE_MEASURE_TIME,
+    AUTOTUNE_MEASURING,
+    AUTOTUNE_MIN_HASHRATE_RATIO,
+    AUTOTUNE_MIN_SAMPLES,
+    AUTOTUNE_SAVE_DELAY,
+    AUTOTUNE_SETTLE_TIME,
+    AUTOTUNE_SETTLING,
+    AUTOTUNE_STORAGE_KEY,
+    AUTOTUNE_STORAGE_VERSION,
+    AUTOTUNE_TEMP_MARGIN,
+    AUTOTUNE_VOLTAGE_SPREAD,
+    AUTOTUNE_VOLTAGE_STEP,
+    CONTROL_MAX_CORE_VOLTAGE,
+    CONTROL_MAX_FREQUENCY,
+    CONTROL_MIN_CORE_VOLTAGE,
+    CONTROL_MIN_FREQUENCY,
+    TIER_STATIC,
+)
+from .control import BitaxeFleetControl, async_check_limits
+from .coordinator import BitaxeDataUpdateCoordinator
+from .timeseries import BitaxeRingBuffer
+from .tuning import (
+    TuningBounds,
+    TuningMeasurement,
+    TuningPoint,
+    TuningSearch,
+    tuning_grid,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statuses of a run that was interrupted by a restart or reload
+RUNNING = (AUTOTUNE_SETTLING, AUTOTUNE_MEASURING)
+
+
+class BitaxeAutotuneStore:
+    """Keep the tuning state and history of every entry on disk."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, AUTOTUNE_STORAGE_VERSION, AUTOTUNE_STORAGE_KEY
+        )
+        self._runs: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the tuning state from disk."""
+        self._runs = await self._store.async_load() or {}
+
+    @callback
+    def async_get(self, entry_id: str) -> dict[str, Any] | None:
+        """Return the stored run of an entry, if any."""
+        return self._runs.get(entry_id)
+
+    @callback
+    def async_update(self, entry_id: str, run: dict[str, Any]) -> None:
+        """Store the run of an entry."""
+        self._runs[entry_id] = run
+        self._store.async_delay_save(self._data_to_save, AUTOTUNE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the run of an entry."""
+        if self._runs.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, AUTOTUNE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to write to disk."""
+        return self._runs
+
+
+class BitaxeAutotuner:
+    """Search a miner's most efficient stable frequency and voltage.
+
+    Each setting of the search is applied, left to settle for
+    AUTOTUNE_SETTLE_TIME and then measured from the refreshes during
+    AUTOTUNE_MEASURE_TIME. A setting that overheats, exceeds the power
+    limit or makes the miner report overheat mode is abandoned right away.
+    Once done, the best setting (or the original one if none was
+    acceptable) is applied. The run is stored, so a finished run is not
+    repeated after a restart and an interrupted one starts over from the
+    original setting.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: BitaxeDataUpdateCoordinator,
+        control: BitaxeFleetControl,
+        store: BitaxeAutotuneStore,
+    ) -> None:
+        """Initialize the autotuner."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self.control = control
+        self.store = store
+        self.status = AUTOTUNE_IDLE
+        self.original: TuningPoint | None = None
+        self.point: TuningPoint | None = None
+        self.search: TuningSearch | None = None
+        self.history: list[TuningMeasurement] = []
+        self.result: TuningMeasurement | None = None
+        self._applying = False
+        self._phase_until = 0.0
+        # Enough samples for a window polled at the shortest interval
+        interval = (
+            coordinator.adaptive_bounds[0]
+            if coordinator.adaptive_bounds
+            else coordinator.poll_interval.total_seconds()
+        )
+        samples = max(math.ceil(AUTOTUNE_MEASURE_TIME / interval), AUTOTUNE_MIN_SAMPLES)
+        self._hashrate = BitaxeRingBuffer(samples)
+        self._power = BitaxeRingBuffer(samples)
+        self._max_temp = 0.0
+        self._max_vr_temp: float | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def bounds(self) -> TuningBounds | None:
+        """Return the limits of the running search."""
+        return self.search.bounds if self.search is not None else None
+
+    async def async_start(self) -> None:
+        """Resume a finished run or start a new search."""
+        entry_id = self.entry.entry_id
+        if (stored := self.store.async_get(entry_id)) is not None and stored[
+            "status"
+        ] not in RUNNING:
+            self.status = stored["status"]
+            self.original = tuple(stored["original"])
+            self.history = [TuningMeasurement.from_dict(m) for m in stored["history"]]
+            if stored["result"] is not None:
+                self.result = TuningMeasurement.from_dict(stored["result"])
+            self._async_notify()
+            return
+
+        data = self.coordinator.data or {}
+        if not isinstance(data.get("frequency"), (int, float)) or not isinstance(
+            data.get("coreVoltage"), (int, float)
+        ):
+            _LOGGER.warning(
+                "%s does not report its frequency and core voltage, autotuning is not possible",
+                self.coordinator.client.host,
+            )
+            self._async_set_status(AUTOTUNE_FAILED)
+            return
+
+        # An interrupted run starts over from the setting before it
+        self.original = (
+            tuple(stored["original"])
+            if stored is not None
+            else (int(data["frequency"]), int(data["coreVoltage"]))
+        )
+        static = self.coordinator.tiers.get(TIER_STATIC)
+        if static is not None and static.supported and static.data is None:
+            await static.async_refresh()
+        options = (static.data if static is not None else None) or {}
+
+        frequency, voltage = self.original
+        self.search = TuningSearch(
+            tuning_grid(
+                options.get("frequencyOptions"),
+                frequency,
+                AUTOTUNE_FREQUENCY_STEP,
+                AUTOTUNE_FREQUENCY_SPREAD,
+                (CONTROL_MIN_FREQUENCY, CONTROL_MAX_FREQUENCY),
+            ),
+            tuning_grid(
+                options.get("voltageOptions"),
+                voltage,
+                AUTOTUNE_VOLTAGE_STEP,
+                AUTOTUNE_VOLTAGE_SPREAD,
+                (CONTROL_MIN_CORE_VOLTAGE, CONTROL_MAX_CORE_VOLTAGE),
+            ),
+            self.original,
+            TuningBounds(
+                max_temp=(data.get("temptarget") or AUTOTUNE_DEFAULT_MAX_TEMP)
+                + AUTOTUNE_TEMP_MARGIN,
+                max_power=data.get("maxPower") or None,
+                max_vr_temp=AUTOTUNE_MAX_VR_TEMP,
+                min_hashrate_ratio=AUTOTUNE_MIN_HASHRATE_RATIO,
+                max_hashrate_cv=AUTOTUNE_MAX_HASHRATE_CV,
+            ),
+            AUTOTUNE_MAX_STEPS,
+            AUTOTUNE_EFFICIENCY_TOLERANCE,
+        )
+        self.history = self.search.history
+        _LOGGER.info(
+            "Autotuning %s, starting from %d MHz at %d mV",
+            self.coordinator.client.host,
+            frequency,
+            voltage,
+        )
+        await self._async_apply_next()
+
+    async def _async_apply_next(self) -> None:
+        """Apply the next setting of the search, or the result when done."""
+        assert self.search is not None
+        if (point := self.search.next_point()) is not None:
+            if await self._async_apply(point):
+                self._phase_until = time.monotonic() + AUTOTUNE_SETTLE_TIME
+                self._async_set_status(AUTOTUNE_SETTLING)
+            return
+
+        self.result = self.search.best
+        if self.result is None:
+            _LOGGER.warning(
+                "Autotuning %s found no acceptable setting, keeping the original one",
+                self.coordinator.client.host,
+            )
+            await self._async_apply(self.original)
+            self._async_set_status(AUTOTUNE_FAILED)
+            return
+
+        _LOGGER.info(
+            "Autotuning %s converged on %d MHz at %d mV (%.2f J/TH) after %d settings",
+            self.coordinator.client.host,
+            self.result.frequency,
+            self.result.core_voltage,
+            self.result.efficiency,
+            len(self.history),
+        )
+        if await self._async_apply((self.result.frequency, self.result.core_voltage)):
+            self._async_set_status(AUTOTUNE_CONVERGED)
+
+    async def _async_apply(self, point: TuningPoint | None) -> bool:
+        """Send a setting to the miner; on failure, end the run."""
+        if point is None:
+            return False
+        settings = {"frequency": point[0], "coreVoltage": point[1]}
+        self._applying = True
+        try:
+            if (error := await async_check_limits(self.coordinator, settings)) is not None:
+                _LOGGER.error(
+                    "Autotuning %s stopped, the setting is not supported: %s",
+                    self.coordinator.client.host,
+                    error,
+                )
+                self._async_set_status(AUTOTUNE_FAILED)
+                return False
+            await self.control.async_update_settings(self.coordinator, settings)
+        except BitaxeApiError as err:
+            _LOGGER.error(
+                "Autotuning %s stopped, changing the setting failed: %s",
+                self.coordinator.client.host,
+                err,
+            )
+            self._async_set_status(AUTOTUNE_FAILED)
+            return False
+        finally:
+            self._applying = False
+        self.point = point
+        # Nothing measured at the previous setting may count for this one
+        self._hashrate.clear()
+        self._power.clear()
+        self._max_temp = 0.0
+        self._max_vr_temp = None
+        return True
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Advance the running search with a refresh of the miner."""
+        if self.status not in RUNNING or self._applying or self.search is None:
+            return
+        coordinator = self.coordinator
+        if not coordinator.last_update_success or not (data := coordinator.data):
+            return
+
+        now = time.monotonic()
+        if self._exceeds_bounds(data, self.search.bounds):
+            self._async_finish(data, aborted=True)
+            return
+
+        if self.status == AUTOTUNE_SETTLING:
+            if now < self._phase_until:
+                return
+            self._phase_until = now + AUTOTUNE_MEASURE_TIME
+            self._async_set_status(AUTOTUNE_MEASURING)
+
+        hashrate, power = data.get("hashRate"), data.get("power")
+        if isinstance(hashrate, (int, float)) and isinstance(power, (int, float)):
+            self._hashrate.append(now, hashrate)
+            self._power.append(now, power)
+        if isinstance(temp := data.get("temp"), (int, float)):
+            self._max_temp = max(self._max_temp, temp)
+        if isinstance(vr_temp := data.get("vrTemp"), (int, float)):
+            self._max_vr_temp = max(self._max_vr_temp or vr_temp, vr_temp)
+
+        if now >= self._phase_until and len(self._hashrate) >= AUTOTUNE_MIN_SAMPLES:
+            self._async_finish(data)
+
+    @staticmethod
+    def _exceeds_bounds(data: dict[str, Any], bounds: TuningBounds) -> bool:
+        """Return True if a single refresh shows a setting is unsafe."""
+        if data.get("overheat_mode"):
+            return True
+        temp, vr_temp, power = data.get("temp"), data.get("vrTemp"), data.get("power")
+        return (
+            (isinstance(temp, (int, float)) and temp > bounds.max_temp)
+            or (isinstance(vr_temp, (int, float)) and vr_temp > bounds.max_vr_temp)
+            or (
+                bounds.max_power is not None
+                and isinstance(power, (int, float))
+                and power > bounds.max_power
+            )
+        )
+
+    @callback
+    def _async_finish(self, data: dict[str, Any], aborted: bool = False) -> None:
+        """Record the measurement of the current setting and move on."""
+        assert self.search is not None and self.point is not None
+        frequency, voltage = self.point
+        hashrate = self._hashrate.mean
+        power = self._power.mean
+        if hashrate is None or power is None:
+            # Abandoned before the first sample of the window
+            hashrate = float(data.get("hashRate") or 0.0)
+            power = float(data.get("power") or 0.0)
+        expected = data.get("expectedHashrate") or (
+            frequency * (data.get("smallCoreCount") or 0) * (data.get("asicCount") or 1) / 1000
+        )
+        stddev = self._hashrate.stddev or 0.0
+        self.search.record(
+            TuningMeasurement(
+                frequency=frequency,
+                core_voltage=voltage,
+                hashrate=hashrate,
+                power=power,
+                temp=max(self._max_temp, float(data.get("temp") or 0.0)),
+                vr_temp=self._max_vr_temp,
+                expected_hashrate=float(expected),
+                hashrate_cv=stddev / hashrate if hashrate > 0 else 1.0,
+                aborted=aborted,
+            )
+        )
+        # Ignore refreshes until the next setting is applied
+        self._applying = True
+        self.entry.async_create_background_task(
+            self.hass, self._async_apply_next(), f"Bitaxe autotune {self.entry.entry_id}"
+        )
+
+    @callback
+    def _async_set_status(self, status: str) -> None:
+        """Change the status, store the run and notify listeners."""
+        self.status = status
+        if self.original is not None:
+            self.store.async_update(
+                self.entry.entry_id,
+                {
+                    "status": status,
+                    "original": list(self.original),
+                    "history": [m.as_dict() for m in self.history],
+                    "result": self.result.as_dict() if self.result else None,
+                },
+            )
+        self._async_notify()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for status changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self) -> None:
+        """Notify the listeners."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tuning state."""
+        bounds = self.bounds
+        return {
+            "status": self.status,
+            "original": self.original,
+            "setting": self.point,
+            "result": self.result.as_dict() if self.result else None,
+            "bounds": None
+            if bounds is None
+            else {"max_temp": bounds.max_temp, "max_power": bounds.max_power},
+            "pareto": [m.as_dict() for m in self.search.pareto] if self.search else None,
+            "history": [m.as_dict() for m in self.history],
+        }
+
+
+async def async_discard_autotune(
+    coordinator: BitaxeDataUpdateCoordinator,
+    control: BitaxeFleetControl,
+    store: BitaxeAutotuneStore,
+    entry_id: str,
+) -> None:
+    """Forget the run of a miner whose autotuning was turned off.
+
+    A run that was still searching is reverted to the original setting.
+    """
+    if (stored := store.async_get(entry_id)) is None:
+        return
+    if stored["status"] in RUNNING:
+        frequency, voltage = stored["original"]
+        try:
+            await control.async_update_settings(
+                coordinator, {"frequency": frequency, "coreVoltage": voltage}
+            )
+        except BitaxeApiError as err:
+            _LOGGER.error(
+                "Restoring %d MHz at %d mV on %s after autotuning failed: %s",
+                frequency,
+                voltage,
+                coordinator.client.host,
+                err,
+            )
+            return
+    store.async_remove(entry_id)
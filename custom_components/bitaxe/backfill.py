@@ -0,0 +1,421 @@
+"""Backfill of long-term statistics from the miner's own history."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import pairwise
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy, UnitOfPower, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import (
+    BaseUnitConverter,
+    EnergyConverter,
+    PowerConverter,
+    TemperatureConverter,
+)
+
+from .const import BACKFILL_MAX_AGE, DOMAIN, ENERGY_MAX_GAP, TIER_STATS
+from .coordinator import BitaxeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Columns of /api/system/statistics/dashboard rows, unless the response
+# names them in "labels"
+DASHBOARD_COLUMNS = ("hashrate", "asicTemp", "power", "timestamp")
+
+PowerSamples = list[tuple[datetime, float]]
+# An interval the energy sensor skipped: start, power at start, end, power at end
+EnergyGap = tuple[datetime, float, datetime, float]
+
+
+@dataclass(frozen=True)
+class _BackfillMetric:
+    """A history column imported into the statistics of a sensor."""
+
+    column: str
+    sensor_key: str
+    # Unit of the history; the sensor may be shown in another one
+    unit: str
+    converter: type[BaseUnitConverter] | None = None
+
+
+BACKFILL_METRICS = (
+    _BackfillMetric("hashrate", "hashRate", "GH/s"),
+    _BackfillMetric("power", "power", UnitOfPower.WATT, PowerConverter),
+    _BackfillMetric("asicTemp", "temp", UnitOfTemperature.CELSIUS, TemperatureConverter),
+)
+
+
+class _HourlyAggregate:
+    """Running mean, min and max of the samples of one hour."""
+
+    __slots__ = ("count", "max", "min", "total")
+
+    def __init__(self, value: float) -> None:
+        """Start with a first sample."""
+        self.count = 1
+        self.total = self.min = self.max = value
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def as_statistic(
+        self, start: datetime, convert: Callable[[float], float]
+    ) -> StatisticData:
+        """Return the aggregate as hourly statistic in the sensor's unit."""
+        return StatisticData(
+            start=start,
+            mean=convert(self.total / self.count),
+            min=convert(self.min),
+            max=convert(self.max),
+        )
+
+
+def iter_history(payload: dict[str, Any], now: datetime) -> Iterator[dict[str, Any]]:
+    """Yield the rows of a statistics payload with a wall clock ``time``.
+
+    AxeOS timestamps count milliseconds since boot; ``currentTimestamp`` is
+    the same clock at the time of the response.
+    """
+    columns = tuple(payload.get("labels") or DASHBOARD_COLUMNS)
+    if "timestamp" not in columns:
+        return
+    current = payload.get("currentTimestamp")
+    for values in payload.get("statistics") or ():
+        if not isinstance(values, list) or len(values) != len(columns):
+            continue
+        row = dict(zip(columns, values, strict=True))
+        timestamp = row["timestamp"]
+        if not isinstance(timestamp, (int, float)):
+            continue
+        if isinstance(current, (int, float)):
+            row["time"] = now - timedelta(milliseconds=current - timestamp)
+        else:
+            row["time"] = dt_util.utc_from_timestamp(timestamp / 1000)
+        yield row
+
+
+class BitaxeStatisticsBackfill:
+    """Fill gaps in long-term statistics from the miner's history buffer.
+
+    Newer AxeOS firmware keeps a history of hash rate, temperature and
+    power. After Home Assistant was down or the miner was unreachable, the
+    history is fetched in a single request and folded row by row into
+    hourly aggregates. The payload is dropped right after, so only the
+    aggregates and the power samples within the energy sensor's gaps are
+    kept while importing. Only complete hours without existing statistics
+    are imported, in one bulk import per sensor. The energy of the gaps is
+    imported into the hours it was used in and handed to the energy sensor,
+    which adds it to its total.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: BitaxeDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the backfill."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self.imported = 0
+        self._lock = asyncio.Lock()
+        self._power_listeners: list[
+            tuple[Callable[[PowerSamples], None], Callable[[], Iterable[EnergyGap]]]
+        ] = []
+        self._online = False
+
+    @callback
+    def async_add_power_listener(
+        self,
+        power_callback: Callable[[PowerSamples], None],
+        gaps: Callable[[], Iterable[EnergyGap]],
+    ) -> CALLBACK_TYPE:
+        """Receive the power samples within ``gaps`` of every backfill."""
+        listener = (power_callback, gaps)
+        self._power_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._power_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Start a backfill when the miner is reached after a gap."""
+        online = self.coordinator.last_update_success
+        if online and not self._online and not self._lock.locked():
+            self.entry.async_create_background_task(
+                self.hass, self.async_backfill(), f"Bitaxe backfill {self.entry.entry_id}"
+            )
+        self._online = online
+
+    async def async_backfill(self) -> None:
+        """Fetch the miner's history and import what is missing."""
+        tier = self.coordinator.tiers.get(TIER_STATS)
+        if tier is None or "recorder" not in self.hass.config.components:
+            return
+
+        async with self._lock:
+            await tier.async_refresh()
+            if not tier.supported or not tier.last_update_success or not tier.data:
+                return
+
+            now = dt_util.utcnow()
+            current_hour = _hour(now)
+            oldest = current_hour - BACKFILL_MAX_AGE
+            gaps = [gap for _, listener_gaps in self._power_listeners for gap in listener_gaps()]
+            hours: dict[str, dict[datetime, _HourlyAggregate]] = {
+                metric.column: {} for metric in BACKFILL_METRICS
+            }
+            power: PowerSamples = []
+            for row in iter_history(tier.data, now):
+                when = row["time"]
+                if when < oldest or when > now:
+                    continue
+                if isinstance(value := row.get("power"), (int, float)) and any(
+                    start <= when <= end for start, _, end, _ in gaps
+                ):
+                    power.append((when, value))
+                if when >= current_hour:
+                    # The recorder compiles the running hour itself
+                    continue
+                start = _hour(when)
+                for column, aggregates in hours.items():
+                    if not isinstance(value := row.get(column), (int, float)):
+                        continue
+                    if (aggregate := aggregates.get(start)) is None:
+                        aggregates[start] = _HourlyAggregate(value)
+                    else:
+                        aggregate.add(value)
+            # Nothing else reads this tier; the next backfill fetches it again
+            tier.data = {}
+
+            for metric in BACKFILL_METRICS:
+                if aggregates := hours[metric.column]:
+                    await self._async_import(metric, aggregates, current_hour)
+
+            parts = [
+                part
+                for gap in gaps
+                if (gap_parts := gap_energy(gap, power)) is not None
+                for part in gap_parts
+            ]
+            if parts:
+                await self._async_import_energy(parts, current_hour)
+
+            for power_callback, _ in list(self._power_listeners):
+                power_callback(power)
+
+    async def _async_import(
+        self,
+        metric: _BackfillMetric,
+        aggregates: dict[datetime, _HourlyAggregate],
+        end: datetime,
+    ) -> None:
+        """Import the hours a sensor has no statistics for yet."""
+        if (entity := self._async_entity(metric.sensor_key)) is None or (
+            unit := _statistic_unit(entity, metric.unit, metric.converter)
+        ) is None:
+            return
+        unit_of_measurement, convert = unit
+
+        existing = await get_instance(self.hass).async_add_executor_job(
+            _recorded_hours, self.hass, entity.entity_id, min(aggregates), end
+        )
+        statistics = [
+            aggregate.as_statistic(start, convert)
+            for start, aggregate in sorted(aggregates.items())
+            if start not in existing
+        ]
+        if not statistics:
+            return
+
+        async_import_statistics(
+            self.hass,
+            _metadata(entity, unit_of_measurement, has_mean=True, has_sum=False),
+            statistics,
+        )
+        self.imported += len(statistics)
+        _LOGGER.debug(
+            "Imported %d hours of %s history for %s",
+            len(statistics),
+            metric.column,
+            self.coordinator.client.host,
+        )
+
+    async def _async_import_energy(
+        self, parts: list[tuple[datetime, float]], end: datetime
+    ) -> None:
+        """Import the energy of the filled gaps into the hours it was used in.
+
+        The sum continues from the last statistic. Energy of hours up to
+        that one, and of the running hour, is counted by the recorder in
+        the running hour, when the energy sensor's total rises.
+        """
+        if (entity := self._async_entity("energy")) is None or (
+            unit := _statistic_unit(entity, UnitOfEnergy.KILO_WATT_HOUR, EnergyConverter)
+        ) is None:
+            return
+        unit_of_measurement, convert = unit
+
+        hours: dict[datetime, float] = {}
+        for when, energy in parts:
+            if when < end:
+                start = _hour(when)
+                hours[start] = hours.get(start, 0.0) + energy
+        if not hours:
+            return
+
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, entity.entity_id, False, {"state", "sum"}
+        )
+        if not (rows := last.get(entity.entity_id)):
+            # A new sensor; there is no sum to continue
+            return
+        after = dt_util.utc_from_timestamp(rows[0]["start"])
+        state = rows[0].get("state") or 0.0
+        total = rows[0].get("sum") or 0.0
+        statistics = []
+        for start, energy in sorted(hours.items()):
+            if start <= after:
+                continue
+            state += convert(energy)
+            total += convert(energy)
+            statistics.append(StatisticData(start=start, state=state, sum=total))
+        if not statistics:
+            return
+
+        async_import_statistics(
+            self.hass,
+            _metadata(entity, unit_of_measurement, has_mean=False, has_sum=True),
+            statistics,
+        )
+        self.imported += len(statistics)
+        _LOGGER.debug(
+            "Imported %d hours of energy for %s",
+            len(statistics),
+            self.coordinator.client.host,
+        )
+
+    @callback
+    def _async_entity(self, key: str) -> er.RegistryEntry | None:
+        """Return the registry entry of one of the miner's sensors."""
+        registry = er.async_get(self.hass)
+        if (
+            entity_id := registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{self.entry.entry_id}_{key}"
+            )
+        ) is None:
+            return None
+        return registry.async_get(entity_id)
+
+
+def _hour(when: datetime) -> datetime:
+    """Return the start of the hour of a time."""
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+def _metadata(
+    entity: er.RegistryEntry, unit: str, *, has_mean: bool, has_sum: bool
+) -> StatisticMetaData:
+    """Return the metadata of a sensor's statistics."""
+    return StatisticMetaData(
+        has_mean=has_mean,
+        has_sum=has_sum,
+        name=entity.name or entity.original_name,
+        source="recorder",
+        statistic_id=entity.entity_id,
+        unit_of_measurement=unit,
+    )
+
+
+def _statistic_unit(
+    entity: er.RegistryEntry, unit: str, converter: type[BaseUnitConverter] | None
+) -> tuple[str, Callable[[float], float]] | None:
+    """Return the unit of a sensor's statistics and the conversion to it.
+
+    The statistics are kept in the unit the sensor is shown in, which may
+    differ from the history, for example °F. None if it can't be converted.
+    """
+    target = entity.unit_of_measurement or unit
+    if target == unit:
+        return unit, float
+    if converter is None or target not in converter.VALID_UNITS:
+        _LOGGER.debug(
+            "Not importing history of %s, can't convert %s to %s",
+            entity.entity_id,
+            unit,
+            target,
+        )
+        return None
+    return target, converter.converter_factory(unit, target)
+
+
+def _recorded_hours(
+    hass: HomeAssistant, statistic_id: str, start: datetime, end: datetime
+) -> set[datetime]:
+    """Return the start times of the hourly statistics already recorded."""
+    result = statistics_during_period(
+        hass, start, end, {statistic_id}, "hour", None, {"mean"}
+    )
+    return {
+        dt_util.utc_from_timestamp(row["start"])
+        for row in result.get(statistic_id, ())
+    }
+
+
+def power_samples_between(
+    samples: Iterable[tuple[datetime, float]], start: datetime, end: datetime
+) -> PowerSamples:
+    """Return the samples taken within an interval, in time order."""
+    return sorted((when, value) for when, value in samples if start <= when <= end)
+
+
+def gap_energy(
+    gap: EnergyGap, samples: Iterable[tuple[datetime, float]]
+) -> list[tuple[datetime, float]] | None:
+    """Return the energy in kWh of a gap between history samples, by start.
+
+    Parts without history (the miner was off) are left out. None if the
+    history has no samples within the gap.
+    """
+    start, start_power, end, end_power = gap
+    if not (inner := power_samples_between(samples, start, end)):
+        return None
+    points = [(start, start_power), *inner, (end, end_power)]
+    return [
+        (t0, trapezoid(t0, p0, t1, p1))
+        for (t0, p0), (t1, p1) in pairwise(points)
+        if (t1 - t0).total_seconds() <= ENERGY_MAX_GAP
+    ]
+
+
+def trapezoid(
+    start: datetime, start_power: float, end: datetime, end_power: float
+) -> float:
+    """Return the energy in kWh between two power readings in W."""
+    hours = (end - start).total_seconds() / 3600
+    if hours <= 0:
+        return 0.0
+    return (start_power + end_power) / 2 * hours / 1000
@@ -0,0 +1,78 @@
+"""Binary sensor platform for Bitaxe integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_FLEET_TOTALS, DOMAIN
+from .coordinator import BitaxeDataUpdateCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Bitaxe binary sensors based on a config entry."""
+    if entry.data.get(CONF_FLEET_TOTALS):
+        return
+
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    added = False
+
+    @callback
+    def _async_add_problem() -> None:
+        """Add the ASIC problem sensor once the miner reports per-ASIC values."""
+        nonlocal added
+        if added or not coordinator.health.supported:
+            return
+        added = True
+        async_add_entities([BitaxeAsicProblemSensor(coordinator, entry)])
+
+    _async_add_problem()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_problem))
+
+
+class BitaxeAsicProblemSensor(
+    CoordinatorEntity[BitaxeDataUpdateCoordinator], BinarySensorEntity
+):
+    """On while any ASIC of the board is flagged by the health monitor."""
+
+    _attr_has_entity_name = True
+    _attr_name = "ASIC Problem"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(
+        self, coordinator: BitaxeDataUpdateCoordinator, entry: ConfigEntry
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_asic_problem"
+        self._attr_device_info = coordinator.device_info
+        self._written: tuple[Any, ...] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the flagged ASICs or availability changed."""
+        current = (self.available, self.coordinator.health.problems)
+        if current != self._written:
+            self._written = current
+            self.async_write_ha_state()
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if any ASIC is flagged."""
+        return self.coordinator.health.problem
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the 1-based numbers of the flagged ASICs per problem."""
+        return self.coordinator.health.problems
@@ -0,0 +1,60 @@
+"""Button platform for Bitaxe integration."""
+from __future__ import annotations
+
+from homeassistant.components.button import ButtonDeviceClass, ButtonEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import BitaxeApiError
+from .const import CONF_FLEET_TOTALS, CONTROL_DATA_KEY, DOMAIN
+from .control import BitaxeFleetControl
+from .coordinator import BitaxeDataUpdateCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Bitaxe buttons based on a config entry."""
+    if entry.data.get(CONF_FLEET_TOTALS):
+        return
+
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [BitaxeRestartButton(coordinator, hass.data[CONTROL_DATA_KEY], entry)]
+    )
+
+
+class BitaxeRestartButton(CoordinatorEntity[BitaxeDataUpdateCoordinator], ButtonEntity):
+    """Restart the miner, in turn with restarts of other miners."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Restart"
+    _attr_device_class = ButtonDeviceClass.RESTART
+    _attr_entity_category = EntityCategory.CONFIG
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        control: BitaxeFleetControl,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_restart"
+        self._attr_device_info = coordinator.device_info
+        self._control = control
+
+    async def async_press(self) -> None:
+        """Restart the miner."""
+        try:
+            await self._control.async_restart(self.coordinator)
+        except BitaxeApiError as err:
+            raise HomeAssistantError(
+                f"Restarting {self.coordinator.client.host} failed: {err}"
+            ) from err
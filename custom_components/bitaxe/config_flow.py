@@ -1,19 +1,56 @@
 """Config flow for Bitaxe integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from ipaddress import IPv4Network, IPv6Network, ip_network
 from typing import Any
 
 import voluptuous as vol
-
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import BitaxeApiClient, BitaxeApiError
-from .const import DOMAIN
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AUTOTUNE,
+    CONF_CRITICAL,
+    CONF_DEADBANDS,
+    CONF_ENERGY_SAMPLE_INTERVAL,
+    CONF_FLEET_POLLING,
+    CONF_FLEET_TOTALS,
+    CONF_HISTORY_SIZE,
+    CONF_HOSTS,
+    CONF_INSTRUMENTATION,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PER_ASIC_SENSORS,
+    CONF_PUSH_UPDATES,
+    CONF_SUBNET,
+    CONF_TAGS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_AUTOTUNE,
+    DEFAULT_CRITICAL,
+    DEFAULT_DEADBANDS,
+    DEFAULT_ENERGY_SAMPLE_INTERVAL,
+    DEFAULT_FLEET_POLLING,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_INSTRUMENTATION,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_PER_ASIC_SENSORS,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_TAGS,
+    DISCOVERY_MAX_HOSTS,
+    DOMAIN,
+    REQUEST_CACHE_DATA_KEY,
+    SNAPSHOT_DATA_KEY,
+)
+from .discovery import DiscoveredMiner, async_scan_network, miner_title, miner_unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,19 +60,28 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+STEP_SCAN_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_SUBNET): str,
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
     session = async_get_clientsession(hass)
-    client = BitaxeApiClient(data[CONF_HOST], session)
+    client = BitaxeApiClient(
+        data[CONF_HOST], session, request_cache=hass.data.get(REQUEST_CACHE_DATA_KEY)
+    )
 
     # Test connection by getting system info
     system_info = await client.async_get_system_info()
 
     # Return info that you want to store in the config entry
     return {
-        "title": f"Bitaxe {system_info.get('ASICModel', 'Miner')}",
+        "title": miner_title(system_info),
         "model": system_info.get("ASICModel", "Unknown"),
+        "unique_id": miner_unique_id(data[CONF_HOST], system_info),
     }
 
 
@@ -44,10 +90,40 @@ class BitaxeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> BitaxeOptionsFlow:
+        """Get the options flow for this handler."""
+        return BitaxeOptionsFlow()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> bool:
+        """Return options support; the fleet totals device has no options."""
+        return not config_entry.data.get(CONF_FLEET_TOTALS)
+
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._network: IPv4Network | IPv6Network | None = None
+        self._scan_task: asyncio.Task[list[DiscoveredMiner]] | None = None
+        self._discovered: dict[str, DiscoveredMiner] = {}
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["manual", "scan", "fleet_totals"]
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add a single miner by IP address or hostname."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -59,10 +135,215 @@ class BitaxeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                await self.async_set_unique_id(user_input[CONF_HOST])
+                await self.async_set_unique_id(info["unique_id"])
                 self._abort_if_unique_id_configured()
+                self._async_abort_entries_match({CONF_HOST: user_input[CONF_HOST]})
                 return self.async_create_entry(title=info["title"], data=user_input)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="manual", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_fleet_totals(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add the device with totals across all miners."""
+        await self.async_set_unique_id(CONF_FLEET_TOTALS)
+        self._abort_if_unique_id_configured()
+        if user_input is not None:
+            return self.async_create_entry(
+                title="Bitaxe Fleet", data={CONF_FLEET_TOTALS: True}
+            )
+        return self.async_show_form(step_id="fleet_totals")
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for the network to scan for miners."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                network = ip_network(user_input[CONF_SUBNET], strict=False)
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                if network.num_addresses > DISCOVERY_MAX_HOSTS:
+                    errors[CONF_SUBNET] = "subnet_too_large"
+                else:
+                    self._network = network
+                    return await self.async_step_scan_progress()
+
+        return self.async_show_form(
+            step_id="scan", data_schema=STEP_SCAN_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_scan_progress(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan the network in the background while showing progress."""
+        assert self._network is not None
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_task(
+                async_scan_network(self.hass, self._network)
+            )
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan_progress",
+                progress_action="scan",
+                progress_task=self._scan_task,
+                description_placeholders={"subnet": str(self._network)},
+            )
+
+        known = self._async_known_miners()
+        self._discovered = {
+            miner.host: miner
+            for miner in self._scan_task.result()
+            if miner.unique_id not in known and miner.host not in known
+        }
+        return self.async_show_progress_done(next_step_id="scan_confirm")
+
+    def _async_known_miners(self) -> set[str]:
+        """Return unique ids, hosts and MAC addresses of configured miners."""
+        snapshots = self.hass.data.get(SNAPSHOT_DATA_KEY)
+        known: set[str] = set()
+        for entry in self._async_current_entries(include_ignore=True):
+            if entry.unique_id:
+                known.add(entry.unique_id)
+            if host := entry.data.get(CONF_HOST):
+                known.add(host)
+            if snapshots is not None and (snapshot := snapshots.async_get(entry.entry_id)):
+                known.add(miner_unique_id(host, snapshot))
+        return known
+
+    async def async_step_scan_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick which of the discovered miners to add."""
+        if not self._discovered:
+            return self.async_abort(reason="no_devices_found")
+
+        if user_input is not None:
+            selected = [self._discovered[host] for host in user_input[CONF_HOSTS]]
+            if not selected:
+                return self.async_abort(reason="no_devices_found")
+
+            # One flow creates one entry, so the other miners get their own flow
+            first, *others = selected
+            for miner in others:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                        data={
+                            CONF_HOST: miner.host,
+                            "unique_id": miner.unique_id,
+                            "title": miner.title,
+                        },
+                    )
+                )
+
+            await self.async_set_unique_id(first.unique_id)
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(title=first.title, data={CONF_HOST: first.host})
+
+        hosts = {
+            host: f"{miner.title} ({host})"
+            for host, miner in sorted(self._discovered.items())
+        }
+        return self.async_show_form(
+            step_id="scan_confirm",
+            data_schema=vol.Schema(
+                {vol.Required(CONF_HOSTS, default=list(hosts)): cv.multi_select(hosts)}
+            ),
+            description_placeholders={"count": str(len(hosts))},
+        )
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> FlowResult:
+        """Add a miner selected during a network scan."""
+        await self.async_set_unique_id(discovery_info["unique_id"])
+        self._abort_if_unique_id_configured()
+        self._async_abort_entries_match({CONF_HOST: discovery_info[CONF_HOST]})
+        return self.async_create_entry(
+            title=discovery_info["title"],
+            data={CONF_HOST: discovery_info[CONF_HOST]},
+        )
+
+
+class BitaxeOptionsFlow(config_entries.OptionsFlow):
+    """Handle Bitaxe options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_interval_bounds"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_FLEET_POLLING,
+                    default=options.get(CONF_FLEET_POLLING, DEFAULT_FLEET_POLLING),
+                ): bool,
+                vol.Optional(
+                    CONF_CRITICAL,
+                    default=options.get(CONF_CRITICAL, DEFAULT_CRITICAL),
+                ): bool,
+                vol.Optional(
+                    CONF_TAGS,
+                    default=options.get(CONF_TAGS, DEFAULT_TAGS),
+                ): str,
+                vol.Optional(
+                    CONF_DEADBANDS,
+                    default=options.get(CONF_DEADBANDS, DEFAULT_DEADBANDS),
+                ): bool,
+                vol.Optional(
+                    CONF_PER_ASIC_SENSORS,
+                    default=options.get(CONF_PER_ASIC_SENSORS, DEFAULT_PER_ASIC_SENSORS),
+                ): bool,
+                vol.Optional(
+                    CONF_ENERGY_SAMPLE_INTERVAL,
+                    default=options.get(
+                        CONF_ENERGY_SAMPLE_INTERVAL, DEFAULT_ENERGY_SAMPLE_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+                vol.Optional(
+                    CONF_HISTORY_SIZE,
+                    default=options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=2000)),
+                vol.Optional(
+                    CONF_PUSH_UPDATES,
+                    default=options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+                ): bool,
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+                ): bool,
+                vol.Optional(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_INSTRUMENTATION,
+                    default=options.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION),
+                ): bool,
+                vol.Optional(
+                    CONF_AUTOTUNE,
+                    default=options.get(CONF_AUTOTUNE, DEFAULT_AUTOTUNE),
+                ): bool,
+            }
         )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -1,15 +1,267 @@
 """Constants for the Bitaxe integration."""
+from datetime import timedelta
 
 DOMAIN = "bitaxe"
 
 # Config flow
 CONF_HOST = "host"
+CONF_FLEET_TOTALS = "fleet_totals"  # Marks the entry of the fleet totals device
+CONF_SUBNET = "subnet"
+CONF_HOSTS = "hosts"
+
+# Options
+CONF_FLEET_POLLING = "fleet_polling"
+CONF_CRITICAL = "critical"
+CONF_DEADBANDS = "deadbands"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_INSTRUMENTATION = "instrumentation"
+CONF_PER_ASIC_SENSORS = "per_asic_sensors"
+CONF_ENERGY_SAMPLE_INTERVAL = "energy_sample_interval"
+CONF_HISTORY_SIZE = "history_size"
+CONF_TAGS = "tags"
+CONF_AUTOTUNE = "autotune"
 
 # Default values
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_FLEET_POLLING = False
+DEFAULT_CRITICAL = False
+DEFAULT_DEADBANDS = False
+DEFAULT_PUSH_UPDATES = False
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_SCAN_INTERVAL = 10
+DEFAULT_MAX_SCAN_INTERVAL = 120
+DEFAULT_INSTRUMENTATION = False
+DEFAULT_PER_ASIC_SENSORS = False
+DEFAULT_ENERGY_SAMPLE_INTERVAL = 0  # Only sample power on regular refreshes
+DEFAULT_HISTORY_SIZE = 60  # Samples kept per metric
+DEFAULT_TAGS = ""
+DEFAULT_AUTOTUNE = False
+
+# Refresh tiers: telemetry is polled at the scan interval, the endpoints
+# below at their own slower cadence
+TIER_STATS = "stats"
+TIER_STATIC = "static"
+STATS_SCAN_INTERVAL = 300
+STATIC_SCAN_INTERVAL = 3600
+
+# Long-term statistics backfill from the miner's history buffer
+BACKFILL_MAX_AGE = timedelta(hours=24)
+
+# Fleet scheduler (shared poller for all miners that opt in)
+FLEET_DATA_KEY = f"{DOMAIN}_fleet"
+FLEET_TICK_SECONDS = 1
+FLEET_MAX_CONCURRENCY = 16
+# Seconds after a poll is due by which it should have started. Polls of low
+# priority that are later than this are skipped until their next interval.
+FLEET_POLL_DEADLINE = 5
+
+# Fleet poll priorities, in the order queued polls are started: miners marked
+# critical, overheating or near their target temperature first, unreachable
+# miners last
+PRIORITY_HIGH = "high"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+PRIORITIES = (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW)
+
+# Control actions (settings changes and restarts)
+CONTROL_DATA_KEY = f"{DOMAIN}_control"
+CONTROL_MAX_CONCURRENCY = 8
+# Minimum seconds between two writes to the same miner
+CONTROL_MIN_INTERVAL = 2
+# Seconds between restarts, so a rack does not draw inrush current at once
+CONTROL_RESTART_STAGGER = 5
+# Lowest and highest frequency (MHz) and core voltage (mV) sent to a miner
+# that does not list the values it supports
+CONTROL_MIN_FREQUENCY = 100
+CONTROL_MAX_FREQUENCY = 1000
+CONTROL_MIN_CORE_VOLTAGE = 900
+CONTROL_MAX_CORE_VOLTAGE = 1400
+
+SERVICE_APPLY_SETTINGS = "apply_settings"
+ATTR_ALL = "all"
+ATTR_TAG = "tag"
+ATTR_FREQUENCY = "frequency"
+ATTR_CORE_VOLTAGE = "core_voltage"
+ATTR_FAN_SPEED = "fan_speed"
+ATTR_AUTO_FAN = "auto_fan"
+ATTR_RESTART = "restart"
+
+# Autotuner. Every setting is left to settle, then measured for a window;
+# a full search takes a few hours.
+AUTOTUNE_DATA_KEY = f"{DOMAIN}_autotune"
+AUTOTUNE_STORAGE_KEY = f"{DOMAIN}.autotune"
+AUTOTUNE_STORAGE_VERSION = 1
+AUTOTUNE_SAVE_DELAY = 10
+AUTOTUNE_SETTLE_TIME = 120
+AUTOTUNE_MEASURE_TIME = 600
+AUTOTUNE_MIN_SAMPLES = 10
+AUTOTUNE_MAX_STEPS = 40
+# Search grid, and its extent around the current setting when the firmware
+# does not list the supported frequencies and voltages
+AUTOTUNE_FREQUENCY_STEP = 25
+AUTOTUNE_FREQUENCY_SPREAD = 100
+AUTOTUNE_VOLTAGE_STEP = 10
+AUTOTUNE_VOLTAGE_SPREAD = 100
+# A setting is stable when it reaches this share of the expected hash rate
+# with a coefficient of variation below AUTOTUNE_MAX_HASHRATE_CV
+AUTOTUNE_MIN_HASHRATE_RATIO = 0.95
+AUTOTUNE_MAX_HASHRATE_CV = 0.15
+# Lower frequencies are searched until efficiency is this much worse than
+# the best found, which keeps measurement noise from ending the search early
+AUTOTUNE_EFFICIENCY_TOLERANCE = 0.01
+# Degrees a setting may run above the target temperature
+AUTOTUNE_TEMP_MARGIN = 3
+AUTOTUNE_DEFAULT_MAX_TEMP = 65
+AUTOTUNE_MAX_VR_TEMP = 85
+
+AUTOTUNE_IDLE = "idle"
+AUTOTUNE_SETTLING = "settling"
+AUTOTUNE_MEASURING = "measuring"
+AUTOTUNE_CONVERGED = "converged"
+AUTOTUNE_FAILED = "failed"
+
+# Energy integration. Power is sampled on every refresh (and optionally by a
+# faster dedicated sampler) but the energy state is written less often.
+ENERGY_WRITE_INTERVAL = 60
+# Intervals without a power reading longer than this are not integrated
+ENERGY_MAX_GAP = 900
+# Skipped intervals remembered for filling from the miner's history
+ENERGY_MAX_GAPS = 10
+
+# Rolling statistics over recent samples kept in memory per miner
+HISTORY_WINDOW = 900
+# Shortest time between refreshes the history is sized for: requested
+# refreshes (push, services) are debounced this long, and only adaptive
+# polling may poll faster, down to its minimum interval
+HISTORY_MIN_SPACING = 10
+HISTORY_METRICS = ("hashRate", "power", "temp", "sharesAccepted", "sharesRejected")
+# Metrics that only increase until the miner restarts
+HISTORY_COUNTERS = ("sharesAccepted", "sharesRejected")
+
+# Per-ASIC health. Baselines are exponentially weighted means and variances,
+# so memory per ASIC is fixed and every refresh costs O(ASICs).
+HEALTH_ALPHA = 0.2  # Weight of a new sample in the smoothed values
+HEALTH_BASELINE_ALPHA = 0.005  # Weight of a new sample in the error rate baseline
+HEALTH_WARMUP = 20  # Samples of an ASIC before it can be flagged
+# Hash rate of an ASIC relative to the mean of the other ASICs on the board
+HEALTH_MIN_PEER_RATIO = 0.8
+# Smoothed error rate (per minute) this many standard errors above its baseline
+HEALTH_ERROR_Z = 3.0
+HEALTH_MIN_ERROR_RATE = 1.0
+# Degrees an ASIC may run above the mean of the other ASICs
+HEALTH_MAX_TEMP_OFFSET = 8.0
+# Share of an ASIC's score lost per error rate or temperature problem
+HEALTH_PROBLEM_PENALTY = 0.15
+
+HEALTH_LOW_HASHRATE = "low_hashrate"
+HEALTH_ERROR_RATE = "error_rate"
+HEALTH_TEMPERATURE = "temperature"
+HEALTH_PROBLEMS = (HEALTH_LOW_HASHRATE, HEALTH_ERROR_RATE, HEALTH_TEMPERATURE)
+
+# Totals across all miners, shown on a separate fleet device
+FLEET_TOTALS_DATA_KEY = f"{DOMAIN}_totals"
+FLEET_TOTALS_DELAY = 1
+# Incremental updates after which the totals are summed again from scratch
+FLEET_TOTALS_RESUM_UPDATES = 1000
+
+# Network discovery
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_TIMEOUT = 2
+DISCOVERY_PORT = 80
+DISCOVERY_MAX_HOSTS = 1024  # A /22
+
+# Last good payload per entry, used to set up entities without waiting for
+# the miner on startup
+SNAPSHOT_DATA_KEY = f"{DOMAIN}_snapshots"
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshots"
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_INTERVAL = 600  # Minimum seconds between saves of the same entry
+SNAPSHOT_SAVE_DELAY = 10
+
+# Requests for the same miner and endpoint are shared, and responses reused
+# for this many seconds
+REQUEST_CACHE_DATA_KEY = f"{DOMAIN}_requests"
+RESPONSE_CACHE_TTL = 2
+
+# Payload keys per firmware version and ASIC model
+SCHEMA_DATA_KEY = f"{DOMAIN}_schemas"
+SCHEMA_STORAGE_KEY = f"{DOMAIN}.schemas"
+SCHEMA_STORAGE_VERSION = 1
+SCHEMA_SAVE_DELAY = 10
+
+# Request timeout and per-miner circuit breaker. The timeout adapts to the
+# observed p99 response latency times a safety margin, within bounds.
+REQUEST_TIMEOUT = 10
+REQUEST_TIMEOUT_MIN = 2
+REQUEST_TIMEOUT_MARGIN = 3
+LATENCY_SAMPLES = 50
+LATENCY_MIN_SAMPLES = 10
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF_MIN = 30
+BREAKER_BACKOFF_MAX = 900
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Refresh pipeline instrumentation
+TIMING_SAMPLES = 200
+STAGE_REQUEST = "request"  # HTTP round trip until the response headers
+STAGE_READ = "read"  # Reading the response body
+STAGE_PARSE = "parse"  # JSON decoding
+STAGE_FETCH = "fetch"  # Complete fetch as seen by the coordinator
+STAGE_EXTRACT = "extract"  # Sensor value extraction
+STAGE_NOTIFY = "notify"  # Entity updates and state writes
+TIMING_STAGES = (
+    STAGE_REQUEST,
+    STAGE_READ,
+    STAGE_PARSE,
+    STAGE_FETCH,
+    STAGE_EXTRACT,
+    STAGE_NOTIFY,
+)
+
+# Dedicated HTTP connection pool: the ESP32 only has a few sockets, so keep
+# one persistent connection per miner and cap the total across the fleet.
+SESSION_DATA_KEY = f"{DOMAIN}_session"
+CONNECTION_LIMIT = 32
+CONNECTION_LIMIT_PER_HOST = 1
+CONNECTION_KEEPALIVE = 2 * DEFAULT_SCAN_INTERVAL
+DNS_CACHE_TTL = 300
+
+# Adaptive polling: poll at the minimum interval when the miner is within
+# this many degrees of its target temperature or its hash rate deviates this
+# much (fraction) from the expected hash rate. Otherwise the interval doubles
+# while the miner is stable, that is its temperature (degrees) and hash rate
+# (fraction) changed less than below since the previous poll, and halves
+# while it is not.
+ADAPTIVE_TEMP_MARGIN = 3
+ADAPTIVE_HASHRATE_DEVIATION = 0.2
+ADAPTIVE_STABLE_TEMP_DELTA = 1.0
+ADAPTIVE_STABLE_HASHRATE_DELTA = 0.05
+
+# Push updates over the AxeOS websocket
+PUSH_FALLBACK_INTERVAL = 300  # Safety-net poll interval while the websocket is up
+PUSH_RECONNECT_MIN = 5
+PUSH_RECONNECT_MAX = 300
+# The stream carries the miner's ESP-IDF log. Warnings and errors logged under
+# these tags (power management, voltage regulator, fan controller) and lines
+# containing one of the events trigger an immediate refresh. Everything else,
+# such as routine power and share reports, is ignored.
+PUSH_REFRESH_LEVELS = ("E", "W")
+PUSH_REFRESH_TAGS = ("power_management", "TPS546", "EMC2101", "EMC2302")
+PUSH_REFRESH_EVENTS = ("OVERHEAT",)
 
 # API endpoints (per AxeOS documentation at https://osmu.wiki/bitaxe/api/)
+API_SYSTEM = "/api/system"  # PATCH to change settings
+API_SYSTEM_RESTART = "/api/system/restart"  # POST to restart the miner
 API_SYSTEM_INFO = "/api/system/info"  # Returns all mining data (power, hashrate, temp, fan, etc.)
+API_SYSTEM_ASIC = "/api/system/asic"  # Static ASIC details (newer firmware)
+API_STATISTICS_DASHBOARD = "/api/system/statistics/dashboard"  # Recent history
+API_WEBSOCKET = "/api/ws"  # Live log stream (newer firmware)
 
 
 # Sensor keys
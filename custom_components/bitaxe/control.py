@@ -0,0 +1,193 @@
+"""Settings changes and restarts of one or many Bitaxe miners."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .api import BitaxeApiClient, BitaxeApiError
+from .const import (
+    CONTROL_MAX_CONCURRENCY,
+    CONTROL_MAX_CORE_VOLTAGE,
+    CONTROL_MAX_FREQUENCY,
+    CONTROL_MIN_CORE_VOLTAGE,
+    CONTROL_MIN_FREQUENCY,
+    CONTROL_MIN_INTERVAL,
+    CONTROL_RESTART_STAGGER,
+    TIER_STATIC,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Settings that must stay within the values the miner lists in its static
+# details, or within the hard limits when it lists none
+SETTING_LIMITS = {
+    "frequency": ("frequencyOptions", CONTROL_MIN_FREQUENCY, CONTROL_MAX_FREQUENCY),
+    "coreVoltage": ("voltageOptions", CONTROL_MIN_CORE_VOLTAGE, CONTROL_MAX_CORE_VOLTAGE),
+}
+
+
+@dataclass
+class BitaxeControlResult:
+    """Outcome of a control action on one miner."""
+
+    success: bool
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as service response data."""
+        return asdict(self)
+
+
+class BitaxeFleetControl:
+    """Send settings changes and restarts to miners with bounded concurrency.
+
+    All writes, from entities and from the fleet service, run on a pool of
+    at most ``max_concurrency`` requests. Writes to the same miner are
+    spaced at least ``min_interval`` seconds apart, and restarts across the
+    fleet at least ``restart_stagger`` seconds apart.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrency: int = CONTROL_MAX_CONCURRENCY,
+        min_interval: float = CONTROL_MIN_INTERVAL,
+        restart_stagger: float = CONTROL_RESTART_STAGGER,
+    ) -> None:
+        """Initialize the control."""
+        self.hass = hass
+        self.min_interval = min_interval
+        self.restart_stagger = restart_stagger
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_write: dict[str, float] = {}
+        # Monotonic time from which the next restart may be sent
+        self._next_restart = 0.0
+
+    async def _async_write(
+        self, client: BitaxeApiClient, write: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Send a write once the miner's rate limit and the pool allow it."""
+        lock = self._locks.setdefault(client.host, asyncio.Lock())
+        async with lock:
+            # Wait outside the pool so a rate limited miner holds no worker
+            last = self._last_write.get(client.host)
+            if last is not None and (
+                wait := last + self.min_interval - time.monotonic()
+            ) > 0:
+                await asyncio.sleep(wait)
+            try:
+                async with self._semaphore:
+                    await write()
+            finally:
+                self._last_write[client.host] = time.monotonic()
+
+    async def _async_restart(self, client: BitaxeApiClient) -> None:
+        """Restart a miner in its turn of the restart stagger."""
+        now = time.monotonic()
+        delay = max(self._next_restart - now, 0.0)
+        # Reserve the slot before waiting so concurrent restarts queue up
+        self._next_restart = now + delay + self.restart_stagger
+        if delay:
+            await asyncio.sleep(delay)
+        await self._async_write(client, client.async_restart)
+
+    async def async_update_settings(
+        self, coordinator: BitaxeDataUpdateCoordinator, settings: dict[str, Any]
+    ) -> None:
+        """Change settings of a single miner and refresh it."""
+        client = coordinator.client
+        await self._async_write(client, lambda: client.async_update_settings(settings))
+        await coordinator.async_request_refresh()
+
+    async def async_restart(self, coordinator: BitaxeDataUpdateCoordinator) -> None:
+        """Restart a single miner."""
+        await self._async_restart(coordinator.client)
+
+    async def async_apply(
+        self,
+        coordinators: Iterable[BitaxeDataUpdateCoordinator],
+        settings: dict[str, Any],
+        restart: bool = False,
+    ) -> dict[str, BitaxeControlResult]:
+        """Apply settings and/or a restart to many miners; return results by host.
+
+        A miner is skipped if the settings are outside what it supports. Miners
+        that were changed without a restart are refreshed together once
+        every write has finished.
+        """
+        coordinators = list(coordinators)
+
+        async def _async_apply_one(
+            coordinator: BitaxeDataUpdateCoordinator,
+        ) -> BitaxeControlResult:
+            client = coordinator.client
+            try:
+                if (error := await async_check_limits(coordinator, settings)) is not None:
+                    _LOGGER.warning("Not changing %s: %s", client.host, error)
+                    return BitaxeControlResult(False, error)
+                if settings:
+                    await self._async_write(
+                        client, lambda: client.async_update_settings(settings)
+                    )
+                if restart:
+                    await self._async_restart(client)
+            except BitaxeApiError as err:
+                _LOGGER.warning("Control of %s failed: %s", client.host, err)
+                return BitaxeControlResult(False, str(err))
+            return BitaxeControlResult(True)
+
+        results = await asyncio.gather(
+            *(_async_apply_one(coordinator) for coordinator in coordinators)
+        )
+
+        if not restart:
+            # Restarted miners are picked up by their next poll once back
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh()
+                    for coordinator, result in zip(coordinators, results, strict=True)
+                    if result.success
+                )
+            )
+
+        return {
+            coordinator.client.host: result
+            for coordinator, result in zip(coordinators, results, strict=True)
+        }
+
+
+async def async_check_limits(
+    coordinator: BitaxeDataUpdateCoordinator, settings: dict[str, Any]
+) -> str | None:
+    """Return why the settings are outside what a miner supports, None if they aren't."""
+    limited = [key for key in SETTING_LIMITS if key in settings]
+    if not limited:
+        return None
+
+    options: dict[str, Any] = {}
+    if (static := coordinator.tiers.get(TIER_STATIC)) is not None:
+        if static.supported and static.data is None:
+            await static.async_refresh()
+        options = static.data or {}
+
+    for key in limited:
+        options_key, hard_min, hard_max = SETTING_LIMITS[key]
+        listed = [
+            value
+            for value in options.get(options_key) or ()
+            if isinstance(value, (int, float))
+        ]
+        minimum, maximum = (min(listed), max(listed)) if listed else (hard_min, hard_max)
+        if settings[key] < minimum:
+            return f"{key} {settings[key]} is below the minimum of {minimum:g}"
+        if settings[key] > maximum:
+            return f"{key} {settings[key]} is above the maximum of {maximum:g}"
+    return None
@@ -1,32 +1,477 @@
 """DataUpdateCoordinator for Bitaxe."""
-from datetime import timedelta
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import BitaxeApiClient, BitaxeApiError
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .api import BitaxeApiClient, BitaxeApiError, BitaxeNotSupportedError
+from .const import (
+    ADAPTIVE_HASHRATE_DEVIATION,
+    ADAPTIVE_STABLE_HASHRATE_DELTA,
+    ADAPTIVE_STABLE_TEMP_DELTA,
+    ADAPTIVE_TEMP_MARGIN,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    HISTORY_MIN_SPACING,
+    PRIORITIES,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    PUSH_FALLBACK_INTERVAL,
+    STAGE_EXTRACT,
+    STAGE_FETCH,
+    STAGE_NOTIFY,
+    TIER_STATIC,
+)
+from .health import BitaxeAsicHealth
+from .instrumentation import BitaxeStageTimings
+from .timeseries import BitaxeTimeSeries
+
+if TYPE_CHECKING:
+    from .autotune import BitaxeAutotuner
+    from .backfill import BitaxeStatisticsBackfill
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class BitaxeWriteStats:
+    """Counts of sensor state writes emitted and suppressed by change detection."""
+
+    emitted: int = 0
+    suppressed: int = 0
+
+
+class _ExtractionGroup(NamedTuple):
+    """An extractor and the value table slots it fills."""
+
+    extractor: Callable[[dict[str, Any]], Any]
+    source_keys: tuple[str, ...]
+    slot: int
+    # None for scalar extractors, otherwise the number of list items to take
+    size: int | None
+    # Index of the first list item to take
+    offset: int
+
+
+class BitaxeValueTable:
+    """Sensor values extracted from the payload in one pass per refresh.
+
+    Sensors register an extractor together with the payload keys it reads and
+    get back a slot index. Array extractors (for example per-ASIC values) fill
+    a contiguous range of slots from a single call. On every refresh the
+    payload is diffed once and only extractors whose source keys changed are
+    evaluated again; sensors then simply read ``values[slot]``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.values: list[Any] = []
+        self.changed: frozenset[str] = frozenset()
+        self._groups: list[_ExtractionGroup] = []
+        self._data: dict[str, Any] | None = None
+
+    def register(
+        self, extractor: Callable[[dict[str, Any]], Any], source_keys: tuple[str, ...]
+    ) -> int:
+        """Add a scalar extractor and return its slot."""
+        return self._add_group(_ExtractionGroup(extractor, source_keys, len(self.values), None, 0))
+
+    def register_array(
+        self,
+        extractor: Callable[[dict[str, Any]], list[Any]],
+        source_keys: tuple[str, ...],
+        size: int,
+        offset: int = 0,
+    ) -> int:
+        """Add an extractor returning a list and return its first slot.
+
+        ``size`` items starting at ``offset`` are stored, so slots for items
+        that appear later can be added with another call.
+        """
+        return self._add_group(
+            _ExtractionGroup(extractor, source_keys, len(self.values), size, offset)
+        )
+
+    def _add_group(self, group: _ExtractionGroup) -> int:
+        """Reserve the slots of a group and fill them from the current payload."""
+        self.values.extend([None] * (group.size or 1))
+        self._groups.append(group)
+        if self._data is not None:
+            self._extract(group, self._data)
+        return group.slot
+
+    def _extract(self, group: _ExtractionGroup, data: dict[str, Any]) -> None:
+        """Evaluate one extractor into its slot(s)."""
+        if group.size is None:
+            try:
+                self.values[group.slot] = group.extractor(data)
+            except KeyError:
+                # Direct key lookups of a key the payload no longer has
+                self.values[group.slot] = None
+            return
+        items = group.extractor(data)[group.offset : group.offset + group.size]
+        if len(items) < group.size:
+            items = [*items, *[None] * (group.size - len(items))]
+        self.values[group.slot : group.slot + group.size] = items
+
+    def update(self, data: dict[str, Any] | None) -> None:
+        """Diff the payload against the previous one and refresh changed slots."""
+        if data is self._data:
+            self.changed = frozenset()
+            return
+
+        previous = self._data or {}
+        current = data or {}
+        self.changed = frozenset(
+            {
+                key
+                for key in previous.keys() | current.keys()
+                if previous.get(key) != current.get(key)
+            }
+        )
+        self._data = data
+
+        if data is None:
+            self.values = [None] * len(self.values)
+            return
+        for group in self._groups:
+            if not self.changed.isdisjoint(group.source_keys):
+                self._extract(group, data)
+
+
+class BitaxeTierCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Refresh one slower-changing endpoint of a miner at its own cadence.
+
+    Entities using a tier listen to its coordinator only, so refreshes of
+    the telemetry don't wake them. Like any coordinator it only polls while
+    something listens. Firmware without the endpoint yields an empty
+    payload and stops polling.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: BitaxeApiClient,
+        tier: str,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+        interval: int,
+    ) -> None:
+        """Initialize."""
+        self.client = client
+        self.tier = tier
+        self.supported = True
+        self._fetch = fetch
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {tier}",
+            update_interval=timedelta(seconds=interval),
+        )
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch the tier's endpoint."""
+        try:
+            return await self._fetch()
+        except BitaxeNotSupportedError as err:
+            _LOGGER.debug("%s, not polling the %s tier", err, self.tier)
+            self.supported = False
+            self.update_interval = None
+            return {}
+        except BitaxeApiError as err:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+
 class BitaxeDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Bitaxe data."""
 
-    def __init__(self, hass: HomeAssistant, client: BitaxeApiClient) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: BitaxeApiClient,
+        adaptive_bounds: tuple[int, int] | None = None,
+        instrumentation: bool = False,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+    ) -> None:
         """Initialize."""
         self.client = client
+        # Shared with the client so all stages of a refresh land in one place
+        self.timings = BitaxeStageTimings() if instrumentation else None
+        client.timings = self.timings
+        # (min, max) seconds when the poll interval adapts to the miner state
+        self.adaptive_bounds = adaptive_bounds
+        # Desired poll interval; update_interval is None while the fleet
+        # scheduler drives refreshes instead of the coordinator's own timer.
+        self.poll_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        self.polls = 0
+        # Requests avoided by adaptive polling compared to DEFAULT_SCAN_INTERVAL
+        self.polls_saved = 0.0
+        # Temperature and hash rate of the previous poll, None if it failed
+        self._last_reading: tuple[Any, Any] | None = None
+        self.fleet_managed = False
+        # Marked critical by the user: polled first by the fleet scheduler
+        self.critical = False
+        # Fleet polls that started after their deadline, per priority, and
+        # low priority polls skipped because of that
+        self.missed_deadlines = dict.fromkeys(PRIORITIES, 0)
+        self.polls_shed = 0
+        self.push_connected = False
+        self.write_stats = BitaxeWriteStats()
+        self.values = BitaxeValueTable()
+        self.history = BitaxeTimeSeries(
+            history_size,
+            min_spacing=min(adaptive_bounds[0], HISTORY_MIN_SPACING)
+            if adaptive_bounds
+            else HISTORY_MIN_SPACING,
+        )
+        self.health = BitaxeAsicHealth()
+        # Slower refresh tiers of the same miner, keyed by tier name
+        self.tiers: dict[str, BitaxeTierCoordinator] = {}
+        # Imports the miner's own history after gaps, set up by the entry
+        self.backfill: BitaxeStatisticsBackfill | None = None
+        # Only set while autotuning is enabled for the entry
+        self.autotuner: BitaxeAutotuner | None = None
+        # Shared by all entities of the entry, see async_setup_device_info
+        self.device_info: DeviceInfo | None = None
+        self._device_entry: ConfigEntry | None = None
+        self._refresh_listeners: list[CALLBACK_TYPE] = []
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=self.poll_interval,
         )
 
+    @property
+    def refresh_interval(self) -> timedelta:
+        """Return the interval at which the miner should be polled."""
+        if self.push_connected:
+            # Pushed updates keep the data fresh; polling is only a safety net
+            return max(self.poll_interval, timedelta(seconds=PUSH_FALLBACK_INTERVAL))
+        return self.poll_interval
+
+    @property
+    def poll_priority(self) -> str:
+        """Return the priority of the miner's next fleet poll."""
+        if self.critical:
+            return PRIORITY_HIGH
+        if not self.last_update_success:
+            return PRIORITY_LOW
+        if self.data and _running_hot(self.data):
+            return PRIORITY_HIGH
+        return PRIORITY_NORMAL
+
+    def _update_schedule(self) -> None:
+        """Apply the refresh interval to the coordinator's own timer."""
+        self.update_interval = None if self.fleet_managed else self.refresh_interval
+
+    def set_fleet_managed(self, managed: bool) -> None:
+        """Hand scheduling over to (or take it back from) the fleet scheduler."""
+        self.fleet_managed = managed
+        self._update_schedule()
+
+    @callback
+    def async_restore_data(self, data: dict[str, Any]) -> None:
+        """Seed the coordinator with a cached payload until the first live refresh.
+
+        The payload only serves to plan the entities and the device. It is
+        stale, so the miner counts as unreachable and its entities stay
+        unavailable until a refresh succeeds.
+        """
+        self.data = data
+        self.values.update(data)
+        self.last_update_success = False
+
+    @callback
+    def async_setup_device_info(self, entry: ConfigEntry) -> None:
+        """Build the device info shared by all entities of the entry."""
+        self._device_entry = entry
+        self.device_info = _device_info(entry, self.data or {})
+
+    @callback
+    def _async_check_device_info(self) -> None:
+        """Update the device after a firmware upgrade or ASIC model change."""
+        if (entry := self._device_entry) is None or not self.data:
+            return
+        device_info = _device_info(entry, self.data)
+        if device_info == self.device_info:
+            return
+
+        self.device_info = device_info
+        if (static := self.tiers.get(TIER_STATIC)) is not None and static.supported:
+            # The static details may change with the firmware
+            self.hass.async_create_task(static.async_request_refresh())
+        registry = dr.async_get(self.hass)
+        if device := registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)}):
+            registry.async_update_device(
+                device.id,
+                model=device_info["model"],
+                sw_version=device_info["sw_version"],
+            )
+
+    @callback
+    def async_add_refresh_listener(self, refresh_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for every finished refresh, including repeated failures.
+
+        Regular listeners are not called again while a miner keeps failing,
+        but the integration's own diagnostics (backoff, breaker state) change.
+        """
+        self._refresh_listeners.append(refresh_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._refresh_listeners.remove(refresh_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Notify the refresh listeners."""
+        for refresh_callback in list(self._refresh_listeners):
+            refresh_callback()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Extract sensor values once, then notify the listeners."""
+        if (timings := self.timings) is None:
+            self._async_update_values()
+            super().async_update_listeners()
+            return
+
+        start = time.monotonic()
+        self._async_update_values()
+        extracted = time.monotonic()
+        super().async_update_listeners()
+        timings.record(STAGE_EXTRACT, extracted - start)
+        timings.record(STAGE_NOTIFY, time.monotonic() - extracted)
+
+    @callback
+    def _async_update_values(self) -> None:
+        """Update the value table, history, ASIC health and device info."""
+        self.values.update(self.data)
+        if self.data is not None and self.last_update_success:
+            # Unchanged readings are samples too, and age out old ones
+            self.history.add(self.data)
+            if not self.values.changed.isdisjoint(("hashrateMonitor", "asicTemps")):
+                self.health.update(self.data)
+        if self.device_info is not None and not self.values.changed.isdisjoint(
+            ("version", "ASICModel")
+        ):
+            self._async_check_device_info()
+
+    def set_push_connected(self, connected: bool) -> None:
+        """Record whether a push connection is currently delivering updates."""
+        self.push_connected = connected
+        self._update_schedule()
+
+    def _adapt_interval(self, data: dict | None) -> None:
+        """Poll faster while the miner needs attention or changes, back off when stable.
+
+        ``data`` is None when the miner could not be reached.
+        """
+        self.polls += 1
+        if self.adaptive_bounds is None:
+            return
+
+        current = self.poll_interval.total_seconds()
+        self.polls_saved += current / DEFAULT_SCAN_INTERVAL - 1
+        reading = (data.get("temp"), data.get("hashRate")) if data is not None else None
+        previous, self._last_reading = self._last_reading, reading
+
+        min_interval, max_interval = self.adaptive_bounds
+        if data is None:
+            # Nothing to watch until the miner is back
+            seconds = current * 2
+        elif _needs_attention(data):
+            seconds = min_interval
+        elif previous is not None and _is_stable(previous, reading):
+            seconds = current * 2
+        else:
+            seconds = current / 2
+        seconds = min(max(seconds, min_interval), max_interval)
+
+        if seconds != current:
+            _LOGGER.debug(
+                "Poll interval for %s changed from %ss to %ss",
+                self.client.host,
+                current,
+                seconds,
+            )
+            self.poll_interval = timedelta(seconds=seconds)
+            self._update_schedule()
+
     async def _async_update_data(self):
         """Fetch data from API."""
+        start = time.monotonic()
         try:
-            return await self.client.async_get_status()
+            data = await self.client.async_get_status()
         except BitaxeApiError as err:
+            self._adapt_interval(None)
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        if self.timings is not None:
+            self.timings.record(STAGE_FETCH, time.monotonic() - start)
+        self._adapt_interval(data)
+        return data
+
+
+def _device_info(entry: ConfigEntry, data: dict[str, Any]) -> DeviceInfo:
+    """Return the device info of a miner."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer="Bitaxe",
+        model=data.get("ASICModel", "Unknown"),
+        sw_version=data.get("version", "Unknown"),
+    )
+
+
+def _running_hot(data: dict) -> bool:
+    """Return True if the miner is overheating or close to its target temperature."""
+    if data.get("overheat_mode"):
+        return True
+
+    target = data.get("temptarget")
+    if target:
+        temps = [t for t in (data.get("temp"), data.get("vrTemp")) if t is not None]
+        if temps and max(temps) >= target - ADAPTIVE_TEMP_MARGIN:
+            return True
+    return False
+
+
+def _is_stable(previous: tuple[Any, Any], current: tuple[Any, Any]) -> bool:
+    """Return True if temperature and hash rate barely changed between two polls."""
+    (last_temp, last_hashrate), (temp, hashrate) = previous, current
+    if (
+        temp is not None
+        and last_temp is not None
+        and abs(temp - last_temp) > ADAPTIVE_STABLE_TEMP_DELTA
+    ):
+        return False
+    return not (
+        hashrate is not None
+        and last_hashrate
+        and abs(hashrate - last_hashrate) / last_hashrate > ADAPTIVE_STABLE_HASHRATE_DELTA
+    )
+
+
+def _needs_attention(data: dict) -> bool:
+    """Return True if the miner is overheating or hashing off target."""
+    if _running_hot(data):
+        return True
+
+    expected = data.get("expectedHashrate")
+    hashrate = data.get("hashRate")
+    return bool(
+        expected
+        and hashrate is not None
+        and abs(hashrate - expected) / expected > ADAPTIVE_HASHRATE_DEVIATION
+    )
@@ -0,0 +1,95 @@
+"""Diagnostics support for Bitaxe."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_FLEET_TOTALS,
+    DOMAIN,
+    FLEET_DATA_KEY,
+    FLEET_TOTALS_DATA_KEY,
+    SESSION_DATA_KEY,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+from .scheduler import BitaxeFleetScheduler
+from .totals import BitaxeFleetTotals
+
+TO_REDACT = {
+    CONF_HOST,
+    "hostname",
+    "ipv4",
+    "macAddr",
+    "ssid",
+    "stratumUser",
+    "fallbackStratumUser",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    if entry.data.get(CONF_FLEET_TOTALS):
+        fleet_totals: BitaxeFleetTotals = hass.data[FLEET_TOTALS_DATA_KEY]
+        return {"totals": fleet_totals.as_dict()}
+
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    bitaxe_session = hass.data.get(SESSION_DATA_KEY)
+    scheduler: BitaxeFleetScheduler | None = hass.data.get(FLEET_DATA_KEY)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "fleet_managed": coordinator.fleet_managed,
+            "poll_interval": coordinator.poll_interval.total_seconds(),
+            "poll_priority": coordinator.poll_priority,
+            "missed_deadlines": coordinator.missed_deadlines,
+            "polls_shed": coordinator.polls_shed,
+        },
+        "fleet_scheduler": (
+            scheduler.as_dict()
+            if scheduler is not None and coordinator.fleet_managed
+            else None
+        ),
+        "circuit_breaker": {
+            "state": coordinator.client.breaker.state,
+            "failures": coordinator.client.breaker.failures,
+            "backoff": coordinator.client.breaker.backoff,
+            "timeout": coordinator.client.breaker.timeout,
+        },
+        "state_writes": asdict(coordinator.write_stats),
+        "connections": (
+            bitaxe_session.stats.as_dict(coordinator.client.host)
+            if bitaxe_session is not None
+            else None
+        ),
+        "requests": coordinator.client.request_cache.as_dict(coordinator.client.host),
+        "timings": coordinator.timings.as_dict() if coordinator.timings else None,
+        "history": coordinator.history.as_dict(),
+        "asic_health": coordinator.health.as_dict(),
+        "tiers": {
+            name: {
+                "supported": tier.supported,
+                "last_update_success": tier.last_update_success,
+                "keys": sorted(tier.data or ()),
+            }
+            for name, tier in coordinator.tiers.items()
+        },
+        "autotune": (
+            coordinator.autotuner.as_dict() if coordinator.autotuner else None
+        ),
+        "backfilled_hours": (
+            coordinator.backfill.imported if coordinator.backfill else None
+        ),
+        "data": async_redact_data(coordinator.data or {}, TO_REDACT),
+    }
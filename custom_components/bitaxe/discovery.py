@@ -0,0 +1,113 @@
+"""Network discovery of Bitaxe miners."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.util.json import json_loads
+
+from .const import (
+    API_SYSTEM_INFO,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_PORT,
+    DISCOVERY_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiscoveredMiner:
+    """A miner found on the network."""
+
+    host: str
+    unique_id: str
+    title: str
+
+
+def miner_title(info: dict[str, Any]) -> str:
+    """Return the config entry title for a miner."""
+    return f"Bitaxe {info.get('ASICModel', 'Miner')}"
+
+
+def miner_unique_id(host: str, info: dict[str, Any]) -> str:
+    """Return a stable unique id for a miner.
+
+    The MAC address (or hostname) survives DHCP address changes, the IP
+    address is only used when the firmware reports neither.
+    """
+    if mac := info.get("macAddr"):
+        return format_mac(mac)
+    return info.get("hostname") or host
+
+
+def is_axeos_info(info: Any) -> bool:
+    """Return True if a /api/system/info response looks like AxeOS."""
+    return (
+        isinstance(info, dict)
+        and "ASICModel" in info
+        and ("hashRate" in info or "version" in info)
+    )
+
+
+async def _async_probe(
+    session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, host: str
+) -> DiscoveredMiner | None:
+    """Probe a single address for an AxeOS API."""
+    timeout = aiohttp.ClientTimeout(total=DISCOVERY_TIMEOUT)
+    async with semaphore:
+        try:
+            async with session.get(
+                f"http://{host}{API_SYSTEM_INFO}", timeout=timeout, allow_redirects=False
+            ) as response:
+                if response.status != 200:
+                    return None
+                info = json_loads(await response.read())
+        except (aiohttp.ClientError, TimeoutError, ValueError):
+            return None
+
+    if not is_axeos_info(info):
+        return None
+    return DiscoveredMiner(host, miner_unique_id(host, info), miner_title(info))
+
+
+def _host(address: IPv4Address | IPv6Address, port: int) -> str:
+    """Return the host of a URL for an address and port."""
+    if port == DISCOVERY_PORT:
+        return str(address)
+    if address.version == 6:
+        return f"[{address}]:{port}"
+    return f"{address}:{port}"
+
+
+async def async_scan_network(
+    hass: HomeAssistant, network: IPv4Network | IPv6Network, port: int = DISCOVERY_PORT
+) -> list[DiscoveredMiner]:
+    """Scan all hosts of a network concurrently and return the AxeOS miners found.
+
+    AxeOS always serves on port 80; other ports are for simulated miners.
+    """
+    session = async_get_clientsession(hass)
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+    results = await asyncio.gather(
+        *(
+            _async_probe(session, semaphore, _host(address, port))
+            for address in network.hosts()
+        )
+    )
+
+    # The same miner may answer on more than one address
+    miners: dict[str, DiscoveredMiner] = {}
+    for miner in results:
+        if miner is not None:
+            miners.setdefault(miner.unique_id, miner)
+
+    _LOGGER.debug("Found %d miners in %s", len(miners), network)
+    return list(miners.values())
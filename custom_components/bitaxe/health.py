@@ -0,0 +1,253 @@
+"""Streaming health of the ASICs of a board."""
+from __future__ import annotations
+
+import math
+import time
+from typing import Any
+
+from .const import (
+    HEALTH_ALPHA,
+    HEALTH_BASELINE_ALPHA,
+    HEALTH_ERROR_RATE,
+    HEALTH_ERROR_Z,
+    HEALTH_LOW_HASHRATE,
+    HEALTH_MAX_TEMP_OFFSET,
+    HEALTH_MIN_ERROR_RATE,
+    HEALTH_MIN_PEER_RATIO,
+    HEALTH_PROBLEM_PENALTY,
+    HEALTH_PROBLEMS,
+    HEALTH_TEMPERATURE,
+    HEALTH_WARMUP,
+)
+
+
+class BitaxeEwma:
+    """Exponentially weighted mean and variance, updated in O(1)."""
+
+    __slots__ = ("alpha", "count", "mean", "variance")
+
+    def __init__(self, alpha: float) -> None:
+        """Initialize without samples."""
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        # Plain running mean until the weights take over, so the first
+        # samples are not overweighted
+        alpha = max(self.alpha, 1 / self.count)
+        diff = value - self.mean
+        increment = alpha * diff
+        self.mean += increment
+        self.variance = (1 - alpha) * (self.variance + diff * increment)
+
+    @property
+    def stddev(self) -> float:
+        """Return the weighted standard deviation of the samples."""
+        return math.sqrt(self.variance)
+
+    def mean_stddev(self, alpha: float) -> float:
+        """Return the standard deviation of a mean smoothed with ``alpha``."""
+        return self.stddev * math.sqrt(alpha / (2 - alpha))
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return the mean and standard deviation."""
+        if not self.count:
+            return {"count": 0, "mean": None, "stddev": None}
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 3),
+            "stddev": round(self.stddev, 3),
+        }
+
+
+class _AsicBaseline:
+    """Smoothed values of one ASIC."""
+
+    __slots__ = (
+        "_errors",
+        "_errors_time",
+        "error_baseline",
+        "error_rate",
+        "hashrate_ratio",
+        "problems",
+        "temp_offset",
+    )
+
+    def __init__(self) -> None:
+        """Initialize without samples."""
+        # Hash rate relative to, and temperature above, the other ASICs
+        self.hashrate_ratio = BitaxeEwma(HEALTH_ALPHA)
+        self.temp_offset = BitaxeEwma(HEALTH_ALPHA)
+        # Errors per minute, recent and long-term
+        self.error_rate = BitaxeEwma(HEALTH_ALPHA)
+        self.error_baseline = BitaxeEwma(HEALTH_BASELINE_ALPHA)
+        self._errors: float | None = None
+        self._errors_time = 0.0
+        self.problems: tuple[str, ...] = ()
+
+    def add_errors(self, errors: float, now: float) -> None:
+        """Turn the error counter into a rate per minute."""
+        if (
+            self._errors is not None
+            # Otherwise the counter restarted with the miner
+            and errors >= self._errors
+            and now > self._errors_time
+        ):
+            rate = (errors - self._errors) / (now - self._errors_time) * 60
+            self.error_rate.add(rate)
+            self.error_baseline.add(rate)
+        self._errors = errors
+        self._errors_time = now
+
+    def check(self) -> None:
+        """Flag the problems of the ASIC once enough samples are known."""
+        problems: list[str] = []
+        ratio = self.hashrate_ratio
+        if ratio.count >= HEALTH_WARMUP and ratio.mean < HEALTH_MIN_PEER_RATIO:
+            problems.append(HEALTH_LOW_HASHRATE)
+        rate, baseline = self.error_rate, self.error_baseline
+        if (
+            baseline.count >= HEALTH_WARMUP
+            and rate.mean >= HEALTH_MIN_ERROR_RATE
+            and rate.mean
+            > baseline.mean + HEALTH_ERROR_Z * baseline.mean_stddev(rate.alpha)
+        ):
+            problems.append(HEALTH_ERROR_RATE)
+        offset = self.temp_offset
+        if offset.count >= HEALTH_WARMUP and offset.mean > HEALTH_MAX_TEMP_OFFSET:
+            problems.append(HEALTH_TEMPERATURE)
+        self.problems = tuple(problems)
+
+    @property
+    def score(self) -> float:
+        """Return the share of its peers' hash rate, less problem penalties."""
+        score = 1.0
+        if self.hashrate_ratio.count:
+            score = min(max(self.hashrate_ratio.mean, 0.0), 1.0)
+        penalties = sum(problem != HEALTH_LOW_HASHRATE for problem in self.problems)
+        return score * (1 - HEALTH_PROBLEM_PENALTY) ** penalties
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the baselines and problems."""
+        return {
+            "hashrate_ratio": self.hashrate_ratio.as_dict(),
+            "temp_offset": self.temp_offset.as_dict(),
+            "error_rate": self.error_rate.as_dict(),
+            "error_baseline": self.error_baseline.as_dict(),
+            "problems": list(self.problems),
+        }
+
+
+class BitaxeAsicHealth:
+    """Flag ASICs that degrade compared to the other ASICs of the board.
+
+    Each ASIC's hash rate is compared to the mean of the other ASICs and its
+    temperature to theirs, so changes that affect the whole board (a new
+    frequency, a warm room) cancel out. The error counter becomes a rate per
+    minute, flagged when it accelerates well above the ASIC's own long-term
+    baseline. Values are smoothed first, so a single odd sample does not
+    flag a chip. Every update costs O(ASICs).
+    """
+
+    def __init__(self) -> None:
+        """Initialize without ASICs."""
+        self._asics: list[_AsicBaseline] = []
+        # 1-based numbers of the flagged ASICs, per problem
+        self.problems: dict[str, list[int]] = {problem: [] for problem in HEALTH_PROBLEMS}
+        self.temp_spread: float | None = None
+
+    @property
+    def supported(self) -> bool:
+        """Return True once the miner reported per-ASIC values."""
+        return bool(self._asics)
+
+    @property
+    def problem(self) -> bool:
+        """Return True if any ASIC is flagged."""
+        return any(self.problems.values())
+
+    @property
+    def score(self) -> float | None:
+        """Return the health of the board in percent."""
+        if not (asics := self._asics):
+            return None
+        return round(100 * sum(asic.score for asic in asics) / len(asics), 1)
+
+    def update(self, data: dict[str, Any], now: float | None = None) -> None:
+        """Add the per-ASIC values of a payload."""
+        monitor = (data.get("hashrateMonitor") or {}).get("asics") or []
+        temps = data.get("asicTemps") or []
+        if not (count := max(len(monitor), len(temps))):
+            return
+        if now is None:
+            now = time.monotonic()
+
+        asics = self._asics
+        if len(asics) != count:
+            del asics[count:]
+            asics.extend(_AsicBaseline() for _ in range(count - len(asics)))
+
+        hashrates = _numbers([asic.get("total") for asic in monitor], 0.0)
+        for index, hashrate, peers in _with_peer_means(hashrates):
+            if peers > 0:
+                asics[index].hashrate_ratio.add(hashrate / peers)
+
+        # Sensors that are not read report zero or less
+        valid_temps = _numbers(temps, 1.0)
+        for index, temp, peers in _with_peer_means(valid_temps):
+            asics[index].temp_offset.add(temp - peers)
+        self.temp_spread = (
+            round(
+                max(temp for _, temp in valid_temps)
+                - min(temp for _, temp in valid_temps),
+                1,
+            )
+            if len(valid_temps) > 1
+            else None
+        )
+
+        for index, errors in _numbers([asic.get("errorCount") for asic in monitor], 0.0):
+            asics[index].add_errors(errors, now)
+
+        problems: dict[str, list[int]] = {problem: [] for problem in HEALTH_PROBLEMS}
+        for number, asic in enumerate(asics, 1):
+            asic.check()
+            for problem in asic.problems:
+                problems[problem].append(number)
+        self.problems = problems
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the score, problems and per-ASIC baselines."""
+        return {
+            "score": self.score,
+            "problems": self.problems,
+            "temp_spread": self.temp_spread,
+            "asics": [asic.as_dict() for asic in self._asics],
+        }
+
+
+def _numbers(values: list[Any], minimum: float) -> list[tuple[int, float]]:
+    """Return the index and value of the numbers of at least ``minimum``."""
+    return [
+        (index, float(value))
+        for index, value in enumerate(values)
+        if isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and value >= minimum
+    ]
+
+
+def _with_peer_means(
+    values: list[tuple[int, float]],
+) -> list[tuple[int, float, float]]:
+    """Add the mean of all other values to each value."""
+    if (count := len(values)) < 2:
+        return []
+    total = math.fsum(value for _, value in values)
+    return [
+        (index, value, (total - value) / (count - 1)) for index, value in values
+    ]
@@ -0,0 +1,44 @@
+"""Timing instrumentation for the Bitaxe refresh pipeline."""
+from __future__ import annotations
+
+from collections import deque
+
+from .const import TIMING_SAMPLES
+
+
+class BitaxeStageTimings:
+    """Rolling duration samples per stage of a miner refresh.
+
+    Instrumentation is opt-in: when it is disabled the API client and
+    coordinator hold ``None`` instead of an instance and skip all timing.
+    """
+
+    def __init__(self, samples: int = TIMING_SAMPLES) -> None:
+        """Initialize empty sample windows."""
+        self._maxlen = samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add a duration sample for a stage."""
+        if (window := self._samples.get(stage)) is None:
+            window = self._samples[stage] = deque(maxlen=self._maxlen)
+        window.append(seconds)
+
+    def percentile(self, stage: str, percent: float) -> float | None:
+        """Return a percentile of a stage in milliseconds."""
+        if not (window := self._samples.get(stage)):
+            return None
+        ordered = sorted(window)
+        return round(ordered[int(percent / 100 * (len(ordered) - 1))] * 1000, 2)
+
+    def as_dict(self) -> dict[str, dict[str, float | int | None]]:
+        """Return p50/p95/p99 in milliseconds and the sample count per stage."""
+        return {
+            stage: {
+                "p50": self.percentile(stage, 50),
+                "p95": self.percentile(stage, 95),
+                "p99": self.percentile(stage, 99),
+                "count": len(window),
+            }
+            for stage, window in self._samples.items()
+        }
@@ -0,0 +1,123 @@
+"""Number platform for Bitaxe integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.number import (
+    NumberEntity,
+    NumberEntityDescription,
+    NumberMode,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import BitaxeApiError
+from .const import CONF_FLEET_TOTALS, CONTROL_DATA_KEY, DOMAIN
+from .control import BitaxeFleetControl
+from .coordinator import BitaxeDataUpdateCoordinator
+
+
+@dataclass(frozen=True, kw_only=True)
+class BitaxeNumberEntityDescription(NumberEntityDescription):
+    """Describes a Bitaxe setting changed through a number."""
+
+    # Payload keys holding the current value, the first one present is used
+    value_keys: tuple[str, ...]
+    # Builds the settings to send for a new value
+    settings_fn: Callable[[int], dict[str, Any]]
+
+
+NUMBER_DESCRIPTIONS: tuple[BitaxeNumberEntityDescription, ...] = (
+    BitaxeNumberEntityDescription(
+        key="fan_speed",
+        name="Manual Fan Speed",
+        # Newer firmware reports the manual setting separately from the speed
+        value_keys=("manualFanSpeed", "fanspeed"),
+        settings_fn=lambda value: {"fanspeed": value, "autofanspeed": 0},
+        native_min_value=0,
+        native_max_value=100,
+        native_step=1,
+        native_unit_of_measurement=PERCENTAGE,
+        mode=NumberMode.SLIDER,
+        entity_category=EntityCategory.CONFIG,
+        icon="mdi:fan",
+    ),
+    BitaxeNumberEntityDescription(
+        key="temp_target",
+        name="Target Temperature",
+        value_keys=("temptarget",),
+        settings_fn=lambda value: {"temptarget": value},
+        native_min_value=35,
+        native_max_value=75,
+        native_step=1,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        mode=NumberMode.BOX,
+        entity_category=EntityCategory.CONFIG,
+        icon="mdi:thermometer-auto",
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Bitaxe numbers based on a config entry."""
+    if entry.data.get(CONF_FLEET_TOTALS):
+        return
+
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+    async_add_entities(
+        BitaxeNumber(coordinator, hass.data[CONTROL_DATA_KEY], description, entry)
+        for description in NUMBER_DESCRIPTIONS
+        if any(key in data for key in description.value_keys)
+    )
+
+
+class BitaxeNumber(CoordinatorEntity[BitaxeDataUpdateCoordinator], NumberEntity):
+    """A miner setting shown as a number."""
+
+    entity_description: BitaxeNumberEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        control: BitaxeFleetControl,
+        description: BitaxeNumberEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the number."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+        self._control = control
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current setting."""
+        data = self.coordinator.data or {}
+        for key in self.entity_description.value_keys:
+            if (value := data.get(key)) is not None:
+                return value
+        return None
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Send the new setting to the miner."""
+        try:
+            await self._control.async_update_settings(
+                self.coordinator, self.entity_description.settings_fn(int(value))
+            )
+        except BitaxeApiError as err:
+            raise HomeAssistantError(
+                f"Changing {self.name} of {self.coordinator.client.host} failed: {err}"
+            ) from err
@@ -0,0 +1,116 @@
+"""Push updates from the AxeOS websocket stream."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+from .api import BitaxeApiError, BitaxeNotSupportedError
+from .const import (
+    PUSH_RECONNECT_MAX,
+    PUSH_RECONNECT_MIN,
+    PUSH_REFRESH_EVENTS,
+    PUSH_REFRESH_LEVELS,
+    PUSH_REFRESH_TAGS,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# ESP-IDF log line: level, milliseconds since boot, tag and message, optionally
+# wrapped in ANSI colour codes
+_LOG_LINE = re.compile(r"(?:\x1b\[[0-9;]*m)?([EWIDV]) \(\d+\) ([^:]+): (.*)")
+
+
+class BitaxePushListener:
+    """Keep a websocket open to the miner and push updates to the coordinator.
+
+    JSON objects received on the stream are merged into the last payload and
+    published right away. Log lines reporting a relevant event (an overheat,
+    or a warning from power management or the voltage regulator) trigger a
+    debounced refresh; routine log lines are ignored. While the stream
+    is connected the coordinator only polls as a safety net; when it drops,
+    regular polling resumes until the reconnect (with backoff) succeeds.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: BitaxeDataUpdateCoordinator
+    ) -> None:
+        """Initialize the listener."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.client = coordinator.client
+        self.messages = 0
+
+    async def async_run(self) -> None:
+        """Connect, listen and reconnect with exponential backoff until cancelled."""
+        backoff = PUSH_RECONNECT_MIN
+        try:
+            while True:
+                try:
+                    ws = await self.client.async_ws_connect()
+                except BitaxeNotSupportedError:
+                    _LOGGER.info(
+                        "%s does not support push updates, using polling",
+                        self.client.host,
+                    )
+                    return
+                except BitaxeApiError as err:
+                    _LOGGER.debug("Push connection to %s failed: %s", self.client.host, err)
+                else:
+                    backoff = PUSH_RECONNECT_MIN
+                    await self._async_listen(ws)
+
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, PUSH_RECONNECT_MAX)
+        finally:
+            self.coordinator.set_push_connected(False)
+
+    async def _async_listen(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Process messages until the websocket closes."""
+        _LOGGER.debug("Push connection to %s established", self.client.host)
+        self.coordinator.set_push_connected(True)
+        try:
+            async for msg in ws:
+                if msg.type is aiohttp.WSMsgType.TEXT:
+                    await self._async_handle_message(msg.data)
+                elif msg.type is aiohttp.WSMsgType.ERROR:
+                    break
+        finally:
+            await ws.close()
+            self.coordinator.set_push_connected(False)
+            _LOGGER.debug("Push connection to %s closed", self.client.host)
+
+        # Fall back to polling straight away instead of waiting for the safety net
+        await self.coordinator.async_request_refresh()
+
+    async def _async_handle_message(self, text: str) -> None:
+        """Apply a single message from the stream."""
+        self.messages += 1
+        if text.startswith("{"):
+            try:
+                update = json.loads(text)
+            except json.JSONDecodeError:
+                update = None
+            if isinstance(update, dict) and self.coordinator.data is not None:
+                self.coordinator.async_set_updated_data({**self.coordinator.data, **update})
+                return
+
+        if is_refresh_event(text):
+            # A response cached just before the event would not show it
+            self.client.invalidate_cache()
+            await self.coordinator.async_request_refresh()
+
+
+def is_refresh_event(line: str) -> bool:
+    """Return True if a log line reports an event worth an immediate refresh."""
+    if (match := _LOG_LINE.match(line)) is None:
+        return False
+    level, tag, message = match.groups()
+    if level in PUSH_REFRESH_LEVELS and tag in PUSH_REFRESH_TAGS:
+        return True
+    return any(event in message for event in PUSH_REFRESH_EVENTS)
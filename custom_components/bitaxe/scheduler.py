@@ -0,0 +1,205 @@
+"""Shared fleet poller for Bitaxe miners."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    FLEET_MAX_CONCURRENCY,
+    FLEET_POLL_DEADLINE,
+    FLEET_TICK_SECONDS,
+    PRIORITIES,
+    PRIORITY_LOW,
+)
+from .coordinator import BitaxeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class BitaxePollStats:
+    """Counts of the fleet polls of one priority."""
+
+    polls: int = 0
+    # Polls started after their deadline, including the shed ones
+    missed_deadlines: int = 0
+    # Late polls that were skipped until the next interval
+    shed: int = 0
+
+
+class BitaxeFleetScheduler:
+    """Poll all fleet-managed miners from one shared timer.
+
+    Instead of one timer per config entry, a single tick queues the miners
+    that are due, and a bounded number of workers refreshes them. Every
+    miner gets a stable phase offset inside its poll interval, so a large
+    fleet is spread evenly over the interval instead of polling in bursts.
+
+    Queued polls start by priority, then earliest deadline. When polls fall
+    behind (a busy event loop, or more due miners than workers), miners that
+    are marked critical or running hot still go first, normal polls are
+    deferred, and polls of unreachable miners are skipped until their next
+    interval. Polls starting after their deadline are counted per priority.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_concurrency: int = FLEET_MAX_CONCURRENCY
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.max_concurrency = max_concurrency
+        self._coordinators: dict[str, BitaxeDataUpdateCoordinator] = {}
+        self._next_due: dict[str, float] = {}
+        # Queued or being polled, so a slow miner is never queued twice
+        self._in_flight: set[str] = set()
+        # Heap of (priority rank, deadline, sequence, entry id)
+        self._queue: list[tuple[int, float, int, str]] = []
+        self._sequence = itertools.count()
+        self._workers: set[asyncio.Task] = set()
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        # When the queue last went from empty to busy
+        self._busy_since: float | None = None
+        self.last_cycle_duration: float | None = None
+        self.polls = 0
+        self.stats = {priority: BitaxePollStats() for priority in PRIORITIES}
+
+    @property
+    def size(self) -> int:
+        """Return the number of miners managed by the scheduler."""
+        return len(self._coordinators)
+
+    @callback
+    def async_add(self, entry_id: str, coordinator: BitaxeDataUpdateCoordinator) -> None:
+        """Start polling a miner from the shared tick."""
+        coordinator.set_fleet_managed(True)
+        self._coordinators[entry_id] = coordinator
+
+        # Spread miners over the interval using a phase derived from the entry id
+        interval = coordinator.refresh_interval.total_seconds()
+        phase = (zlib.crc32(entry_id.encode()) % 1000) / 1000 * interval
+        self._next_due[entry_id] = time.monotonic() + phase
+
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass,
+                self._async_tick,
+                timedelta(seconds=FLEET_TICK_SECONDS),
+                name="Bitaxe fleet poll",
+            )
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Stop polling a miner."""
+        if (coordinator := self._coordinators.pop(entry_id, None)) is not None:
+            coordinator.set_fleet_managed(False)
+        self._next_due.pop(entry_id, None)
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Queue every miner whose poll is due and start workers for them."""
+        now = time.monotonic()
+        for entry_id, due_at in self._next_due.items():
+            if due_at > now or entry_id in self._in_flight:
+                continue
+            rank = PRIORITIES.index(self._coordinators[entry_id].poll_priority)
+            heapq.heappush(
+                self._queue,
+                (rank, due_at + FLEET_POLL_DEADLINE, next(self._sequence), entry_id),
+            )
+            self._in_flight.add(entry_id)
+
+        if not self._queue:
+            return
+        if self._busy_since is None:
+            self._busy_since = now
+        for _ in range(min(self.max_concurrency - len(self._workers), len(self._queue))):
+            task = self.hass.async_create_background_task(
+                self._async_work(), name="Bitaxe fleet poll worker"
+            )
+            self._workers.add(task)
+            task.add_done_callback(self._async_worker_done)
+
+    @callback
+    def _async_worker_done(self, task: asyncio.Task) -> None:
+        """Record the cycle duration once the queue has been worked off."""
+        self._workers.discard(task)
+        if self._workers or self._queue or self._busy_since is None:
+            return
+        self.last_cycle_duration = time.monotonic() - self._busy_since
+        self._busy_since = None
+        _LOGGER.debug("Fleet poll cycle took %.3f seconds", self.last_cycle_duration)
+
+    async def _async_work(self) -> None:
+        """Poll queued miners, most urgent first, until the queue is empty."""
+        while self._queue:
+            rank, deadline, _, entry_id = heapq.heappop(self._queue)
+            await self._async_poll(entry_id, PRIORITIES[rank], deadline)
+
+    async def _async_poll(self, entry_id: str, priority: str, deadline: float) -> None:
+        """Refresh a single miner and fan the result out to its coordinator."""
+        try:
+            if (coordinator := self._coordinators.get(entry_id)) is None:
+                return
+            stats = self.stats[priority]
+            if time.monotonic() > deadline:
+                stats.missed_deadlines += 1
+                coordinator.missed_deadlines[priority] += 1
+                if priority == PRIORITY_LOW:
+                    stats.shed += 1
+                    coordinator.polls_shed += 1
+                    self._schedule_next(entry_id, coordinator)
+                    return
+
+            # async_refresh never raises; failures are stored on the coordinator
+            await coordinator.async_refresh()
+            stats.polls += 1
+            self.polls += 1
+            # Schedule after the refresh so an adapted interval applies right away
+            self._schedule_next(entry_id, coordinator)
+        finally:
+            self._in_flight.discard(entry_id)
+
+    def _schedule_next(
+        self, entry_id: str, coordinator: BitaxeDataUpdateCoordinator
+    ) -> None:
+        """Keep the phase while skipping any intervals missed during a stall."""
+        if (due_at := self._next_due.get(entry_id)) is not None:
+            interval = coordinator.refresh_interval.total_seconds()
+            missed = int((time.monotonic() - due_at) // interval)
+            self._next_due[entry_id] = due_at + (missed + 1) * interval
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the queue and the counts per priority."""
+        return {
+            "miners": self.size,
+            "queued": len(self._queue),
+            "workers": len(self._workers),
+            "polls": self.polls,
+            "last_cycle_duration": self.last_cycle_duration,
+            "priorities": {
+                priority: asdict(stats) for priority, stats in self.stats.items()
+            },
+        }
+
+    async def async_shutdown(self) -> None:
+        """Stop the shared tick and cancel outstanding polls."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        self._queue.clear()
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._in_flight.clear()
@@ -0,0 +1,126 @@
+"""Payload schema index per AxeOS firmware version, ASIC model and board."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import SCHEMA_SAVE_DELAY, SCHEMA_STORAGE_KEY, SCHEMA_STORAGE_VERSION
+
+
+@dataclass(frozen=True)
+class BitaxeSchema:
+    """Keys present in the payload of a firmware version, ASIC model and board."""
+
+    keys: frozenset[str]
+
+    @classmethod
+    def from_payload(cls, data: dict[str, Any]) -> BitaxeSchema:
+        """Build the schema of a payload."""
+        return cls(frozenset(data))
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> BitaxeSchema:
+        """Build the schema from its stored form."""
+        # Older versions also stored the keys of nested objects, never used
+        return cls(frozenset(stored["keys"]))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the schema in its stored form."""
+        return {"keys": sorted(self.keys)}
+
+
+# Payload keys that identify the schema of a miner
+SCHEMA_ID_KEYS = ("version", "ASICModel", "boardVersion")
+
+
+def schema_id(data: dict[str, Any]) -> str:
+    """Return the index key of a payload: its firmware version, ASIC model and board."""
+    return "|".join(str(data.get(key, "unknown")) for key in SCHEMA_ID_KEYS)
+
+
+class BitaxeSchemaIndex:
+    """Remember which payload keys each firmware version, ASIC model and board has.
+
+    Sensors are planned from a miner's own payload. Before its first
+    refresh, the schema the miner had last time is used instead, so the
+    entity set is known right away. Only schemas of configured entries are
+    kept; the index is persisted so it is known after a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, SCHEMA_STORAGE_VERSION, SCHEMA_STORAGE_KEY
+        )
+        self._schemas: dict[str, BitaxeSchema] = {}
+        # Schema of every entry, by entry ID
+        self._entries: dict[str, str] = {}
+
+    async def async_load(self, entry_ids: Iterable[str]) -> None:
+        """Load the index from disk, dropping what removed entries used."""
+        stored = await self._store.async_load() or {}
+        if "entries" not in stored:
+            # Stored before schemas were tracked per entry; rebuilt on refresh
+            stored = {}
+        self._schemas = {
+            key: BitaxeSchema.from_dict(schema)
+            for key, schema in stored.get("schemas", {}).items()
+        }
+        entry_ids = set(entry_ids)
+        self._entries = {
+            entry_id: key
+            for entry_id, key in stored.get("entries", {}).items()
+            if entry_id in entry_ids and key in self._schemas
+        }
+        if self._async_prune():
+            self._store.async_delay_save(self._data_to_save, SCHEMA_SAVE_DELAY)
+
+    @callback
+    def async_get(self, entry_id: str, data: dict[str, Any] | None) -> BitaxeSchema:
+        """Return the schema of an entry's payload.
+
+        Without a payload, the schema the entry had last is returned.
+        """
+        if not data:
+            key = self._entries.get(entry_id)
+            return self._schemas.get(key, BitaxeSchema(frozenset()))
+        key = schema_id(data)
+        changed = False
+        if (schema := self._schemas.get(key)) is None:
+            schema = self._schemas[key] = BitaxeSchema.from_payload(data)
+            changed = True
+        if self._entries.get(entry_id) != key:
+            self._entries[entry_id] = key
+            self._async_prune()
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SCHEMA_SAVE_DELAY)
+        return schema
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the schema of a removed entry."""
+        if self._entries.pop(entry_id, None) is not None:
+            self._async_prune()
+            self._store.async_delay_save(self._data_to_save, SCHEMA_SAVE_DELAY)
+
+    @callback
+    def _async_prune(self) -> bool:
+        """Drop schemas no entry uses; return True if any was dropped."""
+        used = set(self._entries.values())
+        unused = [key for key in self._schemas if key not in used]
+        for key in unused:
+            del self._schemas[key]
+        return bool(unused)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to write to disk."""
+        return {
+            "schemas": {key: schema.as_dict() for key, schema in self._schemas.items()},
+            "entries": self._entries,
+        }
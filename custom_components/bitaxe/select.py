@@ -0,0 +1,152 @@
+"""Select platform for Bitaxe integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import BitaxeApiError
+from .const import CONF_FLEET_TOTALS, CONTROL_DATA_KEY, DOMAIN, TIER_STATIC
+from .control import BitaxeFleetControl
+from .coordinator import BitaxeDataUpdateCoordinator
+
+FAN_MODE_AUTO = "auto"
+FAN_MODE_MANUAL = "manual"
+
+
+def _format_number(value: Any) -> str:
+    """Return a number as option, without a fraction if it is whole."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+@dataclass(frozen=True, kw_only=True)
+class BitaxeSelectEntityDescription(SelectEntityDescription):
+    """Describes a Bitaxe setting changed through a select."""
+
+    # Payload key holding the current value
+    value_key: str
+    # Key of the static details listing the supported values, if any
+    options_key: str | None = None
+    # Converts between the payload value and the option shown
+    to_option: Callable[[Any], str] = _format_number
+    settings_fn: Callable[[str], dict[str, Any]]
+
+
+SELECT_DESCRIPTIONS: tuple[BitaxeSelectEntityDescription, ...] = (
+    BitaxeSelectEntityDescription(
+        key="frequency_setting",
+        name="ASIC Frequency (MHz)",
+        value_key="frequency",
+        options_key="frequencyOptions",
+        settings_fn=lambda option: {"frequency": int(option)},
+        entity_category=EntityCategory.CONFIG,
+        icon="mdi:sine-wave",
+    ),
+    BitaxeSelectEntityDescription(
+        key="core_voltage_setting",
+        name="Core Voltage (mV)",
+        value_key="coreVoltage",
+        options_key="voltageOptions",
+        settings_fn=lambda option: {"coreVoltage": int(option)},
+        entity_category=EntityCategory.CONFIG,
+        icon="mdi:chip",
+    ),
+    BitaxeSelectEntityDescription(
+        key="fan_mode",
+        name="Fan Mode",
+        value_key="autofanspeed",
+        options=[FAN_MODE_AUTO, FAN_MODE_MANUAL],
+        to_option=lambda value: FAN_MODE_AUTO if value else FAN_MODE_MANUAL,
+        settings_fn=lambda option: {"autofanspeed": int(option == FAN_MODE_AUTO)},
+        entity_category=EntityCategory.CONFIG,
+        icon="mdi:fan-auto",
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Bitaxe selects based on a config entry."""
+    if entry.data.get(CONF_FLEET_TOTALS):
+        return
+
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+    async_add_entities(
+        BitaxeSelect(coordinator, hass.data[CONTROL_DATA_KEY], description, entry)
+        for description in SELECT_DESCRIPTIONS
+        if description.value_key in data
+    )
+
+
+class BitaxeSelect(CoordinatorEntity[BitaxeDataUpdateCoordinator], SelectEntity):
+    """A miner setting shown as a select.
+
+    Frequency and voltage offer the values listed in the miner's static
+    details; firmware without them only offers the current value.
+    """
+
+    entity_description: BitaxeSelectEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        control: BitaxeFleetControl,
+        description: BitaxeSelectEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+        self._control = control
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the current setting."""
+        value = (self.coordinator.data or {}).get(self.entity_description.value_key)
+        return None if value is None else self.entity_description.to_option(value)
+
+    @property
+    def options(self) -> list[str]:
+        """Return the supported settings."""
+        description = self.entity_description
+        if description.options_key is None:
+            return description.options or []
+
+        options: list[str] = []
+        if (static := self.coordinator.tiers.get(TIER_STATIC)) is not None and static.data:
+            options = [
+                description.to_option(value)
+                for value in static.data.get(description.options_key) or ()
+            ]
+        # Custom values set on the miner are kept selectable
+        if (current := self.current_option) is not None and current not in options:
+            options.append(current)
+        return options
+
+    async def async_select_option(self, option: str) -> None:
+        """Send the new setting to the miner."""
+        try:
+            await self._control.async_update_settings(
+                self.coordinator, self.entity_description.settings_fn(option)
+            )
+        except BitaxeApiError as err:
+            raise HomeAssistantError(
+                f"Changing {self.name} of {self.coordinator.client.host} failed: {err}"
+            ) from err
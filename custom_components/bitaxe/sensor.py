@@ -1,10 +1,18 @@
 """Sensor platform for Bitaxe integration."""
 from __future__ import annotations
 
-from collections.abc import Callable
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Collection
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Any
 
+from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
+)
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -17,6 +25,7 @@ from homeassistant.const import (
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
@@ -26,22 +35,129 @@ from homeassistant.const import (
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
 
-from .const import DOMAIN
-from .coordinator import BitaxeDataUpdateCoordinator
+from .api import BitaxeApiError
+from .autotune import BitaxeAutotuner
+from .backfill import EnergyGap, PowerSamples, gap_energy, trapezoid
+from .const import (
+    AUTOTUNE_CONVERGED,
+    AUTOTUNE_FAILED,
+    AUTOTUNE_IDLE,
+    AUTOTUNE_MEASURING,
+    AUTOTUNE_SETTLING,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CONF_DEADBANDS,
+    CONF_ENERGY_SAMPLE_INTERVAL,
+    CONF_FLEET_TOTALS,
+    CONF_PER_ASIC_SENSORS,
+    DEFAULT_DEADBANDS,
+    DEFAULT_ENERGY_SAMPLE_INTERVAL,
+    DEFAULT_PER_ASIC_SENSORS,
+    DOMAIN,
+    ENERGY_MAX_GAP,
+    ENERGY_MAX_GAPS,
+    ENERGY_WRITE_INTERVAL,
+    FLEET_TOTALS_DATA_KEY,
+    PRIORITIES,
+    SCHEMA_DATA_KEY,
+    STAGE_EXTRACT,
+    STAGE_FETCH,
+    STAGE_NOTIFY,
+    STAGE_PARSE,
+    STAGE_READ,
+    STAGE_REQUEST,
+    TIER_STATIC,
+)
+from .coordinator import BitaxeDataUpdateCoordinator, BitaxeTierCoordinator
+from .schema import SCHEMA_ID_KEYS, BitaxeSchemaIndex
+from .timeseries import BitaxeTimeSeries
+from .totals import BitaxeFleetTotals, BitaxeTotals
 
 
 @dataclass(frozen=True, kw_only=True)
 class BitaxeSensorEntityDescription(SensorEntityDescription):
     """Describes Bitaxe sensor entity."""
 
-    value_fn: Callable[[dict[str, Any]], Any] = lambda _: None
+    # Defaults to reading the sensor key from the payload
+    value_fn: Callable[[dict[str, Any]], Any] | None = None
     # If True, sensor is always created (for computed values)
     always_create: bool = False
+    # Payload keys the value is derived from (defaults to the sensor key)
+    source_keys: tuple[str, ...] = ()
+    # Optional deadbands: changes smaller than these are not written
+    deadband: float | None = None
+    deadband_pct: float | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class BitaxeAsicSensorEntityDescription(BitaxeSensorEntityDescription):
+    """Describes one per-ASIC metric; shared by the sensors of all ASICs."""
+
+    array_fn: Callable[[dict[str, Any]], list[Any]]
+    # Formatted with the 1-based ASIC number
+    key_format: str
+    name_format: str
+    # Name of the aggregate (mean, with min/max/stddev) sensor, if any
+    aggregate_name: str | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class BitaxeHistorySensorEntityDescription(SensorEntityDescription):
+    """Describes a Bitaxe sensor computed from the recent sample history."""
+
+    value_fn: Callable[[BitaxeTimeSeries], Any]
+    attr_fn: Callable[[BitaxeTimeSeries], dict[str, Any]] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class BitaxeTierSensorEntityDescription(SensorEntityDescription):
+    """Describes a Bitaxe sensor of a slower refresh tier."""
+
+    tier: str
+    # Defaults to reading the sensor key from the tier's payload
+    value_fn: Callable[[dict[str, Any]], Any] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class BitaxeTotalsSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the fleet totals device."""
+
+    value_fn: Callable[[BitaxeTotals], Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class BitaxeDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Bitaxe sensor reporting integration (not miner) state."""
+
+    value_fn: Callable[[BitaxeDataUpdateCoordinator], Any]
+    attr_fn: Callable[[BitaxeDataUpdateCoordinator], dict[str, Any]] | None = None
+
+
+# Suffixes of difficulties formatted by the firmware, such as "4.29G"
+DIFFICULTY_SUFFIXES = {"k": 1e3, "K": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18}
+
+
+def _difficulty(value: Any) -> float | None:
+    """Return a difficulty reported as a number or as formatted text."""
+    if isinstance(value, int | float):
+        return value
+    if not isinstance(value, str) or not (value := value.strip()):
+        return None
+    multiplier = DIFFICULTY_SUFFIXES.get(value[-1])
+    try:
+        return float(value[:-1] if multiplier else value) * (multiplier or 1)
+    except ValueError:
+        return None
 
 
 # All possible sensor descriptions - only created if the key exists in API data
@@ -55,7 +171,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("power"),
         icon="mdi:flash",
     ),
     BitaxeSensorEntityDescription(
@@ -64,7 +179,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("maxPower"),
         icon="mdi:flash-alert",
     ),
     BitaxeSensorEntityDescription(
@@ -73,7 +187,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.MILLIVOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("voltage"),
         icon="mdi:sine-wave",
     ),
     BitaxeSensorEntityDescription(
@@ -82,7 +195,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("nominalVoltage"),
         icon="mdi:sine-wave",
     ),
     BitaxeSensorEntityDescription(
@@ -102,7 +214,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.MILLIVOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("coreVoltage"),
         icon="mdi:chip",
     ),
     BitaxeSensorEntityDescription(
@@ -111,7 +222,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.MILLIVOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("coreVoltageActual"),
         icon="mdi:chip",
     ),
     # ==========================================================================
@@ -123,7 +233,7 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("temp"),
+        deadband=0.5,
         icon="mdi:thermometer",
     ),
     BitaxeSensorEntityDescription(
@@ -132,7 +242,7 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("temp2"),
+        deadband=0.5,
         icon="mdi:thermometer",
     ),
     BitaxeSensorEntityDescription(
@@ -141,7 +251,7 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("vrTemp"),
+        deadband=0.5,
         icon="mdi:thermometer-alert",
     ),
     BitaxeSensorEntityDescription(
@@ -150,7 +260,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("temptarget"),
         icon="mdi:thermometer-check",
     ),
     # ==========================================================================
@@ -161,7 +270,7 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Hash Rate",
         native_unit_of_measurement="GH/s",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("hashRate"),
+        deadband_pct=1.0,
         icon="mdi:speedometer",
     ),
     BitaxeSensorEntityDescription(
@@ -169,7 +278,7 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Hash Rate (1m avg)",
         native_unit_of_measurement="GH/s",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("hashRate_1m"),
+        deadband_pct=1.0,
         icon="mdi:speedometer",
     ),
     BitaxeSensorEntityDescription(
@@ -177,7 +286,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Hash Rate (10m avg)",
         native_unit_of_measurement="GH/s",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("hashRate_10m"),
         icon="mdi:speedometer",
     ),
     BitaxeSensorEntityDescription(
@@ -185,7 +293,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Hash Rate (1h avg)",
         native_unit_of_measurement="GH/s",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("hashRate_1h"),
         icon="mdi:speedometer",
     ),
     BitaxeSensorEntityDescription(
@@ -193,7 +300,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Hash Rate (1d avg)",
         native_unit_of_measurement="GH/s",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("hashRate_1d"),
         icon="mdi:speedometer",
     ),
     BitaxeSensorEntityDescription(
@@ -201,7 +307,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Expected Hash Rate",
         native_unit_of_measurement="GH/s",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("expectedHashrate"),
         icon="mdi:speedometer-medium",
     ),
     BitaxeSensorEntityDescription(
@@ -210,14 +315,12 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfFrequency.MEGAHERTZ,
         device_class=SensorDeviceClass.FREQUENCY,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("frequency"),
         icon="mdi:sine-wave",
     ),
     BitaxeSensorEntityDescription(
         key="smallCoreCount",
         name="ASIC Core Count",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("smallCoreCount"),
         icon="mdi:cpu-64-bit",
     ),
     BitaxeSensorEntityDescription(
@@ -225,7 +328,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Error Rate",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("errorPercentage"),
         icon="mdi:alert-circle-outline",
     ),
     # Computed efficiency - always create if we have power and hashRate
@@ -241,6 +343,7 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         ),
         icon="mdi:leaf",
         always_create=True,
+        source_keys=("power", "hashRate"),
     ),
     # ==========================================================================
     # Difficulty & Mining Stats
@@ -249,35 +352,32 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         key="bestDiff",
         name="Best Difficulty (All Time)",
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda data: data.get("bestDiff"),
+        value_fn=lambda data: _difficulty(data.get("bestDiff")),
         icon="mdi:trophy",
     ),
     BitaxeSensorEntityDescription(
         key="bestSessionDiff",
         name="Best Difficulty (Session)",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("bestSessionDiff"),
+        value_fn=lambda data: _difficulty(data.get("bestSessionDiff")),
         icon="mdi:trophy-outline",
     ),
     BitaxeSensorEntityDescription(
         key="poolDifficulty",
         name="Pool Difficulty",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("poolDifficulty"),
         icon="mdi:target",
     ),
     BitaxeSensorEntityDescription(
         key="networkDifficulty",
         name="Network Difficulty",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("networkDifficulty"),
         icon="mdi:earth",
     ),
     BitaxeSensorEntityDescription(
         key="blockHeight",
         name="Block Height",
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda data: data.get("blockHeight"),
         icon="mdi:cube-outline",
     ),
     # ==========================================================================
@@ -287,21 +387,18 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         key="sharesAccepted",
         name="Shares Accepted",
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get("sharesAccepted"),
         icon="mdi:check-circle",
     ),
     BitaxeSensorEntityDescription(
         key="sharesRejected",
         name="Shares Rejected",
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get("sharesRejected"),
         icon="mdi:close-circle",
     ),
     BitaxeSensorEntityDescription(
         key="blockFound",
         name="Blocks Found",
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get("blockFound"),
         icon="mdi:cube",
     ),
     # Legacy key for blocks found
@@ -309,7 +406,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         key="foundBlocks",
         name="Blocks Found",
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get("foundBlocks"),
         icon="mdi:cube",
     ),
     # ==========================================================================
@@ -320,7 +416,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Fan Speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("fanspeed"),
         icon="mdi:fan",
     ),
     BitaxeSensorEntityDescription(
@@ -328,7 +423,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Fan RPM",
         native_unit_of_measurement="RPM",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("fanrpm"),
         icon="mdi:fan",
     ),
     BitaxeSensorEntityDescription(
@@ -336,7 +430,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Fan 2 RPM",
         native_unit_of_measurement="RPM",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("fan2rpm"),
         icon="mdi:fan",
     ),
     BitaxeSensorEntityDescription(
@@ -350,7 +443,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Manual Fan Speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("manualFanSpeed"),
         icon="mdi:fan-speed-1",
     ),
     BitaxeSensorEntityDescription(
@@ -358,7 +450,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         name="Minimum Fan Speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("minFanSpeed"),
         icon="mdi:fan-speed-1",
     ),
     # ==========================================================================
@@ -370,7 +461,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("wifiRSSI"),
         icon="mdi:wifi",
     ),
     BitaxeSensorEntityDescription(
@@ -379,7 +469,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTime.MILLISECONDS,
         device_class=SensorDeviceClass.DURATION,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("responseTime"),
         icon="mdi:timer-outline",
     ),
     # ==========================================================================
@@ -391,7 +480,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTime.SECONDS,
         device_class=SensorDeviceClass.DURATION,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get("uptimeSeconds"),
         icon="mdi:clock-outline",
     ),
     BitaxeSensorEntityDescription(
@@ -400,7 +488,6 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
         native_unit_of_measurement="B",
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("freeHeap"),
         icon="mdi:memory",
         entity_registry_enabled_default=False,
     ),
@@ -419,13 +506,321 @@ SENSOR_DESCRIPTIONS: tuple[BitaxeSensorEntityDescription, ...] = (
 )
 
 
+# Refresh pipeline timings (p95, with p50/p99 as attributes), only created when
+# instrumentation is enabled and disabled by default
+TIMING_SENSOR_DESCRIPTIONS: tuple[BitaxeDiagnosticSensorEntityDescription, ...] = tuple(
+    BitaxeDiagnosticSensorEntityDescription(
+        key=f"timing_{stage}",
+        name=name,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator, stage=stage: coordinator.timings.percentile(stage, 95),
+        attr_fn=lambda coordinator, stage=stage: {
+            "p50": coordinator.timings.percentile(stage, 50),
+            "p99": coordinator.timings.percentile(stage, 99),
+        },
+        icon="mdi:timer-outline",
+    )
+    for stage, name in (
+        (STAGE_REQUEST, "Request Time"),
+        (STAGE_READ, "Body Read Time"),
+        (STAGE_PARSE, "JSON Parse Time"),
+        (STAGE_FETCH, "Fetch Time"),
+        (STAGE_EXTRACT, "Value Extraction Time"),
+        (STAGE_NOTIFY, "State Update Time"),
+    )
+)
+
+
+def _asic_temps(data: dict[str, Any]) -> list[Any]:
+    """Extract the per-ASIC temperatures."""
+    return data.get("asicTemps") or []
+
+
+def _asic_hashrates(data: dict[str, Any]) -> list[Any]:
+    """Extract the per-ASIC hash rates from the hashrate monitor."""
+    asics = (data.get("hashrateMonitor") or {}).get("asics") or []
+    return [asic.get("total") for asic in asics]
+
+
+def _asic_errors(data: dict[str, Any]) -> list[Any]:
+    """Extract the per-ASIC error counts from the hashrate monitor."""
+    asics = (data.get("hashrateMonitor") or {}).get("asics") or []
+    return [asic.get("errorCount") for asic in asics]
+
+
+def _asic_stats(values: list[Any]) -> dict[str, float] | None:
+    """Return mean, min, max and standard deviation of per-ASIC values."""
+    numbers = [value for value in values if isinstance(value, (int, float))]
+    if not numbers:
+        return None
+    mean = sum(numbers) / len(numbers)
+    variance = sum((value - mean) ** 2 for value in numbers) / len(numbers)
+    return {
+        "mean": round(mean, 2),
+        "min": min(numbers),
+        "max": max(numbers),
+        "stddev": round(math.sqrt(variance), 2),
+    }
+
+
+# Per-ASIC metrics of multi-ASIC boards. Each ASIC gets its own (disabled by
+# default) sensor sharing the description, and each metric one aggregate
+# sensor that stays enabled.
+ASIC_SENSOR_DESCRIPTIONS: tuple[BitaxeAsicSensorEntityDescription, ...] = (
+    BitaxeAsicSensorEntityDescription(
+        key="asic_temp",
+        key_format="asicTemp{}",
+        name_format="ASIC {} Temperature",
+        aggregate_name="ASIC Temperature (avg)",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer",
+        array_fn=_asic_temps,
+        source_keys=("asicTemps",),
+        deadband=0.5,
+    ),
+    BitaxeAsicSensorEntityDescription(
+        key="asic_hashrate",
+        key_format="asic{}_hashrate",
+        name_format="ASIC {} Hash Rate",
+        aggregate_name="ASIC Hash Rate (avg)",
+        native_unit_of_measurement="GH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:speedometer",
+        array_fn=_asic_hashrates,
+        source_keys=("hashrateMonitor",),
+        deadband_pct=1.0,
+    ),
+    BitaxeAsicSensorEntityDescription(
+        key="asic_errors",
+        key_format="asic{}_errors",
+        name_format="ASIC {} Errors",
+        aggregate_name="ASIC Errors (avg)",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:alert-circle",
+        array_fn=_asic_errors,
+        source_keys=("hashrateMonitor",),
+    ),
+)
+
+
+def _source_keys(description: BitaxeSensorEntityDescription) -> tuple[str, ...]:
+    """Return the payload keys a sensor value is derived from."""
+    return description.source_keys or (description.key,)
+
+
+def _within_deadband(
+    description: BitaxeSensorEntityDescription, old: Any, new: Any
+) -> bool:
+    """Return True if a numeric change is too small to be worth writing."""
+    if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+        return False
+    delta = abs(new - old)
+    if description.deadband is not None and delta < description.deadband:
+        return True
+    return (
+        description.deadband_pct is not None
+        and old != 0
+        and delta / abs(old) * 100 < description.deadband_pct
+    )
+
+
+# Rarely changing details, refreshed with the static tier only. Only
+# created if the firmware provides them.
+TIER_SENSOR_DESCRIPTIONS: tuple[BitaxeTierSensorEntityDescription, ...] = (
+    BitaxeTierSensorEntityDescription(
+        key="deviceModel",
+        name="Device Model",
+        tier=TIER_STATIC,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:information-outline",
+    ),
+    BitaxeTierSensorEntityDescription(
+        key="asicCount",
+        name="ASIC Count",
+        tier=TIER_STATIC,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:chip",
+    ),
+    BitaxeTierSensorEntityDescription(
+        key="defaultFrequency",
+        name="Default ASIC Frequency",
+        native_unit_of_measurement=UnitOfFrequency.MEGAHERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+        tier=TIER_STATIC,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:sine-wave",
+    ),
+    BitaxeTierSensorEntityDescription(
+        key="defaultVoltage",
+        name="Default Core Voltage",
+        native_unit_of_measurement=UnitOfElectricPotential.MILLIVOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        tier=TIER_STATIC,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:chip",
+    ),
+)
+
+
+# Rolling values over the last HISTORY_WINDOW seconds of samples
+HISTORY_SENSOR_DESCRIPTIONS: tuple[BitaxeHistorySensorEntityDescription, ...] = (
+    BitaxeHistorySensorEntityDescription(
+        key="shares_per_minute",
+        name="Shares per Minute",
+        native_unit_of_measurement="shares/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda history: history.shares_per_minute,
+        icon="mdi:check-circle-outline",
+    ),
+    BitaxeHistorySensorEntityDescription(
+        key="reject_ratio",
+        name="Share Reject Ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda history: history.reject_ratio,
+        icon="mdi:close-circle-outline",
+    ),
+    BitaxeHistorySensorEntityDescription(
+        key="efficiency_15m",
+        name="Efficiency (15m avg)",
+        native_unit_of_measurement="J/TH",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda history: history.efficiency,
+        attr_fn=lambda history: {
+            "hashrate_stddev": history.metrics["hashRate"].as_dict()["stddev"],
+            "temperature_stddev": history.metrics["temp"].as_dict()["stddev"],
+            "temperature_max": history.metrics["temp"].max,
+            "samples": len(history.metrics["power"]),
+        },
+        icon="mdi:leaf",
+    ),
+)
+
+
+# Sensors of the fleet totals device, created for the whole fleet and per tag
+TOTALS_SENSOR_DESCRIPTIONS: tuple[BitaxeTotalsSensorEntityDescription, ...] = (
+    BitaxeTotalsSensorEntityDescription(
+        key="hashRate",
+        name="Hash Rate",
+        native_unit_of_measurement="GH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda totals: round(totals.hash_rate, 2),
+        icon="mdi:speedometer",
+    ),
+    BitaxeTotalsSensorEntityDescription(
+        key="power",
+        name="Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda totals: round(totals.power, 2),
+        icon="mdi:flash",
+    ),
+    BitaxeTotalsSensorEntityDescription(
+        key="efficiency",
+        name="Efficiency",
+        native_unit_of_measurement="J/TH",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda totals: totals.efficiency,
+        icon="mdi:leaf",
+    ),
+    # Miner counters reset when a miner restarts, so the sums are not
+    # monotonic and use the TOTAL state class
+    BitaxeTotalsSensorEntityDescription(
+        key="sharesAccepted",
+        name="Shares Accepted",
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda totals: totals.shares_accepted,
+        icon="mdi:check-circle",
+    ),
+    BitaxeTotalsSensorEntityDescription(
+        key="sharesRejected",
+        name="Shares Rejected",
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda totals: totals.shares_rejected,
+        icon="mdi:close-circle",
+    ),
+    BitaxeTotalsSensorEntityDescription(
+        key="blockFound",
+        name="Blocks Found",
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda totals: totals.blocks_found,
+        icon="mdi:cube",
+    ),
+    BitaxeTotalsSensorEntityDescription(
+        key="online",
+        name="Miners Online",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda totals: totals.online,
+        icon="mdi:server-network",
+    ),
+)
+
+
+# Sensors describing how the integration itself polls the miner
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: tuple[BitaxeDiagnosticSensorEntityDescription, ...] = (
+    BitaxeDiagnosticSensorEntityDescription(
+        key="poll_interval",
+        name="Poll Interval",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.refresh_interval.total_seconds(),
+        attr_fn=lambda coordinator: {
+            "polls": coordinator.polls,
+            "polls_saved": round(coordinator.polls_saved),
+        },
+        icon="mdi:timer-sync-outline",
+    ),
+    BitaxeDiagnosticSensorEntityDescription(
+        key="connection_state",
+        name="Connection State",
+        device_class=SensorDeviceClass.ENUM,
+        options=[BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.client.breaker.state,
+        attr_fn=lambda coordinator: {
+            "failures": coordinator.client.breaker.failures,
+            "backoff": coordinator.client.breaker.backoff,
+            "timeout": round(coordinator.client.breaker.timeout, 2),
+        },
+        icon="mdi:lan-connect",
+    ),
+)
+
+
+# Only created for miners polled by the shared fleet scheduler
+SCHEDULER_SENSOR_DESCRIPTIONS: tuple[BitaxeDiagnosticSensorEntityDescription, ...] = (
+    BitaxeDiagnosticSensorEntityDescription(
+        key="poll_priority",
+        name="Poll Priority",
+        device_class=SensorDeviceClass.ENUM,
+        options=list(PRIORITIES),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.poll_priority,
+        attr_fn=lambda coordinator: {
+            "missed_deadlines": dict(coordinator.missed_deadlines),
+            "polls_shed": coordinator.polls_shed,
+        },
+        icon="mdi:sort-variant",
+    ),
+)
+
+
 def _should_create_sensor(
-    description: BitaxeSensorEntityDescription, data: dict[str, Any]
+    description: BitaxeSensorEntityDescription, keys: Collection[str]
 ) -> bool:
-    """Determine if a sensor should be created based on available data."""
+    """Determine if a sensor should be created based on the payload keys."""
     if description.always_create:
         return True
-    return description.key in data
+    return description.key in keys
 
 
 async def async_setup_entry(
@@ -434,88 +829,312 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Bitaxe sensor based on a config entry."""
-    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    data = coordinator.data or {}
+    if entry.data.get(CONF_FLEET_TOTALS):
+        _async_setup_totals_entry(hass, entry, async_add_entities)
+        return
 
-    entities: list[BitaxeSensor] = []
+    coordinator: BitaxeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    deadbands = entry.options.get(CONF_DEADBANDS, DEFAULT_DEADBANDS)
 
-    # Add sensors only if their key exists in the data (auto-detection)
-    for description in SENSOR_DESCRIPTIONS:
-        if _should_create_sensor(description, data):
-            entities.append(BitaxeSensor(coordinator, description, entry))
+    # Add sensors only if their key exists in the payload (auto-detection)
+    planner = BitaxeSensorPlanner(
+        coordinator, entry, async_add_entities, hass.data[SCHEMA_DATA_KEY], deadbands
+    )
+    entities: list[SensorEntity] = list(planner.async_plan())
+    entry.async_on_unload(coordinator.async_add_listener(planner.async_check_drift))
 
-    # Dynamically create ASIC temp sensors based on actual data (asicTemps array)
-    asic_temps = data.get("asicTemps", [])
-    for i in range(len(asic_temps)):
+    # Integrated energy (kWh) sensor for the Energy Dashboard, derived from power
+    if "power" in planner.keys:
         entities.append(
-            BitaxeSensor(
+            BitaxeEnergySensor(
                 coordinator,
-                BitaxeSensorEntityDescription(
-                    key=f"asicTemp{i + 1}",
-                    name=f"ASIC {i + 1} Temperature",
-                    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-                    device_class=SensorDeviceClass.TEMPERATURE,
-                    state_class=SensorStateClass.MEASUREMENT,
-                    value_fn=lambda d, idx=i: (
-                        d.get("asicTemps", [])[idx]
-                        if len(d.get("asicTemps", [])) > idx
-                        else None
-                    ),
-                    icon="mdi:thermometer",
-                ),
                 entry,
+                entry.options.get(
+                    CONF_ENERGY_SAMPLE_INTERVAL, DEFAULT_ENERGY_SAMPLE_INTERVAL
+                ),
             )
         )
 
-    # Dynamically create per-ASIC hash rate sensors from hashrateMonitor
-    hashrate_monitor = data.get("hashrateMonitor", {})
-    asics = hashrate_monitor.get("asics", [])
-    for i, asic_data in enumerate(asics):
-        # Total hash rate for this ASIC
-        entities.append(
-            BitaxeSensor(
-                coordinator,
-                BitaxeSensorEntityDescription(
-                    key=f"asic{i + 1}_hashrate",
-                    name=f"ASIC {i + 1} Hash Rate",
-                    native_unit_of_measurement="GH/s",
-                    state_class=SensorStateClass.MEASUREMENT,
-                    value_fn=lambda d, idx=i: (
-                        d.get("hashrateMonitor", {}).get("asics", [])[idx].get("total")
-                        if len(d.get("hashrateMonitor", {}).get("asics", [])) > idx
-                        else None
-                    ),
-                    icon="mdi:speedometer",
-                ),
-                entry,
-            )
+    async_add_entities(entities)
+
+    # Per-ASIC sensors are added in batches, now and whenever more ASICs report
+    asic_sensors = BitaxeAsicSensorManager(
+        coordinator,
+        entry,
+        async_add_entities,
+        deadbands,
+        entry.options.get(CONF_PER_ASIC_SENSORS, DEFAULT_PER_ASIC_SENSORS),
+    )
+    asic_sensors.async_add_new()
+    entry.async_on_unload(coordinator.async_add_listener(asic_sensors.async_add_new))
+
+    async_add_entities(
+        BitaxeHistorySensor(coordinator, description, entry)
+        for description in HISTORY_SENSOR_DESCRIPTIONS
+    )
+
+    # The health score is added once the miner reports per-ASIC values
+    health_added = False
+
+    @callback
+    def _async_add_health() -> None:
+        """Add the ASIC health sensor."""
+        nonlocal health_added
+        if health_added or not coordinator.health.supported:
+            return
+        health_added = True
+        async_add_entities([BitaxeAsicHealthSensor(coordinator, entry)])
+
+    _async_add_health()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_health))
+
+    for tier in coordinator.tiers.values():
+        _async_setup_tier_sensors(coordinator, tier, entry, async_add_entities)
+
+    diagnostic_descriptions = DIAGNOSTIC_SENSOR_DESCRIPTIONS
+    if coordinator.timings is not None:
+        diagnostic_descriptions += TIMING_SENSOR_DESCRIPTIONS
+    if coordinator.fleet_managed:
+        diagnostic_descriptions += SCHEDULER_SENSOR_DESCRIPTIONS
+    async_add_entities(
+        BitaxeDiagnosticSensor(coordinator, description, entry)
+        for description in diagnostic_descriptions
+    )
+
+    if coordinator.autotuner is not None:
+        async_add_entities(
+            [BitaxeAutotuneSensor(coordinator.autotuner, coordinator, entry)]
         )
-        # Error count for this ASIC
-        entities.append(
-            BitaxeSensor(
-                coordinator,
-                BitaxeSensorEntityDescription(
-                    key=f"asic{i + 1}_errors",
-                    name=f"ASIC {i + 1} Errors",
-                    state_class=SensorStateClass.TOTAL_INCREASING,
-                    value_fn=lambda d, idx=i: (
-                        d.get("hashrateMonitor", {})
-                        .get("asics", [])[idx]
-                        .get("errorCount")
-                        if len(d.get("hashrateMonitor", {}).get("asics", [])) > idx
-                        else None
-                    ),
-                    icon="mdi:alert-circle",
-                ),
-                entry,
+
+
+@callback
+def _async_setup_totals_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the sensors of the fleet totals device."""
+    fleet_totals: BitaxeFleetTotals = hass.data[FLEET_TOTALS_DATA_KEY]
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer="Bitaxe",
+        model="Fleet",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+    known: set[str | None] = set()
+
+    @callback
+    def _async_add_new_tags() -> None:
+        """Add sensors for the fleet and for tags without sensors yet."""
+        new = [key for key in fleet_totals.totals if key not in known]
+        known.update(new)
+        async_add_entities(
+            BitaxeTotalsSensor(fleet_totals, description, entry, device_info, tag)
+            for tag in new
+            for description in TOTALS_SENSOR_DESCRIPTIONS
+        )
+
+    _async_add_new_tags()
+    entry.async_on_unload(fleet_totals.async_add_listener(_async_add_new_tags))
+
+
+@callback
+def _async_setup_tier_sensors(
+    coordinator: BitaxeDataUpdateCoordinator,
+    tier: BitaxeTierCoordinator,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add the sensors of a refresh tier once its payload is known."""
+    pending = [
+        description
+        for description in TIER_SENSOR_DESCRIPTIONS
+        if description.tier == tier.tier
+    ]
+    if not pending:
+        # A tier without sensors, like the history of the backfill, is only
+        # refreshed on demand
+        return
+
+    @callback
+    def _async_add_new() -> None:
+        """Add sensors for keys the tier's payload provides."""
+        if not tier.data:
+            return
+        new = [description for description in pending if description.key in tier.data]
+        for description in new:
+            pending.remove(description)
+        if new:
+            async_add_entities(
+                BitaxeTierSensor(coordinator, tier, description, entry)
+                for description in new
             )
+
+    _async_add_new()
+    # The listener also keeps the tier polling
+    entry.async_on_unload(tier.async_add_listener(_async_add_new))
+
+
+class BitaxeSensorPlanner:
+    """Pick the sensors of a miner from the keys of its payload.
+
+    Before the first payload, the keys the miner's schema had last time are
+    used. The planner keeps the keys of its own miner: when a refresh adds
+    keys (for example after a firmware upgrade), sensors for them are added;
+    sensors for removed keys report unknown.
+    """
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+        schemas: BitaxeSchemaIndex,
+        deadbands: bool,
+    ) -> None:
+        """Initialize the planner."""
+        self.coordinator = coordinator
+        self.entry = entry
+        self._async_add_entities = async_add_entities
+        self._schemas = schemas
+        self._deadbands = deadbands
+        data = coordinator.data or {}
+        self.schema = schemas.async_get(entry.entry_id, data)
+        # Keys of this miner's payload
+        self.keys: set[str] = set(data or self.schema.keys)
+        self._planned: set[str] = set()
+
+    @callback
+    def async_plan(self) -> list[BitaxeSensor]:
+        """Return sensors for keys of the miner that have no sensor yet."""
+        values = self.coordinator.values
+        entities: list[BitaxeSensor] = []
+        for description in SENSOR_DESCRIPTIONS:
+            if description.key in self._planned or not _should_create_sensor(
+                description, self.keys
+            ):
+                continue
+            self._planned.add(description.key)
+            slot = values.register(
+                description.value_fn or itemgetter(description.key),
+                _source_keys(description),
+            )
+            entities.append(
+                BitaxeSensor(self.coordinator, description, self.entry, slot, self._deadbands)
+            )
+        return entities
+
+    @callback
+    def async_check_drift(self) -> None:
+        """Plan sensors for payload keys that appeared in a refresh."""
+        data = self.coordinator.data
+        changed = self.coordinator.values.changed
+        if not data or not changed:
+            return
+        if not changed.isdisjoint(SCHEMA_ID_KEYS):
+            # New firmware or board: remember its schema for the next startup
+            self.schema = self._schemas.async_get(self.entry.entry_id, data)
+        appeared = {key for key in changed if key in data and key not in self.keys}
+        gone = {key for key in changed if key not in data and key in self.keys}
+        if not appeared and not gone:
+            return
+        self.keys.difference_update(gone)
+        self.keys.update(appeared)
+        if appeared and (entities := self.async_plan()):
+            self._async_add_entities(entities)
+
+
+class BitaxeAsicSensorManager:
+    """Create per-ASIC sensors in one pass and add new ones as ASICs appear.
+
+    Values of each metric are extracted as one array per refresh; when the
+    array grows, only slots and sensors for the new ASICs are added.
+    """
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+        deadbands: bool,
+        enabled: bool,
+    ) -> None:
+        """Initialize the manager."""
+        self.coordinator = coordinator
+        self.entry = entry
+        self._async_add_entities = async_add_entities
+        self._deadbands = deadbands
+        self._enabled = enabled
+        self._counts = dict.fromkeys(
+            (description.key for description in ASIC_SENSOR_DESCRIPTIONS), 0
         )
 
-    # Integrated energy (kWh) sensor for the Energy Dashboard, derived from power
-    if "power" in data:
-        entities.append(BitaxeEnergySensor(coordinator, entry))
+    @callback
+    def async_add_new(self) -> None:
+        """Add sensors for ASICs that have no sensors yet."""
+        if not (data := self.coordinator.data):
+            return
 
-    async_add_entities(entities)
+        values = self.coordinator.values
+        entities: list[BitaxeSensor] = []
+        for description in ASIC_SENSOR_DESCRIPTIONS:
+            start = self._counts[description.key]
+            count = len(description.array_fn(data))
+            if count <= start:
+                continue
+
+            if not start and description.aggregate_name is not None:
+                slot = values.register(
+                    lambda d, fn=description.array_fn: _asic_stats(fn(d)),
+                    description.source_keys,
+                )
+                entities.append(
+                    BitaxeAsicStatsSensor(
+                        self.coordinator, description, self.entry, slot, self._deadbands
+                    )
+                )
+
+            slot = values.register_array(
+                description.array_fn, description.source_keys, count - start, start
+            )
+            entities.extend(
+                BitaxeAsicSensor(
+                    self.coordinator,
+                    description,
+                    self.entry,
+                    slot + index,
+                    self._deadbands,
+                    start + index,
+                    self._enabled,
+                )
+                for index in range(count - start)
+            )
+            self._counts[description.key] = count
+
+        if entities:
+            if self._enabled:
+                self._async_enable(entities)
+            self._async_add_entities(entities)
+
+    @callback
+    def _async_enable(self, entities: list[BitaxeSensor]) -> None:
+        """Enable per-ASIC sensors registered while the option was off.
+
+        The enabled default only applies when a sensor is first registered;
+        sensors the user disabled stay disabled.
+        """
+        registry = er.async_get(self.coordinator.hass)
+        for entity in entities:
+            if not isinstance(entity, BitaxeAsicSensor):
+                continue
+            entity_id = registry.async_get_entity_id(
+                SENSOR_DOMAIN, DOMAIN, entity.unique_id
+            )
+            if (
+                entity_id is not None
+                and (registry_entry := registry.async_get(entity_id)) is not None
+                and registry_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+            ):
+                registry.async_update_entity(entity_id, disabled_by=None)
 
 
 class BitaxeSensor(CoordinatorEntity[BitaxeDataUpdateCoordinator], SensorEntity):
@@ -529,26 +1148,437 @@ class BitaxeSensor(CoordinatorEntity[BitaxeDataUpdateCoordinator], SensorEntity)
         coordinator: BitaxeDataUpdateCoordinator,
         description: BitaxeSensorEntityDescription,
         entry: ConfigEntry,
+        slot: int,
+        deadbands: bool,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.entity_description = description
         self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._slot = slot
+        self._deadbands = deadbands
+        self._source_keys = _source_keys(description)
+        self._written_value: Any = None
+        self._written_available: bool | None = None
 
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": entry.title,
-            "manufacturer": "Bitaxe",
-            "model": coordinator.data.get("ASICModel", "Unknown"),
-            "sw_version": coordinator.data.get("version", "Unknown"),
-        }
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor from the coordinator's value table."""
+        return self.coordinator.values.values[self._slot]
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the initial state as the last written one."""
+        await super().async_added_to_hass()
+        self._written_value = self.coordinator.values.values[self._slot]
+        self._written_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the sensor value actually changed."""
+        stats = self.coordinator.write_stats
+        available = self.available
+        value = self.coordinator.values.values[self._slot]
+        if available == self._written_available and (
+            self.coordinator.values.changed.isdisjoint(self._source_keys)
+            or value == self._written_value
+            or (self._deadbands and self._within_deadband(self._written_value, value))
+        ):
+            stats.suppressed += 1
+            return
+
+        self._written_value = value
+        self._written_available = available
+        stats.emitted += 1
+        self.async_write_ha_state()
+
+    def _within_deadband(self, old: Any, new: Any) -> bool:
+        """Return True if a change of the value is too small to be worth writing."""
+        return _within_deadband(self.entity_description, old, new)
+
+
+class BitaxeAsicSensor(BitaxeSensor):
+    """A metric of a single ASIC, using the description shared by all ASICs."""
+
+    entity_description: BitaxeAsicSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        description: BitaxeAsicSensorEntityDescription,
+        entry: ConfigEntry,
+        slot: int,
+        deadbands: bool,
+        index: int,
+        enabled: bool,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description, entry, slot, deadbands)
+        self._attr_unique_id = f"{entry.entry_id}_{description.key_format.format(index + 1)}"
+        self._attr_name = description.name_format.format(index + 1)
+        self._attr_entity_registry_enabled_default = enabled
+
+
+class BitaxeAsicStatsSensor(BitaxeSensor):
+    """Mean of a metric across all ASICs, with min/max/stddev as attributes."""
+
+    entity_description: BitaxeAsicSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        description: BitaxeAsicSensorEntityDescription,
+        entry: ConfigEntry,
+        slot: int,
+        deadbands: bool,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description, entry, slot, deadbands)
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}_stats"
+        self._attr_name = description.aggregate_name
+
+    @property
+    def native_value(self) -> Any:
+        """Return the mean across ASICs."""
+        stats = self.coordinator.values.values[self._slot]
+        return stats["mean"] if stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return min, max and standard deviation across ASICs."""
+        stats = self.coordinator.values.values[self._slot]
+        if not stats:
+            return None
+        return {"min": stats["min"], "max": stats["max"], "stddev": stats["stddev"]}
+
+    def _within_deadband(self, old: Any, new: Any) -> bool:
+        """Return True if the mean and every attribute moved less than the deadband."""
+        if not old or not new:
+            return False
+        return all(
+            old[field] == new[field]
+            or _within_deadband(self.entity_description, old[field], new[field])
+            for field in ("mean", "min", "max", "stddev")
+        )
+
+
+class BitaxeTierSensor(CoordinatorEntity[BitaxeTierCoordinator], SensorEntity):
+    """Sensor updated by a slower refresh tier only."""
+
+    entity_description: BitaxeTierSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        tier: BitaxeTierCoordinator,
+        description: BitaxeTierSensorEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(tier)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor from the tier's payload."""
+        data = self.coordinator.data or {}
+        if self.entity_description.value_fn is not None:
+            return self.entity_description.value_fn(data)
+        return data.get(self.entity_description.key)
+
+
+class BitaxeHistorySensor(CoordinatorEntity[BitaxeDataUpdateCoordinator], SensorEntity):
+    """Sensor computed from the coordinator's rolling sample history."""
+
+    entity_description: BitaxeHistorySensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        description: BitaxeHistorySensorEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+        self._written: tuple[Any, ...] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the value, attributes or availability changed."""
+        current = (self.available, self.native_value, self.extra_state_attributes)
+        if current != self._written:
+            self._written = current
+            self.async_write_ha_state()
 
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        if self.coordinator.data is None:
+        return self.entity_description.value_fn(self.coordinator.history)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional rolling statistics."""
+        if self.entity_description.attr_fn is None:
+            return None
+        return self.entity_description.attr_fn(self.coordinator.history)
+
+
+class BitaxeAsicHealthSensor(CoordinatorEntity[BitaxeDataUpdateCoordinator], SensorEntity):
+    """Health of the board's ASICs, with the flagged ASICs as attributes."""
+
+    _attr_has_entity_name = True
+    _attr_name = "ASIC Health"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:heart-pulse"
+
+    def __init__(
+        self, coordinator: BitaxeDataUpdateCoordinator, entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_asic_health"
+        self._attr_device_info = coordinator.device_info
+        self._written: tuple[Any, ...] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the score, problems or availability changed."""
+        health = self.coordinator.health
+        current = (self.available, health.score, health.problems, health.temp_spread)
+        if current != self._written:
+            self._written = current
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the health score."""
+        return self.coordinator.health.score
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the flagged ASICs per problem and the temperature spread."""
+        health = self.coordinator.health
+        return {**health.problems, "temp_spread": health.temp_spread}
+
+
+class BitaxeTotalsSensor(SensorEntity):
+    """Sum of a metric across all miners, or across the miners with a tag."""
+
+    entity_description: BitaxeTotalsSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        fleet_totals: BitaxeFleetTotals,
+        description: BitaxeTotalsSensorEntityDescription,
+        entry: ConfigEntry,
+        device_info: DeviceInfo,
+        tag: str | None,
+    ) -> None:
+        """Initialize the sensor."""
+        self.fleet_totals = fleet_totals
+        self.entity_description = description
+        self._tag = tag
+        if tag is None:
+            self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        else:
+            self._attr_unique_id = f"{entry.entry_id}_{slugify(tag)}_{description.key}"
+            self._attr_name = f"{tag} {description.name}"
+        self._attr_device_info = device_info
+        self._written: tuple[Any, ...] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of the totals."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.fleet_totals.async_add_listener(self._handle_update))
+
+    @callback
+    def _handle_update(self) -> None:
+        """Write state when the value or availability changed."""
+        current = (self.available, self.native_value, self.extra_state_attributes)
+        if current != self._written:
+            self._written = current
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return True if at least one miner contributes to the totals."""
+        totals = self.fleet_totals.totals.get(self._tag)
+        return self._tag is None or (totals is not None and totals.miners > 0)
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        if (totals := self.fleet_totals.totals.get(self._tag)) is None:
+            return None
+        return self.entity_description.value_fn(totals)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the number of miners contributing to the totals."""
+        if (totals := self.fleet_totals.totals.get(self._tag)) is None:
+            return None
+        return {"miners": totals.miners}
+
+
+class BitaxeDiagnosticSensor(SensorEntity):
+    """Sensor reporting the integration's own polling state for a miner.
+
+    It is updated after every refresh, including repeated failures, and
+    stays available while the miner is unreachable to show the backoff.
+    """
+
+    entity_description: BitaxeDiagnosticSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        description: BitaxeDiagnosticSensorEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+        self._written: tuple[Any, dict[str, Any] | None] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to coordinator refreshes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_refresh_listener(self._handle_refresh)
+        )
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_refresh)
+        )
+
+    @callback
+    def _handle_refresh(self) -> None:
+        """Write state when the diagnostic value or attributes changed."""
+        current = (self.native_value, self.extra_state_attributes)
+        if current != self._written:
+            self._written = current
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional diagnostic details."""
+        if self.entity_description.attr_fn is None:
+            return None
+        return self.entity_description.attr_fn(self.coordinator)
+
+
+class BitaxeAutotuneSensor(SensorEntity):
+    """Status of the autotuner, with the setting it measures or chose."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Autotune"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = (
+        AUTOTUNE_IDLE,
+        AUTOTUNE_SETTLING,
+        AUTOTUNE_MEASURING,
+        AUTOTUNE_CONVERGED,
+        AUTOTUNE_FAILED,
+    )
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:tune-variant"
+
+    def __init__(
+        self,
+        autotuner: BitaxeAutotuner,
+        coordinator: BitaxeDataUpdateCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        self._autotuner = autotuner
+        self._attr_unique_id = f"{entry.entry_id}_autotune"
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to status changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._autotuner.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> str:
+        """Return the status."""
+        return self._autotuner.status
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the settings and the progress of the search."""
+        autotuner = self._autotuner
+        result = autotuner.result
+        return {
+            "setting": _format_setting(autotuner.point),
+            "original": _format_setting(autotuner.original),
+            "result": None
+            if result is None
+            else {
+                **_format_setting((result.frequency, result.core_voltage)),
+                "efficiency": round(result.efficiency, 2),
+            },
+            "settings_measured": len(autotuner.history),
+        }
+
+
+def _format_setting(point: tuple[int, int] | None) -> dict[str, int] | None:
+    """Return a frequency and voltage as attribute."""
+    if point is None:
+        return None
+    return {"frequency": point[0], "core_voltage": point[1]}
+
+
+@dataclass
+class BitaxeEnergyExtraStoredData(ExtraStoredData):
+    """Integration state of the energy sensor kept across restarts."""
+
+    energy_kwh: float
+    last_power: float | None
+    last_update: datetime | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the stored data."""
+        return {
+            "energy_kwh": self.energy_kwh,
+            "last_power": self.last_power,
+            "last_update": self.last_update.isoformat() if self.last_update else None,
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> BitaxeEnergyExtraStoredData | None:
+        """Initialize the stored data from a dict."""
+        try:
+            last_update = restored.get("last_update")
+            return cls(
+                float(restored["energy_kwh"]),
+                restored.get("last_power"),
+                dt_util.parse_datetime(last_update) if last_update else None,
+            )
+        except (KeyError, TypeError, ValueError):
             return None
-        return self.entity_description.value_fn(self.coordinator.data)
 
 
 class BitaxeEnergySensor(
@@ -558,6 +1588,11 @@ class BitaxeEnergySensor(
 
     Trapezoidal integration is used so the device can be added to the Home
     Assistant Energy Dashboard without requiring a separate Riemann sum helper.
+    Power is sampled on every refresh and, if configured, by a faster sampler
+    of its own; the state is written at most every ENERGY_WRITE_INTERVAL.
+    The last sample is restored after a restart so the gap is integrated too.
+    Gaps longer than ENERGY_MAX_GAP are skipped, but remembered so they can
+    be filled from the miner's own power history once it is backfilled.
     """
 
     _attr_has_entity_name = True
@@ -568,58 +1603,147 @@ class BitaxeEnergySensor(
     _attr_icon = "mdi:lightning-bolt"
 
     def __init__(
-        self, coordinator: BitaxeDataUpdateCoordinator, entry: ConfigEntry
+        self,
+        coordinator: BitaxeDataUpdateCoordinator,
+        entry: ConfigEntry,
+        sample_interval: int = DEFAULT_ENERGY_SAMPLE_INTERVAL,
     ) -> None:
         """Initialize the energy sensor."""
         super().__init__(coordinator)
         self._attr_unique_id = f"{entry.entry_id}_energy"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": entry.title,
-            "manufacturer": "Bitaxe",
-            "model": coordinator.data.get("ASICModel", "Unknown"),
-            "sw_version": coordinator.data.get("version", "Unknown"),
-        }
+        self._attr_device_info = coordinator.device_info
         self._energy_kwh: float = 0.0
-        self._last_update = None
+        self._last_update: datetime | None = None
         self._last_power: float | None = None
+        # Seconds between dedicated power samples, 0 to only use refreshes
+        self._sample_interval = sample_interval
+        self._sampling = False
+        self._last_write = 0.0
+        self._written_available: bool | None = None
+        # Skipped intervals, filled once the miner's history is backfilled
+        self._gaps: deque[EnergyGap] = deque(
+            maxlen=ENERGY_MAX_GAPS
+        )
 
     async def async_added_to_hass(self) -> None:
-        """Restore the accumulated energy value after a restart."""
+        """Restore the accumulated energy and the last sample after a restart."""
         await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state is not None and last_state.state not in (
-            None,
-            STATE_UNKNOWN,
-            STATE_UNAVAILABLE,
+        if (extra := await self.async_get_last_extra_data()) is not None and (
+            restored := BitaxeEnergyExtraStoredData.from_dict(extra.as_dict())
+        ) is not None:
+            self._energy_kwh = restored.energy_kwh
+            self._last_power = restored.last_power
+            self._last_update = restored.last_update
+        elif (last_state := await self.async_get_last_state()) is not None and (
+            last_state.state not in (None, STATE_UNKNOWN, STATE_UNAVAILABLE)
         ):
+            # Saved by a version without the extra data
             try:
                 self._energy_kwh = float(last_state.state)
             except ValueError:
                 self._energy_kwh = 0.0
 
+        if (backfill := self.coordinator.backfill) is not None:
+            self.async_on_remove(
+                backfill.async_add_power_listener(self._async_fill_gaps, self._gaps.copy)
+            )
+
+        if self._sample_interval:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_sample,
+                    timedelta(seconds=self._sample_interval),
+                    name=f"Bitaxe power sample {self.coordinator.client.host}",
+                )
+            )
+
+    @property
+    def extra_restore_state_data(self) -> BitaxeEnergyExtraStoredData:
+        """Return the integration state to store across restarts."""
+        return BitaxeEnergyExtraStoredData(
+            self._energy_kwh, self._last_power, self._last_update
+        )
+
+    async def _async_sample(self, now: datetime) -> None:
+        """Fetch a power reading between refreshes.
+
+        AxeOS has no endpoint for the power alone, so each sample costs a
+        full /api/system/info request and parse.
+        """
+        if self._sampling or (
+            self._last_update is not None
+            and (now - self._last_update).total_seconds() < self._sample_interval / 2
+        ):
+            # A refresh or push update just provided a sample
+            return
+
+        self._sampling = True
+        try:
+            data = await self.coordinator.client.async_get_status()
+        except BitaxeApiError:
+            return
+        finally:
+            self._sampling = False
+        self._async_add_sample(data.get("power"))
+
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Integrate the latest power reading into the running energy total."""
+        """Integrate the power reading of the latest refresh."""
+        if not self.coordinator.last_update_success:
+            # The data is still the last good payload, so there is no new
+            # reading; only the availability may have changed
+            self._async_write_state_if_due()
+            return
         data = self.coordinator.data
+        self._async_add_sample(data.get("power") if data else None)
+
+    @callback
+    def _async_add_sample(self, power: float | None) -> None:
+        """Integrate a power reading into the running energy total."""
         now = dt_util.utcnow()
-        power = data.get("power") if data else None
+        if power is not None:
+            if self._last_power is not None and self._last_update is not None:
+                if (now - self._last_update).total_seconds() <= ENERGY_MAX_GAP:
+                    self._energy_kwh += trapezoid(
+                        self._last_update, self._last_power, now, power
+                    )
+                else:
+                    self._gaps.append((self._last_update, self._last_power, now, power))
+            self._last_update = now
+            self._last_power = power
+        self._async_write_state_if_due()
 
+    @callback
+    def _async_fill_gaps(self, samples: PowerSamples) -> None:
+        """Integrate skipped intervals using the miner's power history."""
+        filled = 0.0
+        for gap in list(self._gaps):
+            if (parts := gap_energy(gap, samples)) is None:
+                continue
+            filled += sum(energy for _, energy in parts)
+            self._gaps.remove(gap)
+
+        if filled:
+            self._energy_kwh += filled
+            self._last_write = 0.0
+            self._async_write_state_if_due()
+
+    @callback
+    def _async_write_state_if_due(self) -> None:
+        """Write the state when availability changed or the interval passed."""
+        available = self.available
+        monotonic = time.monotonic()
         if (
-            power is not None
-            and self._last_power is not None
-            and self._last_update is not None
+            available != self._written_available
+            or monotonic - self._last_write >= ENERGY_WRITE_INTERVAL
         ):
-            elapsed_hours = (now - self._last_update).total_seconds() / 3600
-            if elapsed_hours > 0:
-                avg_power = (self._last_power + power) / 2
-                self._energy_kwh += (avg_power * elapsed_hours) / 1000
-
-        self._last_update = now
-        self._last_power = power
-        self.async_write_ha_state()
+            self._written_available = available
+            self._last_write = monotonic
+            self.async_write_ha_state()
 
     @property
     def native_value(self) -> float:
         """Return the accumulated energy in kWh."""
         return round(self._energy_kwh, 3)
+
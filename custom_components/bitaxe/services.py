@@ -0,0 +1,133 @@
+"""Services of the Bitaxe integration."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    ATTR_ALL,
+    ATTR_AUTO_FAN,
+    ATTR_CORE_VOLTAGE,
+    ATTR_FAN_SPEED,
+    ATTR_FREQUENCY,
+    ATTR_RESTART,
+    ATTR_TAG,
+    CONF_TAGS,
+    CONTROL_DATA_KEY,
+    CONTROL_MAX_CORE_VOLTAGE,
+    CONTROL_MAX_FREQUENCY,
+    CONTROL_MIN_CORE_VOLTAGE,
+    CONTROL_MIN_FREQUENCY,
+    DEFAULT_TAGS,
+    DOMAIN,
+    SERVICE_APPLY_SETTINGS,
+)
+from .control import BitaxeFleetControl
+from .coordinator import BitaxeDataUpdateCoordinator
+from .totals import parse_tags
+
+# Service fields and the AxeOS settings they change
+SETTING_KEYS = {
+    ATTR_FREQUENCY: "frequency",
+    ATTR_CORE_VOLTAGE: "coreVoltage",
+    ATTR_FAN_SPEED: "fanspeed",
+    ATTR_AUTO_FAN: "autofanspeed",
+}
+
+APPLY_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_TAG): cv.string,
+        vol.Optional(ATTR_ALL, default=False): cv.boolean,
+        # Each miner is also checked against the values it supports
+        vol.Optional(ATTR_FREQUENCY): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=CONTROL_MIN_FREQUENCY, max=CONTROL_MAX_FREQUENCY),
+        ),
+        vol.Optional(ATTR_CORE_VOLTAGE): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=CONTROL_MIN_CORE_VOLTAGE, max=CONTROL_MAX_CORE_VOLTAGE),
+        ),
+        vol.Optional(ATTR_FAN_SPEED): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional(ATTR_AUTO_FAN): cv.boolean,
+        vol.Optional(ATTR_RESTART, default=False): cv.boolean,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def _async_apply_settings(call: ServiceCall) -> ServiceResponse:
+        """Apply settings and/or a restart to the selected miners."""
+        settings: dict[str, Any] = {
+            key: int(call.data[field])
+            for field, key in SETTING_KEYS.items()
+            if field in call.data
+        }
+        restart: bool = call.data[ATTR_RESTART]
+        if not settings and not restart:
+            raise ServiceValidationError("Nothing to apply: give settings or restart")
+
+        device_ids, tag = call.data.get(ATTR_DEVICE_ID), call.data.get(ATTR_TAG)
+        # A call without a target must not change or restart the whole fleet
+        if not device_ids and tag is None and not call.data[ATTR_ALL]:
+            raise ServiceValidationError("No target: give miners, a tag or all")
+        if (device_ids or tag is not None) and call.data[ATTR_ALL]:
+            raise ServiceValidationError("Give either a target or all, not both")
+
+        coordinators = _async_targets(hass, device_ids, tag)
+        if not coordinators:
+            raise ServiceValidationError("No loaded Bitaxe miner matches the target")
+
+        control: BitaxeFleetControl = hass.data[CONTROL_DATA_KEY]
+        results = await control.async_apply(coordinators, settings, restart)
+        return {"results": {host: result.as_dict() for host, result in results.items()}}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SETTINGS,
+        _async_apply_settings,
+        schema=APPLY_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_targets(
+    hass: HomeAssistant, device_ids: list[str] | None, tag: str | None
+) -> list[BitaxeDataUpdateCoordinator]:
+    """Return the coordinators of the targeted miners, all if none are given."""
+    entry_ids: set[str] | None = None
+    if device_ids:
+        registry = dr.async_get(hass)
+        entry_ids = set()
+        for device_id in device_ids:
+            if (device := registry.async_get(device_id)) is not None:
+                entry_ids.update(device.config_entries)
+
+    coordinators = []
+    for entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+        if entry_ids is not None and entry_id not in entry_ids:
+            continue
+        if tag is not None:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if entry is None or tag not in parse_tags(
+                entry.options.get(CONF_TAGS, DEFAULT_TAGS)
+            ):
+                continue
+        coordinators.append(coordinator)
+    return coordinators
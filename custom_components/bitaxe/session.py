@@ -0,0 +1,109 @@
+"""Dedicated HTTP connection pool for Bitaxe miners."""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    CONNECTION_KEEPALIVE,
+    CONNECTION_LIMIT,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    SESSION_DATA_KEY,
+)
+
+
+@dataclass
+class BitaxeConnectionStats:
+    """Per-host counts of new and reused HTTP connections."""
+
+    created: Counter[str] = field(default_factory=Counter)
+    reused: Counter[str] = field(default_factory=Counter)
+
+    def as_dict(self, host: str) -> dict[str, int]:
+        """Return the counts for a single host."""
+        return {"created": self.created[host], "reused": self.reused[host]}
+
+
+@dataclass
+class BitaxeSession:
+    """Shared client session and its connection statistics."""
+
+    session: aiohttp.ClientSession
+    stats: BitaxeConnectionStats
+
+
+def _create_trace_config(stats: BitaxeConnectionStats) -> aiohttp.TraceConfig:
+    """Create a trace config that counts connection reuse per host."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        # Host and port, as the clients name their miner
+        context.host = params.url.raw_authority
+
+    async def on_connection_create_end(
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        _params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        stats.created[context.host] += 1
+
+    async def on_connection_reuseconn(
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        _params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        stats.reused[context.host] += 1
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace_config
+
+
+@callback
+def async_get_bitaxe_session(hass: HomeAssistant) -> BitaxeSession:
+    """Return the integration-wide session, creating it on first use.
+
+    The connector keeps one keep-alive connection per miner, caps the number
+    of connections across the fleet and caches DNS lookups of hostnames.
+    """
+    if (bitaxe_session := hass.data.get(SESSION_DATA_KEY)) is not None:
+        return bitaxe_session
+
+    stats = BitaxeConnectionStats()
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=CONNECTION_KEEPALIVE,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector, trace_configs=[_create_trace_config(stats)]
+    )
+    bitaxe_session = hass.data[SESSION_DATA_KEY] = BitaxeSession(session, stats)
+
+    @callback
+    def _async_close_session(_event: Event) -> None:
+        """Close the session when Home Assistant shuts down."""
+        if hass.data.get(SESSION_DATA_KEY) is bitaxe_session:
+            hass.async_create_task(async_close_bitaxe_session(hass))
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return bitaxe_session
+
+
+async def async_close_bitaxe_session(hass: HomeAssistant) -> None:
+    """Close the integration-wide session."""
+    if (bitaxe_session := hass.data.pop(SESSION_DATA_KEY, None)) is not None:
+        await bitaxe_session.session.close()
@@ -0,0 +1,63 @@
+"""Persisted payload snapshots for Bitaxe miners."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_SAVE_INTERVAL,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+
+
+class BitaxeSnapshotStore:
+    """Keep the last good /api/system/info payload of every entry on disk.
+
+    All entries share one storage file. A snapshot is saved at most once per
+    SNAPSHOT_SAVE_INTERVAL per entry, since it only needs to be recent enough
+    to create entities and device info on the next startup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY
+        )
+        self._snapshots: dict[str, dict[str, Any]] = {}
+        self._saved_at: dict[str, float] = {}
+
+    async def async_load(self) -> None:
+        """Load the snapshots from disk."""
+        self._snapshots = await self._store.async_load() or {}
+
+    @callback
+    def async_get(self, entry_id: str) -> dict[str, Any] | None:
+        """Return the snapshot of an entry, if any."""
+        return self._snapshots.get(entry_id)
+
+    @callback
+    def async_update(self, entry_id: str, data: dict[str, Any]) -> None:
+        """Remember a fresh payload and schedule a save when it is due."""
+        self._snapshots[entry_id] = data
+        now = time.monotonic()
+        if now - self._saved_at.get(entry_id, -SNAPSHOT_SAVE_INTERVAL) < SNAPSHOT_SAVE_INTERVAL:
+            return
+        self._saved_at[entry_id] = now
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the snapshot of a removed entry."""
+        if self._snapshots.pop(entry_id, None) is not None:
+            self._saved_at.pop(entry_id, None)
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to write to disk."""
+        return self._snapshots
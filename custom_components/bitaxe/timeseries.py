@@ -0,0 +1,234 @@
+"""Bounded in-memory time series of recent miner samples."""
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import deque
+from typing import Any
+
+from .const import HISTORY_COUNTERS, HISTORY_METRICS, HISTORY_MIN_SPACING, HISTORY_WINDOW
+
+
+class BitaxeRingBuffer:
+    """Fixed-capacity ring of timestamped samples with rolling statistics.
+
+    Samples live in two preallocated ``array("d")`` buffers, so memory does
+    not grow with the number of samples. Sum and sum of squares are kept
+    incrementally for O(1) mean and standard deviation; monotonic index
+    queues give amortized O(1) minimum and maximum.
+    """
+
+    __slots__ = (
+        "_end",
+        "_evictions",
+        "_max",
+        "_min",
+        "_start",
+        "_sum",
+        "_sum_sq",
+        "_times",
+        "_values",
+        "capacity",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        # Sequence numbers of the oldest sample and one past the newest
+        self._start = 0
+        self._end = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._min: deque[int] = deque()
+        self._max: deque[int] = deque()
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the buffer."""
+        return self._end - self._start
+
+    def _value(self, seq: int) -> float:
+        """Return the value of a sample by sequence number."""
+        return self._values[seq % self.capacity]
+
+    def append(self, when: float, value: float) -> None:
+        """Add a sample, dropping the oldest one when the buffer is full."""
+        if len(self) == self.capacity:
+            self._pop_oldest()
+
+        index = self._end % self.capacity
+        self._times[index] = when
+        self._values[index] = value
+        self._sum += value
+        self._sum_sq += value * value
+
+        while self._min and self._value(self._min[-1]) >= value:
+            self._min.pop()
+        self._min.append(self._end)
+        while self._max and self._value(self._max[-1]) <= value:
+            self._max.pop()
+        self._max.append(self._end)
+        self._end += 1
+
+    def evict_before(self, when: float) -> None:
+        """Drop samples taken before ``when``."""
+        while len(self) and self._times[self._start % self.capacity] < when:
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        """Drop the oldest sample."""
+        value = self._value(self._start)
+        self._sum -= value
+        self._sum_sq -= value * value
+        if self._min[0] == self._start:
+            self._min.popleft()
+        if self._max[0] == self._start:
+            self._max.popleft()
+        self._start += 1
+
+        # Recompute the running sums now and then so float errors don't add up
+        self._evictions += 1
+        if self._evictions >= self.capacity:
+            self._evictions = 0
+            values = [self._value(seq) for seq in range(self._start, self._end)]
+            self._sum = math.fsum(values)
+            self._sum_sq = math.fsum(value * value for value in values)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._start = self._end
+        self._sum = self._sum_sq = 0.0
+        self._min.clear()
+        self._max.clear()
+        self._evictions = 0
+
+    @property
+    def first(self) -> tuple[float, float] | None:
+        """Return the time and value of the oldest sample."""
+        if not len(self):
+            return None
+        index = self._start % self.capacity
+        return self._times[index], self._values[index]
+
+    @property
+    def last(self) -> tuple[float, float] | None:
+        """Return the time and value of the newest sample."""
+        if not len(self):
+            return None
+        index = (self._end - 1) % self.capacity
+        return self._times[index], self._values[index]
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples."""
+        return self._sum / len(self) if len(self) else None
+
+    @property
+    def min(self) -> float | None:
+        """Return the smallest sample."""
+        return self._value(self._min[0]) if self._min else None
+
+    @property
+    def max(self) -> float | None:
+        """Return the largest sample."""
+        return self._value(self._max[0]) if self._max else None
+
+    @property
+    def stddev(self) -> float | None:
+        """Return the population standard deviation of the samples."""
+        if not (count := len(self)):
+            return None
+        mean = self._sum / count
+        return math.sqrt(max(self._sum_sq / count - mean * mean, 0.0))
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return the rolling statistics."""
+        return {
+            "count": len(self),
+            "mean": _round(self.mean),
+            "min": self.min,
+            "max": self.max,
+            "stddev": _round(self.stddev),
+        }
+
+
+class BitaxeTimeSeries:
+    """Recent samples of the key metrics of one miner.
+
+    Each metric has its own ring buffer, so memory per miner is fixed.
+    Samples older than ``window`` seconds are dropped, so statistics cover
+    that window. The buffers hold at least ``capacity`` samples, and enough
+    to span the window when a sample is added every ``min_spacing`` seconds.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        window: float = HISTORY_WINDOW,
+        min_spacing: float = HISTORY_MIN_SPACING,
+    ) -> None:
+        """Initialize empty buffers."""
+        self.capacity = max(capacity, math.ceil(window / min_spacing) + 1)
+        self.window = window
+        self.metrics = {metric: BitaxeRingBuffer(self.capacity) for metric in HISTORY_METRICS}
+
+    def add(self, data: dict[str, Any], now: float | None = None) -> None:
+        """Record the metrics of a payload."""
+        if now is None:
+            now = time.monotonic()
+        for metric, buffer in self.metrics.items():
+            value = data.get(metric)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if (
+                    metric in HISTORY_COUNTERS
+                    and (last := buffer.last) is not None
+                    and value < last[1]
+                ):
+                    # The counter restarted with the miner
+                    buffer.clear()
+                buffer.append(now, value)
+            buffer.evict_before(now - self.window)
+
+    def rate(self, metric: str) -> float | None:
+        """Return the per-minute increase of a counter over the window."""
+        buffer = self.metrics[metric]
+        if (first := buffer.first) is None or (last := buffer.last) is None:
+            return None
+        if (elapsed := last[0] - first[0]) <= 0:
+            return None
+        return (last[1] - first[1]) / elapsed * 60
+
+    @property
+    def shares_per_minute(self) -> float | None:
+        """Return accepted shares per minute."""
+        return _round(self.rate("sharesAccepted"))
+
+    @property
+    def reject_ratio(self) -> float | None:
+        """Return rejected shares as a percentage of all shares."""
+        accepted = self.rate("sharesAccepted")
+        rejected = self.rate("sharesRejected")
+        if accepted is None or rejected is None or not accepted + rejected:
+            return None
+        return _round(rejected / (accepted + rejected) * 100)
+
+    @property
+    def efficiency(self) -> float | None:
+        """Return the mean efficiency in J/TH over the window."""
+        power = self.metrics["power"].mean
+        hashrate = self.metrics["hashRate"].mean
+        if power is None or not hashrate or hashrate <= 0:
+            return None
+        return _round(power / (hashrate / 1000))
+
+    def as_dict(self) -> dict[str, dict[str, float | int | None]]:
+        """Return the rolling statistics per metric."""
+        return {metric: buffer.as_dict() for metric, buffer in self.metrics.items()}
+
+
+def _round(value: float | None) -> float | None:
+    """Round a statistic for display."""
+    return round(value, 2) if value is not None else None
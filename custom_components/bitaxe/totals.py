@@ -0,0 +1,188 @@
+"""Running totals across all configured Bitaxe miners."""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import FLEET_TOTALS_DELAY, FLEET_TOTALS_RESUM_UPDATES
+from .coordinator import BitaxeDataUpdateCoordinator
+
+
+@dataclass
+class BitaxeTotals:
+    """Summed metrics of a group of miners."""
+
+    hash_rate: float = 0.0
+    power: float = 0.0
+    shares_accepted: int = 0
+    shares_rejected: int = 0
+    blocks_found: int = 0
+    online: int = 0
+    miners: int = 0
+
+    @property
+    def efficiency(self) -> float | None:
+        """Return the combined efficiency in J/TH."""
+        if not self.online or self.hash_rate <= 0:
+            return None
+        return round(self.power / (self.hash_rate / 1000), 2)
+
+    def add(self, other: BitaxeTotals, sign: int = 1) -> None:
+        """Add (or with ``sign=-1`` subtract) another set of totals."""
+        for field in fields(self):
+            setattr(
+                self, field.name, getattr(self, field.name) + sign * getattr(other, field.name)
+            )
+
+    def clear(self) -> None:
+        """Reset all metrics to zero."""
+        for field in fields(self):
+            setattr(self, field.name, field.default)
+
+
+def _contribution(coordinator: BitaxeDataUpdateCoordinator) -> BitaxeTotals:
+    """Return what a single miner adds to the totals."""
+    data = coordinator.data or {}
+    online = coordinator.last_update_success and bool(data)
+    return BitaxeTotals(
+        # Only miners that answered add to the current rates
+        hash_rate=(data.get("hashRate") or 0.0) if online else 0.0,
+        power=(data.get("power") or 0.0) if online else 0.0,
+        # Counters keep the last known value so totals don't drop while a
+        # miner is briefly unreachable
+        shares_accepted=data.get("sharesAccepted") or 0,
+        shares_rejected=data.get("sharesRejected") or 0,
+        blocks_found=data.get("blockFound") or data.get("foundBlocks") or 0,
+        online=int(online),
+        miners=1,
+    )
+
+
+class BitaxeFleetTotals:
+    """Keep fleet totals up to date from each miner's refreshes.
+
+    Every miner's last contribution is remembered, so a refresh only
+    applies the difference to the totals of the fleet and of each of the
+    miner's tags instead of summing all miners again. Rounding errors of
+    the float sums would add up over time, so all contributions are summed
+    again when a miner is added or removed and after every
+    FLEET_TOTALS_RESUM_UPDATES incremental updates. Listeners are
+    notified at most once per FLEET_TOTALS_DELAY, so a fleet poll cycle
+    results in a single update of the fleet sensors.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize empty totals."""
+        self.hass = hass
+        # Keyed by tag; None holds the totals of the whole fleet
+        self.totals: dict[str | None, BitaxeTotals] = {None: BitaxeTotals()}
+        self._miners: dict[str, tuple[BitaxeTotals, tuple[str, ...]]] = {}
+        self._updates = 0
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_notify: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_miner(
+        self,
+        entry_id: str,
+        coordinator: BitaxeDataUpdateCoordinator,
+        tags: tuple[str, ...] = (),
+    ) -> CALLBACK_TYPE:
+        """Start adding a miner to the totals; returns a callback to remove it."""
+
+        @callback
+        def _async_update() -> None:
+            self._async_apply(entry_id, _contribution(coordinator), tags)
+
+        @callback
+        def _async_remove() -> None:
+            unsub()
+            if self._miners.pop(entry_id, None) is not None:
+                self._async_resum()
+                self._async_schedule_notify()
+
+        _async_update()
+        unsub = coordinator.async_add_listener(_async_update)
+        return _async_remove
+
+    @callback
+    def _async_apply(
+        self, entry_id: str, contribution: BitaxeTotals, tags: tuple[str, ...]
+    ) -> None:
+        """Replace a miner's previous contribution with a new one."""
+        previous = self._miners.get(entry_id)
+        if previous is not None and previous[0] == contribution:
+            return
+        self._miners[entry_id] = (contribution, tags)
+        self._updates += 1
+        if previous is None or self._updates >= FLEET_TOTALS_RESUM_UPDATES:
+            self._async_resum()
+        else:
+            self._async_change(previous[0], previous[1], -1)
+            self._async_change(contribution, tags, 1)
+        self._async_schedule_notify()
+
+    @callback
+    def _async_resum(self) -> None:
+        """Sum the contributions of all miners again."""
+        self._updates = 0
+        # Cleared in place, tags without miners left keep empty totals
+        for totals in self.totals.values():
+            totals.clear()
+        for contribution, tags in self._miners.values():
+            self._async_change(contribution, tags, 1)
+
+    @callback
+    def _async_change(
+        self, contribution: BitaxeTotals, tags: tuple[str, ...], sign: int
+    ) -> None:
+        """Apply a contribution to the fleet and tag totals."""
+        for key in (None, *tags):
+            if (totals := self.totals.get(key)) is None:
+                totals = self.totals[key] = BitaxeTotals()
+            totals.add(contribution, sign)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for changes of the totals."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_schedule_notify(self) -> None:
+        """Notify the listeners shortly, coalescing changes of many miners."""
+        if self._unsub_notify is None and self._listeners:
+            self._unsub_notify = async_call_later(
+                self.hass, FLEET_TOTALS_DELAY, self._async_notify
+            )
+
+    @callback
+    def _async_notify(self, _now: Any) -> None:
+        """Notify the listeners."""
+        self._unsub_notify = None
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the totals per tag."""
+        return {
+            key or "fleet": {
+                **{field.name: getattr(totals, field.name) for field in fields(totals)},
+                "efficiency": totals.efficiency,
+            }
+            for key, totals in self.totals.items()
+        }
+
+
+def parse_tags(value: str) -> tuple[str, ...]:
+    """Return the tags of a comma separated option value."""
+    return tuple(dict.fromkeys(tag.strip() for tag in value.split(",") if tag.strip()))
+
@@ -0,0 +1,321 @@
+"""Frequency and voltage search for the most efficient stable setting.
+
+This module imports nothing from Home Assistant or the rest of the
+integration, so the search can be run offline against
+``BitaxeSimulatedMiner``. Limits are passed in by the caller.
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Generator, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Frequency (MHz) and core voltage (mV)
+TuningPoint = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class TuningBounds:
+    """Limits a setting has to stay within to be accepted."""
+
+    max_temp: float
+    max_power: float | None
+    max_vr_temp: float
+    # Stable: at least this share of the expected hash rate, with a
+    # coefficient of variation of at most max_hashrate_cv
+    min_hashrate_ratio: float
+    max_hashrate_cv: float
+
+
+@dataclass(frozen=True)
+class TuningMeasurement:
+    """Telemetry measured over the stable window of one setting."""
+
+    frequency: int
+    core_voltage: int
+    # Mean hash rate (GH/s) and power (W) over the window
+    hashrate: float
+    power: float
+    # Highest temperatures seen during the window
+    temp: float
+    vr_temp: float | None
+    expected_hashrate: float
+    # Coefficient of variation of the hash rate samples
+    hashrate_cv: float
+    # Set when the setting was abandoned for exceeding a bound
+    aborted: bool = False
+
+    @property
+    def efficiency(self) -> float:
+        """Return the efficiency in J/TH."""
+        if self.hashrate <= 0:
+            return float("inf")
+        return self.power / (self.hashrate / 1000)
+
+    def within_bounds(self, bounds: TuningBounds) -> bool:
+        """Return True if thermal and power limits were respected."""
+        return (
+            not self.aborted
+            and self.temp <= bounds.max_temp
+            and (self.vr_temp is None or self.vr_temp <= bounds.max_vr_temp)
+            and (bounds.max_power is None or self.power <= bounds.max_power)
+        )
+
+    def stable(self, bounds: TuningBounds) -> bool:
+        """Return True if the ASIC hashed as expected at this setting."""
+        return (
+            self.expected_hashrate > 0
+            and self.hashrate >= bounds.min_hashrate_ratio * self.expected_hashrate
+            and self.hashrate_cv <= bounds.max_hashrate_cv
+        )
+
+    def acceptable(self, bounds: TuningBounds) -> bool:
+        """Return True if the setting may be used."""
+        return self.within_bounds(bounds) and self.stable(bounds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the measurement as plain data."""
+        return {
+            **asdict(self),
+            "efficiency": None if self.hashrate <= 0 else round(self.efficiency, 2),
+        }
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> TuningMeasurement:
+        """Build a measurement from its stored form."""
+        stored = dict(stored)
+        stored.pop("efficiency", None)
+        return cls(**stored)
+
+
+def tuning_grid(
+    options: Sequence[int] | None,
+    current: int,
+    step: int,
+    spread: int,
+    limits: tuple[int, int] | None = None,
+) -> list[int]:
+    """Return the values to search, spanning the supported options if known.
+
+    Without options the values around ``current`` are kept within
+    ``limits``, the lowest and highest value that may be sent.
+    """
+    if options:
+        low, high = min(options), max(options)
+    else:
+        low, high = current - spread, current + spread
+        if limits is not None:
+            low, high = max(low, limits[0]), min(high, limits[1])
+    return sorted({*range(low, high + 1, step), current})
+
+
+class TuningSearch:
+    """Find the most efficient stable frequency and voltage.
+
+    For each frequency the lowest stable core voltage is searched, since a
+    lower voltage at the same frequency always saves power. Starting from
+    the current setting, frequencies are stepped up until a limit is hit
+    (each step starting at the voltage found for the previous one), then
+    down while efficiency keeps improving by more than
+    ``efficiency_tolerance``. Every measured setting is kept;
+    the result is the most efficient point of the Pareto front of hash rate
+    against efficiency.
+    """
+
+    def __init__(
+        self,
+        frequencies: Sequence[int],
+        voltages: Sequence[int],
+        start: TuningPoint,
+        bounds: TuningBounds,
+        max_steps: int,
+        efficiency_tolerance: float,
+    ) -> None:
+        """Initialize the search."""
+        self.frequencies = sorted(frequencies)
+        self.voltages = sorted(voltages)
+        self.start = start
+        self.bounds = bounds
+        self.max_steps = max_steps
+        self.efficiency_tolerance = efficiency_tolerance
+        self.history: list[TuningMeasurement] = []
+        self._pending: TuningPoint | None = None
+        self._search = self._run()
+        self._advance(None)
+
+    @property
+    def done(self) -> bool:
+        """Return True once no further setting needs to be measured."""
+        return self._pending is None
+
+    def next_point(self) -> TuningPoint | None:
+        """Return the setting to measure next, None when done."""
+        return self._pending
+
+    def record(self, measurement: TuningMeasurement) -> None:
+        """Record the measurement of the pending setting."""
+        self.history.append(measurement)
+        if len(self.history) >= self.max_steps:
+            self._search.close()
+            self._pending = None
+            return
+        self._advance(measurement)
+
+    def _advance(self, measurement: TuningMeasurement | None) -> None:
+        """Run the search until it needs the next measurement."""
+        try:
+            self._pending = (
+                next(self._search)
+                if measurement is None
+                else self._search.send(measurement)
+            )
+        except StopIteration:
+            self._pending = None
+
+    @property
+    def pareto(self) -> list[TuningMeasurement]:
+        """Return the acceptable settings no other setting beats on both goals."""
+        accepted = [m for m in self.history if m.acceptable(self.bounds)]
+        return sorted(
+            (
+                m
+                for m in accepted
+                if not any(
+                    other.hashrate >= m.hashrate
+                    and other.efficiency <= m.efficiency
+                    and (other.hashrate > m.hashrate or other.efficiency < m.efficiency)
+                    for other in accepted
+                )
+            ),
+            key=lambda m: m.frequency,
+        )
+
+    @property
+    def best(self) -> TuningMeasurement | None:
+        """Return the most efficient acceptable setting."""
+        return min(
+            self.pareto, key=lambda m: (m.efficiency, -m.hashrate), default=None
+        )
+
+    def _run(self) -> Generator[TuningPoint, TuningMeasurement]:
+        """Yield settings to measure, receiving their measurements."""
+        frequencies, voltages = self.frequencies, self.voltages
+        start_f = _nearest_index(frequencies, self.start[0])
+        start_v = _nearest_index(voltages, self.start[1])
+
+        start = yield from self._lowest_stable(start_f, start_v)
+        if start is None:
+            return
+
+        # Up in frequency, until no voltage within the limits is stable
+        v_index = voltages.index(start.core_voltage)
+        for f_index in range(start_f + 1, len(frequencies)):
+            found = yield from self._lowest_stable(f_index, v_index)
+            if found is None:
+                break
+            v_index = voltages.index(found.core_voltage)
+
+        # Down in frequency, while the efficiency improves
+        best_efficiency = start.efficiency
+        v_index = voltages.index(start.core_voltage)
+        for f_index in range(start_f - 1, -1, -1):
+            found = yield from self._lowest_stable(f_index, v_index)
+            if found is None or found.efficiency > best_efficiency * (
+                1 + self.efficiency_tolerance
+            ):
+                break
+            best_efficiency = min(best_efficiency, found.efficiency)
+            v_index = voltages.index(found.core_voltage)
+
+    def _lowest_stable(
+        self, f_index: int, v_index: int
+    ) -> Generator[TuningPoint, TuningMeasurement, TuningMeasurement | None]:
+        """Search the lowest acceptable voltage of a frequency from a voltage."""
+        frequency, voltages, bounds = self.frequencies[f_index], self.voltages, self.bounds
+        measurement = yield frequency, voltages[v_index]
+        if measurement.acceptable(bounds):
+            lowest = measurement
+            while v_index > 0:
+                v_index -= 1
+                measurement = yield frequency, voltages[v_index]
+                if not measurement.acceptable(bounds):
+                    break
+                lowest = measurement
+            return lowest
+
+        while measurement.within_bounds(bounds) and v_index < len(voltages) - 1:
+            # Unstable: more voltage, unless that would break a limit
+            v_index += 1
+            measurement = yield frequency, voltages[v_index]
+            if measurement.acceptable(bounds):
+                return measurement
+        return None
+
+
+def _nearest_index(values: Sequence[int], value: int) -> int:
+    """Return the index of the value closest to ``value``."""
+    return min(range(len(values)), key=lambda index: abs(values[index] - value))
+
+
+@dataclass
+class BitaxeSimulatedMiner:
+    """Simple physical model of a miner, for running the search offline.
+
+    The core needs a minimum voltage that rises linearly with frequency;
+    below it, hash rate falls off and gets noisy. Power is a static part
+    plus a dynamic part proportional to frequency times voltage squared,
+    and temperatures follow power through a thermal resistance. The
+    defaults resemble a single BM1370 board.
+    """
+
+    small_cores: int = 2040
+    asic_count: int = 1
+    # Minimum stable voltage (mV) is voltage_offset + voltage_slope * MHz
+    voltage_offset: float = 750.0
+    voltage_slope: float = 0.75
+    # Hash rate is lost completely this many mV below the minimum voltage
+    voltage_margin: float = 50.0
+    static_power: float = 5.0
+    # W per MHz and mV squared, per ASIC
+    dynamic_power: float = 1.9e-8
+    ambient: float = 25.0
+    # °C per W, for the ASIC and the voltage regulator
+    thermal_resistance: float = 1.9
+    vr_thermal_resistance: float = 1.5
+    # Relative noise of the window means
+    noise: float = 0.01
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        """Seed the noise."""
+        self._rng = random.Random(self.seed)
+
+    def measure(self, frequency: int, core_voltage: int) -> TuningMeasurement:
+        """Return the telemetry of a stable window at a setting."""
+        expected = frequency * self.small_cores * self.asic_count / 1000
+        required = self.voltage_offset + self.voltage_slope * frequency
+        shortfall = max(required - core_voltage, 0.0)
+        yield_ = max(0.0, 1 - shortfall / self.voltage_margin)
+        hashrate = expected * yield_ * (1 + self._rng.gauss(0, self.noise))
+        power = (
+            self.static_power
+            + self.dynamic_power * frequency * core_voltage**2 * self.asic_count
+        ) * (1 + self._rng.gauss(0, self.noise / 2))
+        return TuningMeasurement(
+            frequency=frequency,
+            core_voltage=core_voltage,
+            hashrate=max(hashrate, 0.0),
+            power=power,
+            temp=self.ambient + self.thermal_resistance * power / self.asic_count,
+            vr_temp=self.ambient + self.vr_thermal_resistance * power,
+            expected_hashrate=expected,
+            hashrate_cv=self.noise + (1 - yield_) * 0.5,
+        )
+
+
+def simulate(search: TuningSearch, miner: BitaxeSimulatedMiner) -> TuningMeasurement | None:
+    """Run a search against a simulated miner and return the chosen setting."""
+    while (point := search.next_point()) is not None:
+        search.record(miner.measure(*point))
+    return search.best
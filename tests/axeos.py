@@ -0,0 +1,113 @@
+"""Stand-in AxeOS miner for tests, serving the API and the log stream."""
+from __future__ import annotations
+
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+def system_info(**changes: Any) -> dict[str, Any]:
+    """Return a /api/system/info payload of a single-ASIC miner."""
+    return {
+        "ASICModel": "BM1370",
+        "asicCount": 1,
+        "bestDiff": "4.29G",
+        "bestSessionDiff": "1.02G",
+        "coreVoltage": 1150,
+        "current": 9500.0,
+        "expectedHashrate": 500.0,
+        "fanrpm": 4000,
+        "fanspeed": 60,
+        "frequency": 525,
+        "hashRate": 498.2,
+        "hostname": "bitaxe",
+        "macAddr": "02:ba:00:00:00:01",
+        "overheat_mode": 0,
+        "power": 15.2,
+        "sharesAccepted": 100,
+        "sharesRejected": 1,
+        "temp": 55.0,
+        "temptarget": 60,
+        "uptimeSeconds": 3600,
+        "version": "v2.5.0",
+        "voltage": 5050.0,
+        "vrTemp": 50,
+        **changes,
+    }
+
+
+class StandInAxeOS:
+    """A miner answering /api/system/info and streaming its log on /api/ws.
+
+    Settings sent to /api/system are recorded and applied to the payload.
+    Other endpoints answer 404, like firmware without them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with a healthy miner."""
+        self.info = system_info()
+        self.info_requests = 0
+        # Settings received, in order
+        self.settings: list[dict[str, Any]] = []
+        # Drop connections without answering, like a miner losing power
+        self.offline = False
+        self.websockets: list[web.WebSocketResponse] = []
+        app = web.Application()
+        app.router.add_get("/api/system/info", self._handle_info)
+        app.router.add_patch("/api/system", self._handle_settings)
+        app.router.add_get("/api/ws", self._handle_websocket)
+        self._server = TestServer(app, host="127.0.0.1")
+
+    @property
+    def host(self) -> str:
+        """Return the host the integration connects to."""
+        return f"127.0.0.1:{self._server.port}"
+
+    async def async_start(self) -> None:
+        """Start listening on a free port."""
+        await self._server.start_server()
+
+    async def async_stop(self) -> None:
+        """Close the log streams and stop listening."""
+        await self.async_close_websockets()
+        await self._server.close()
+
+    async def async_send(self, message: str) -> None:
+        """Send a message to every connected log stream."""
+        for ws in self.websockets:
+            await ws.send_str(message)
+
+    async def async_close_websockets(self) -> None:
+        """Drop the log streams, like a miner restarting."""
+        for ws in list(self.websockets):
+            await ws.close()
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        """Serve the current payload."""
+        self.info_requests += 1
+        if self.offline:
+            request.transport.close()
+        return web.json_response(self.info)
+
+    async def _handle_settings(self, request: web.Request) -> web.Response:
+        """Apply new settings to the payload."""
+        if self.offline:
+            request.transport.close()
+            return web.Response(text="OK")
+        settings = await request.json()
+        self.settings.append(settings)
+        self.info.update(settings)
+        return web.Response(text="OK")
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """Keep a log stream open until either side closes it."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.websockets.append(ws)
+        try:
+            async for _msg in ws:
+                pass
+        finally:
+            self.websockets.remove(ws)
+        return ws
@@ -0,0 +1,22 @@
+"""Fixtures for the Bitaxe tests."""
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from .axeos import StandInAxeOS
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components in every test."""
+
+
+@pytest.fixture
+async def axeos(socket_enabled: None) -> AsyncGenerator[StandInAxeOS]:
+    """Return a stand-in miner listening on the loopback interface."""
+    miner = StandInAxeOS()
+    await miner.async_start()
+    yield miner
+    await miner.async_stop()
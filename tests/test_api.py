@@ -0,0 +1,229 @@
+"""Tests for the Bitaxe API client and its circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.bitaxe import api
+from custom_components.bitaxe.api import (
+    BitaxeApiClient,
+    BitaxeCircuitBreaker,
+    BitaxeCircuitOpenError,
+    BitaxeConnectionError,
+    BitaxeRequestCache,
+)
+from custom_components.bitaxe.const import (
+    BREAKER_BACKOFF_MAX,
+    BREAKER_BACKOFF_MIN,
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    LATENCY_MIN_SAMPLES,
+    REQUEST_TIMEOUT,
+    REQUEST_TIMEOUT_MIN,
+    RESPONSE_CACHE_TTL,
+)
+
+from .axeos import StandInAxeOS
+
+
+class FakeClock:
+    """Stand-in for the time module as seen by the API client."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary moment."""
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the API module only."""
+    clock = FakeClock()
+    monkeypatch.setattr(api, "time", clock)
+    return clock
+
+
+def test_breaker_opens_and_backs_off(clock: FakeClock) -> None:
+    """Consecutive failures open the circuit; failed retries double the backoff."""
+    breaker = BitaxeCircuitBreaker()
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+        assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_in == BREAKER_BACKOFF_MIN
+
+    clock.now += BREAKER_BACKOFF_MIN
+    assert breaker.allow_request()
+    assert breaker.state == BREAKER_HALF_OPEN
+    # Only one probe at a time, unless it never reports back
+    assert not breaker.allow_request()
+    clock.now += REQUEST_TIMEOUT
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.backoff == BREAKER_BACKOFF_MIN * 2
+
+    for _ in range(10):
+        clock.now += breaker.backoff
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.backoff == BREAKER_BACKOFF_MAX
+
+    clock.now += breaker.backoff
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.failures == 0
+    assert breaker.backoff == BREAKER_BACKOFF_MIN
+
+
+@pytest.mark.parametrize(
+    ("latency", "samples", "expected"),
+    [
+        (0.5, LATENCY_MIN_SAMPLES - 1, REQUEST_TIMEOUT),
+        (0.1, LATENCY_MIN_SAMPLES, REQUEST_TIMEOUT_MIN),
+        (1.5, LATENCY_MIN_SAMPLES, 4.5),
+        (8.0, LATENCY_MIN_SAMPLES, REQUEST_TIMEOUT),
+    ],
+)
+def test_breaker_timeout_follows_latency(
+    latency: float, samples: int, expected: float
+) -> None:
+    """The timeout is the p99 latency times the margin, within bounds."""
+    breaker = BitaxeCircuitBreaker()
+    for _ in range(samples):
+        breaker.record_success(latency)
+    assert breaker.timeout == expected
+
+
+async def test_client_fails_fast_while_unreachable(
+    hass: HomeAssistant,
+    axeos: StandInAxeOS,
+    clock: FakeClock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """An unreachable miner is not contacted until the backoff has passed."""
+    client = BitaxeApiClient(axeos.host, async_get_clientsession(hass))
+    axeos.offline = True
+
+    with caplog.at_level(logging.DEBUG, logger=api.__name__):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(BitaxeConnectionError):
+                await client.async_get_system_info()
+        requests = axeos.info_requests
+        with pytest.raises(BitaxeCircuitOpenError):
+            await client.async_get_system_info()
+        # Writes fail the same way, without logging another error
+        with pytest.raises(BitaxeCircuitOpenError):
+            await client.async_restart()
+        clock.now += BREAKER_BACKOFF_MIN
+        with pytest.raises(BitaxeConnectionError):
+            await client.async_update_settings({"fanspeed": 80})
+    assert axeos.info_requests == requests
+    assert axeos.settings == []
+    # Logged once, then reminded once per backoff
+    levels = [r.levelno for r in caplog.records]
+    assert levels.count(logging.ERROR) == 1
+    assert levels.count(logging.WARNING) == 1
+    assert levels.index(logging.WARNING) == len(levels) - 1
+
+    axeos.offline = False
+    clock.now += client.breaker.backoff
+    caplog.clear()
+    assert (await client.async_get_system_info())["hashRate"] == axeos.info["hashRate"]
+    assert client.breaker.state == BREAKER_CLOSED
+    assert "reachable again" in caplog.text
+
+
+class FakeFetch:
+    """A request that returns only when released, counting its calls."""
+
+    def __init__(self) -> None:
+        """Start blocked."""
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def __call__(self) -> dict:
+        """Wait for the release, then answer with the call number."""
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {"call": call}
+
+
+async def test_cache_coalesces_concurrent_requests(clock: FakeClock) -> None:
+    """Callers asking at the same time share one request."""
+    cache = BitaxeRequestCache()
+    fetch = FakeFetch()
+    callers = [
+        asyncio.ensure_future(cache.async_get("miner", "/api/system/info", fetch))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    # A cancelled caller does not cancel the request of the others
+    callers[0].cancel()
+    fetch.release.set()
+    assert await asyncio.gather(*callers[1:]) == [{"call": 1}, {"call": 1}]
+    assert fetch.calls == 1
+    assert cache.as_dict("miner") == {"requests": 1, "hits": 0, "coalesced": 2}
+
+    # Other endpoints and miners are separate
+    await cache.async_get("other", "/api/system/info", fetch)
+    await cache.async_get("miner", "/api/system/asic", fetch)
+    assert fetch.calls == 3
+
+
+async def test_cache_expires_after_ttl(clock: FakeClock) -> None:
+    """A response is reused for the TTL; failures are not cached."""
+    cache = BitaxeRequestCache()
+    fetch = FakeFetch()
+    fetch.release.set()
+    assert await cache.async_get("miner", "/api/system/info", fetch) == {"call": 1}
+    clock.now += RESPONSE_CACHE_TTL - 0.1
+    assert await cache.async_get("miner", "/api/system/info", fetch) == {"call": 1}
+    assert cache.hits["miner"] == 1
+
+    clock.now += 0.1
+    fetch.error = BitaxeConnectionError("unreachable")
+    with pytest.raises(BitaxeConnectionError):
+        await cache.async_get("miner", "/api/system/info", fetch)
+    fetch.error = None
+    assert await cache.async_get("miner", "/api/system/info", fetch) == {"call": 3}
+
+
+async def test_cache_invalidate(clock: FakeClock) -> None:
+    """Invalidating drops cached responses and those of running requests."""
+    cache = BitaxeRequestCache()
+    fetch = FakeFetch()
+    fetch.release.set()
+    await cache.async_get("miner", "/api/system/info", fetch)
+    cache.invalidate("other")
+    assert await cache.async_get("miner", "/api/system/info", fetch) == {"call": 1}
+    cache.invalidate("miner")
+    assert await cache.async_get("miner", "/api/system/info", fetch) == {"call": 2}
+
+    # A request running while a setting changes may return the old value
+    fetch.release.clear()
+    running = asyncio.ensure_future(cache.async_get("miner", "/api/system/asic", fetch))
+    await asyncio.sleep(0)
+    cache.invalidate("miner")
+    fresh = asyncio.ensure_future(cache.async_get("miner", "/api/system/asic", fetch))
+    await asyncio.sleep(0)
+    fetch.release.set()
+    assert await running == {"call": 3}
+    assert await fresh == {"call": 4}
+    assert await cache.async_get("miner", "/api/system/asic", fetch) == {"call": 4}
@@ -0,0 +1,64 @@
+"""Tests for the autotuner driving a search on a miner."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bitaxe.api import BitaxeApiClient
+from custom_components.bitaxe.autotune import BitaxeAutotuner, BitaxeAutotuneStore
+from custom_components.bitaxe.const import (
+    AUTOTUNE_FAILED,
+    AUTOTUNE_SETTLING,
+    CONTROL_MAX_CORE_VOLTAGE,
+    DOMAIN,
+)
+from custom_components.bitaxe.control import BitaxeFleetControl
+from custom_components.bitaxe.coordinator import BitaxeDataUpdateCoordinator
+
+from .axeos import StandInAxeOS, system_info
+
+
+async def _autotuner(
+    hass: HomeAssistant, host: str, adaptive_bounds: tuple[int, int] | None = None
+) -> BitaxeAutotuner:
+    """Return an autotuner of a coordinator that has refreshed a payload."""
+    entry = MockConfigEntry(domain=DOMAIN, title="bitaxe")
+    entry.add_to_hass(hass)
+    client = BitaxeApiClient(host, async_get_clientsession(hass))
+    coordinator = BitaxeDataUpdateCoordinator(hass, client, adaptive_bounds)
+    coordinator.async_set_updated_data(system_info())
+    store = BitaxeAutotuneStore(hass)
+    await store.async_load()
+    return BitaxeAutotuner(
+        hass, entry, coordinator, BitaxeFleetControl(hass, min_interval=0), store
+    )
+
+
+async def test_window_fits_shortest_interval(hass: HomeAssistant) -> None:
+    """The measurement window holds a sample of every refresh."""
+    autotuner = await _autotuner(hass, "bitaxe.invalid")
+    assert autotuner._hashrate.capacity == 20
+    autotuner = await _autotuner(hass, "bitaxe.invalid", (10, 120))
+    assert autotuner._power.capacity == 60
+
+
+async def test_applied_setting_starts_empty(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Readings of the previous setting do not count for the next one."""
+    autotuner = await _autotuner(hass, axeos.host)
+    await autotuner.async_start()
+    assert autotuner.status == AUTOTUNE_SETTLING
+    autotuner._hashrate.append(0.0, 500.0)
+    autotuner._max_temp = 70.0
+
+    assert await autotuner._async_apply((550, 1150))
+    assert len(autotuner._hashrate) == 0
+    assert autotuner._max_temp == 0.0
+    assert axeos.settings[-1] == {"frequency": 550, "coreVoltage": 1150}
+
+    # A setting outside the limits is not sent and ends the run
+    assert not await autotuner._async_apply((550, CONTROL_MAX_CORE_VOLTAGE + 10))
+    assert autotuner.status == AUTOTUNE_FAILED
+    assert axeos.settings[-1] == {"frequency": 550, "coreVoltage": 1150}
@@ -0,0 +1,65 @@
+"""Tests for the statistics backfill from the miner's history."""
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from custom_components.bitaxe.backfill import gap_energy, iter_history
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def test_iter_history_uses_miner_clock() -> None:
+    """Timestamps count from boot and are placed relative to the response."""
+    payload = {
+        "currentTimestamp": 600_000,
+        "statistics": [
+            [500.0, 55.0, 15.0, 0],
+            [510.0, 56.0, 15.5, 300_000],
+            # Malformed rows are skipped
+            [520.0, 57.0, 16.0],
+            [530.0, 58.0, 16.5, "later"],
+            "row",
+        ],
+    }
+    rows = list(iter_history(payload, NOW))
+    assert [row["time"] for row in rows] == [
+        NOW - timedelta(minutes=10),
+        NOW - timedelta(minutes=5),
+    ]
+    assert rows[1] == {
+        "hashrate": 510.0,
+        "asicTemp": 56.0,
+        "power": 15.5,
+        "timestamp": 300_000,
+        "time": NOW - timedelta(minutes=5),
+    }
+
+
+def test_iter_history_labels() -> None:
+    """Columns named by the response replace the defaults."""
+    payload = {
+        "labels": ["timestamp", "power"],
+        "statistics": [[1_714_564_800_000, 14.0]],
+    }
+    # Without the current timestamp the miner's clock is taken as wall time
+    assert list(iter_history(payload, NOW)) == [
+        {"timestamp": 1_714_564_800_000, "power": 14.0, "time": NOW}
+    ]
+    payload["labels"] = ["hashrate", "power"]
+    assert list(iter_history(payload, NOW)) == []
+
+
+def test_gap_energy() -> None:
+    """Only the parts of a gap covered by history count."""
+    start, end = NOW, NOW + timedelta(hours=2)
+    gap = (start, 10.0, end, 10.0)
+    assert gap_energy(gap, [(start - timedelta(minutes=1), 10.0)]) is None
+
+    # An hour of history, then the miner was off for the second one
+    samples = [(start + timedelta(minutes=minute), 10.0) for minute in range(0, 61, 5)]
+    parts = gap_energy(gap, samples)
+    assert parts is not None
+    assert max(when for when, _ in parts) == start + timedelta(minutes=55)
+    assert sum(energy for _, energy in parts) == pytest.approx(0.01)
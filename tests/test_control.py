@@ -0,0 +1,100 @@
+"""Tests for settings changes of many miners."""
+from __future__ import annotations
+
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bitaxe.const import (
+    CONF_HOST,
+    CONF_TAGS,
+    CONTROL_DATA_KEY,
+    CONTROL_MAX_CORE_VOLTAGE,
+    CONTROL_MIN_CORE_VOLTAGE,
+    DOMAIN,
+    SERVICE_APPLY_SETTINGS,
+    TIER_STATIC,
+)
+
+from .axeos import StandInAxeOS
+
+
+async def test_apply_settings_within_limits(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Settings above what a miner lists are reported, not sent."""
+    entry = MockConfigEntry(domain=DOMAIN, title="bitaxe", data={CONF_HOST: axeos.host})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    hass.data[CONTROL_DATA_KEY].min_interval = 0
+    # As listed in /api/system/asic, which the stand-in does not serve
+    coordinator.tiers[TIER_STATIC].data = {"frequencyOptions": [400, 490, 525, 575]}
+
+    async def _async_apply(**data: int) -> dict:
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_APPLY_SETTINGS,
+            {"all": True, **data},
+            blocking=True,
+            return_response=True,
+        )
+        return response["results"][axeos.host]
+
+    assert await _async_apply(frequency=600) == {
+        "success": False,
+        "error": "frequency 600 is above the maximum of 575",
+    }
+    assert await _async_apply(frequency=300) == {
+        "success": False,
+        "error": "frequency 300 is below the minimum of 400",
+    }
+    # The voltage has no listed values, so the hard maximum applies
+    assert (await _async_apply(core_voltage=CONTROL_MAX_CORE_VOLTAGE))["success"]
+    assert await _async_apply(frequency=575) == {"success": True, "error": None}
+    assert axeos.settings == [{"coreVoltage": CONTROL_MAX_CORE_VOLTAGE}, {"frequency": 575}]
+
+    with pytest.raises(vol.Invalid):
+        await _async_apply(core_voltage=CONTROL_MAX_CORE_VOLTAGE + 1)
+    with pytest.raises(vol.Invalid):
+        await _async_apply(core_voltage=CONTROL_MIN_CORE_VOLTAGE - 1)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_apply_settings_needs_target(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """A call without a target changes no miner, unless it asks for all of them."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="bitaxe",
+        data={CONF_HOST: axeos.host},
+        options={CONF_TAGS: "rack-1"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    hass.data[CONTROL_DATA_KEY].min_interval = 0
+
+    async def _async_call(**data: object) -> None:
+        await hass.services.async_call(
+            DOMAIN, SERVICE_APPLY_SETTINGS, data, blocking=True, return_response=True
+        )
+
+    with pytest.raises(ServiceValidationError):
+        await _async_call(restart=True)
+    with pytest.raises(ServiceValidationError):
+        await _async_call(tag="rack-1", all=True, fan_speed=50)
+    assert axeos.settings == []
+
+    await _async_call(tag="rack-1", fan_speed=50)
+    await _async_call(all=True, fan_speed=60)
+    assert axeos.settings == [{"fanspeed": 50}, {"fanspeed": 60}]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
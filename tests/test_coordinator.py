@@ -0,0 +1,143 @@
+"""Tests for the Bitaxe data update coordinator."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.bitaxe.api import BitaxeApiClient
+from custom_components.bitaxe.const import TIER_STATIC, TIER_STATS
+from custom_components.bitaxe.coordinator import (
+    BitaxeDataUpdateCoordinator,
+    BitaxeTierCoordinator,
+)
+
+from .axeos import StandInAxeOS, system_info
+
+
+def _coordinator(
+    hass: HomeAssistant, adaptive_bounds: tuple[int, int] | None = (10, 120)
+) -> BitaxeDataUpdateCoordinator:
+    """Return a coordinator for a miner that is never contacted."""
+    client = BitaxeApiClient("bitaxe.invalid", async_get_clientsession(hass))
+    return BitaxeDataUpdateCoordinator(hass, client, adaptive_bounds)
+
+
+def _interval(coordinator: BitaxeDataUpdateCoordinator) -> float:
+    return coordinator.poll_interval.total_seconds()
+
+
+async def test_adaptive_backs_off_while_stable(hass: HomeAssistant) -> None:
+    """Steady readings double the interval up to the maximum."""
+    coordinator = _coordinator(hass)
+    for temp, hashrate in ((55.0, 500.0), (55.4, 505.0), (55.1, 498.0)):
+        coordinator._adapt_interval(system_info(temp=temp, hashRate=hashrate))
+    # The first poll has nothing to compare with, so it does not count as stable
+    assert _interval(coordinator) == 15 * 2 * 2
+
+    for _ in range(2):
+        coordinator._adapt_interval(system_info(temp=55.0, hashRate=500.0))
+    assert _interval(coordinator) == 120
+    assert coordinator.polls_saved > 0
+
+
+async def test_adaptive_speeds_up_while_changing(hass: HomeAssistant) -> None:
+    """Readings that move between polls halve the interval."""
+    coordinator = _coordinator(hass)
+    coordinator.poll_interval = coordinator.poll_interval * 4
+    coordinator._adapt_interval(system_info(temp=50.0))
+    coordinator._adapt_interval(system_info(temp=53.0))
+    assert _interval(coordinator) == 30
+    coordinator._adapt_interval(system_info(temp=53.2, hashRate=450.0))
+    assert _interval(coordinator) == 15
+
+
+async def test_adaptive_polls_fast_when_hot(hass: HomeAssistant) -> None:
+    """A miner near its target temperature is polled at the minimum interval."""
+    coordinator = _coordinator(hass)
+    coordinator._adapt_interval(system_info(temp=58.0, temptarget=60))
+    assert _interval(coordinator) == 10
+
+
+async def test_adaptive_backs_off_while_unreachable(hass: HomeAssistant) -> None:
+    """Failed polls back off without a stability check."""
+    coordinator = _coordinator(hass)
+    coordinator._adapt_interval(None)
+    coordinator._adapt_interval(None)
+    assert _interval(coordinator) == 120
+
+
+async def test_history_sampled_on_every_refresh(hass: HomeAssistant) -> None:
+    """Unchanged readings are still samples; a failed refresh is not."""
+    coordinator = _coordinator(hass)
+    assert coordinator.history.capacity >= 900 / 10
+    for _ in range(2):
+        coordinator.async_set_updated_data(system_info())
+    assert len(coordinator.history.metrics["power"]) == 2
+
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+    assert len(coordinator.history.metrics["power"]) == 2
+
+
+async def test_polls_saved_only_counted_when_adaptive(hass: HomeAssistant) -> None:
+    """Without adaptive polling the interval is fixed and nothing is saved."""
+    coordinator = _coordinator(hass, adaptive_bounds=None)
+    coordinator.poll_interval = coordinator.poll_interval * 2
+    for _ in range(3):
+        coordinator._adapt_interval(system_info())
+    assert coordinator.polls == 3
+    assert coordinator.polls_saved == 0
+
+
+async def test_tier_polls_only_while_listened_to(hass: HomeAssistant) -> None:
+    """A tier without listeners is not refreshed by its timer."""
+    client = BitaxeApiClient("bitaxe.invalid", async_get_clientsession(hass))
+    fetches = []
+
+    async def _fetch() -> dict[str, Any]:
+        fetches.append(dt_util.utcnow())
+        return {"statistics": []}
+
+    tier = BitaxeTierCoordinator(hass, client, TIER_STATS, _fetch, 300)
+    await tier.async_refresh()
+    assert tier.data == {"statistics": []}
+
+    async def _wait(seconds: int) -> None:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+        await hass.async_block_till_done()
+
+    await _wait(301)
+    assert len(fetches) == 1
+
+    remove_listener = tier.async_add_listener(lambda: None)
+    await _wait(301)
+    assert len(fetches) == 2
+
+    remove_listener()
+    await _wait(602)
+    assert len(fetches) == 2
+
+
+async def test_tier_stops_for_unsupported_endpoint(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Firmware without the endpoint gives an empty payload and no more polls."""
+    client = BitaxeApiClient(axeos.host, async_get_clientsession(hass))
+    tier = BitaxeTierCoordinator(
+        hass, client, TIER_STATIC, client.async_get_asic_info, 3600
+    )
+    tier.async_add_listener(lambda: None)
+    await tier.async_refresh()
+
+    assert tier.last_update_success
+    assert tier.data == {}
+    assert not tier.supported
+    assert tier.update_interval is None
+    # The miner answered, so it still counts as reachable
+    assert client.breaker.failures == 0
+    await tier.async_shutdown()
@@ -0,0 +1,124 @@
+"""Tests for the streaming health of the ASICs of a board."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.bitaxe.const import (
+    HEALTH_ERROR_RATE,
+    HEALTH_LOW_HASHRATE,
+    HEALTH_TEMPERATURE,
+    HEALTH_WARMUP,
+)
+from custom_components.bitaxe.health import BitaxeAsicHealth, BitaxeEwma
+
+
+def _payload(
+    hashrates: list[float], temps: list[float], errors: list[int]
+) -> dict[str, Any]:
+    """Return the per-ASIC part of a payload."""
+    return {
+        "hashrateMonitor": {
+            "asics": [
+                {"total": hashrate, "errorCount": count}
+                for hashrate, count in zip(hashrates, errors, strict=True)
+            ]
+        },
+        "asicTemps": temps,
+    }
+
+
+def _feed(
+    health: BitaxeAsicHealth,
+    samples: int,
+    hashrates: list[float],
+    temps: list[float],
+    errors_per_minute: list[int],
+    start: int = 0,
+) -> int:
+    """Add one payload per minute; return the minutes fed in total."""
+    for minute in range(start, start + samples):
+        errors = [rate * minute for rate in errors_per_minute]
+        health.update(_payload(hashrates, temps, errors), now=minute * 60.0)
+    return start + samples
+
+
+def test_ewma() -> None:
+    """The first samples are a plain mean, then new samples weigh ``alpha``."""
+    ewma = BitaxeEwma(0.2)
+    assert ewma.as_dict() == {"count": 0, "mean": None, "stddev": None}
+    for value in (1.0, 2.0, 3.0):
+        ewma.add(value)
+    assert ewma.mean == pytest.approx(2.0)
+    assert ewma.variance == pytest.approx(2 / 3)
+
+    for _ in range(100):
+        ewma.add(10.0)
+    assert ewma.mean == pytest.approx(10.0)
+    assert ewma.stddev == pytest.approx(0.0, abs=1e-3)
+    ewma.add(20.0)
+    assert ewma.mean == pytest.approx(12.0)
+
+
+def test_healthy_board() -> None:
+    """Similar ASICs with a steady error rate are not flagged."""
+    health = BitaxeAsicHealth()
+    assert not health.supported
+    assert health.score is None
+
+    _feed(health, 3 * HEALTH_WARMUP, [250.0, 248.0, 252.0, 250.0], [55, 56, 55, 57], [1] * 4)
+    assert health.supported
+    assert not health.problem
+    assert health.score == pytest.approx(100, abs=0.5)
+    assert health.temp_spread == 2.0
+
+
+def test_flags_after_warmup() -> None:
+    """A slow and a hot ASIC are flagged once enough samples are known."""
+    health = BitaxeAsicHealth()
+    hashrates = [250.0, 150.0, 250.0, 250.0]
+    temps = [55, 55, 70, 55]
+    minutes = _feed(health, HEALTH_WARMUP - 1, hashrates, temps, [0] * 4)
+    assert not health.problem
+
+    _feed(health, 1, hashrates, temps, [0] * 4, start=minutes)
+    assert health.problems == {
+        HEALTH_LOW_HASHRATE: [2],
+        HEALTH_ERROR_RATE: [],
+        HEALTH_TEMPERATURE: [3],
+    }
+    # ASIC 2 scores its share of its peers' hash rate, ASIC 3 loses the penalty
+    assert health.score == pytest.approx(100 * (1 + 0.6 + 0.85 + 1) / 4, abs=0.1)
+
+
+def test_flags_accelerating_errors() -> None:
+    """Errors well above an ASIC's own baseline are flagged."""
+    health = BitaxeAsicHealth()
+    hashrates, temps = [250.0] * 3, [55] * 3
+    minutes = _feed(health, 2 * HEALTH_WARMUP, hashrates, temps, [1, 1, 1])
+    assert not health.problem
+
+    errors = [minutes * 1, minutes * 1, minutes * 1]
+    for minute in range(minutes, minutes + 10):
+        errors = [errors[0] + 1, errors[1] + 1, errors[2] + 30]
+        health.update(_payload(hashrates, temps, errors), now=minute * 60.0)
+    assert health.problems[HEALTH_ERROR_RATE] == [3]
+
+
+def test_counter_restart_and_board_change() -> None:
+    """Restarted error counters and a changed ASIC count don't break the baselines."""
+    health = BitaxeAsicHealth()
+    health.update(_payload([250.0, 250.0], [55, 55], [500, 800]), now=0.0)
+    # The miner restarted: the counters start over
+    health.update(_payload([250.0, 250.0], [55, 55], [2, 3]), now=60.0)
+    health.update(_payload([250.0, 250.0], [55, 55], [4, 6]), now=120.0)
+    asics = health.as_dict()["asics"]
+    assert [asic["error_rate"]["mean"] for asic in asics] == [2.0, 3.0]
+
+    # Unread sensors (0) and non-numbers are left out
+    health.update(_payload([250.0], [0], [4]), now=180.0)
+    assert len(health.as_dict()["asics"]) == 1
+    assert health.temp_spread is None
+    health.update({"asicTemps": [None, "n/a"]}, now=240.0)
+    assert len(health.as_dict()["asics"]) == 2
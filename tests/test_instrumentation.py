@@ -0,0 +1,83 @@
+"""Tests for the refresh timings and the connection counts."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bitaxe.api import BitaxeApiClient
+from custom_components.bitaxe.const import (
+    CONF_HOST,
+    CONF_INSTRUMENTATION,
+    DOMAIN,
+    STAGE_EXTRACT,
+    STAGE_FETCH,
+    STAGE_NOTIFY,
+    STAGE_PARSE,
+    STAGE_READ,
+    STAGE_REQUEST,
+)
+from custom_components.bitaxe.diagnostics import async_get_config_entry_diagnostics
+from custom_components.bitaxe.instrumentation import BitaxeStageTimings
+from custom_components.bitaxe.session import (
+    async_close_bitaxe_session,
+    async_get_bitaxe_session,
+)
+
+from .axeos import StandInAxeOS
+
+
+async def test_client_timings_and_connection_reuse(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Every request is timed per stage and reuses the kept-alive connection."""
+    bitaxe_session = async_get_bitaxe_session(hass)
+    client = BitaxeApiClient(axeos.host, bitaxe_session.session)
+    client.timings = BitaxeStageTimings()
+
+    for _ in range(3):
+        await client.async_get_system_info()
+        client.invalidate_cache()
+    timings = client.timings.as_dict()
+    assert set(timings) == {STAGE_REQUEST, STAGE_READ, STAGE_PARSE}
+    for stage in timings.values():
+        assert stage["count"] == 3
+        assert stage["p50"] <= stage["p95"] <= stage["p99"]
+    assert bitaxe_session.stats.as_dict(axeos.host) == {"created": 1, "reused": 2}
+
+    # Without instrumentation nothing is timed
+    client.timings = None
+    await client.async_get_system_info()
+    assert client.timings is None
+    assert bitaxe_session.stats.as_dict(axeos.host)["reused"] == 3
+
+    await async_close_bitaxe_session(hass)
+
+
+async def test_coordinator_timings_in_diagnostics(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """With the option enabled a refresh records every stage of the pipeline."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="bitaxe",
+        data={CONF_HOST: axeos.host},
+        options={CONF_INSTRUMENTATION: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.client.invalidate_cache()
+    await coordinator.async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    timings = diagnostics["timings"]
+    for stage in (STAGE_REQUEST, STAGE_READ, STAGE_PARSE, STAGE_FETCH, STAGE_EXTRACT, STAGE_NOTIFY):
+        assert timings[stage]["count"] >= 1
+    assert timings[STAGE_FETCH]["count"] == timings[STAGE_PARSE]["count"]
+    assert diagnostics["connections"]["created"] == 1
+    assert diagnostics["connections"]["reused"] >= 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await async_close_bitaxe_session(hass)
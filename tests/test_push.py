@@ -0,0 +1,80 @@
+"""Tests for push updates over the AxeOS log stream."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bitaxe.const import CONF_HOST, CONF_PUSH_UPDATES, DOMAIN
+from custom_components.bitaxe.push import is_refresh_event
+
+from .axeos import StandInAxeOS
+
+OVERHEAT = "\x1b[0;31mE (81234) power_management: OVERHEAT! VR: 105.0C ASIC: 75.0C\x1b[0m"
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        (OVERHEAT, True),
+        ("W (81234) TPS546: VOUT overvoltage fault", True),
+        ("E (81234) EMC2101: Failed to read fan speed", True),
+        ("I (81234) power_management: Vin: 5.05V, Vout: 1.15V, Power: 15.10W", False),
+        ("I (81234) stratum_task: rx: {\"error\":null,\"id\":12,\"result\":true}", False),
+        ("E (81234) stratum_task: Socket error, reconnecting", False),
+        ("I (81234) http_server: Restarting System because of API Request", False),
+        ("power fault error restart overheat", False),
+    ],
+)
+def test_refresh_events(line: str, expected: bool) -> None:
+    """Only events, not words in routine log lines, trigger a refresh."""
+    assert is_refresh_event(line) is expected
+
+
+async def _async_wait_for(condition) -> None:
+    """Let the event loop run until ``condition`` holds."""
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+async def test_push_updates(hass: HomeAssistant, axeos: StandInAxeOS) -> None:
+    """Pushed JSON and events update the coordinator; log noise does not."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="bitaxe",
+        data={CONF_HOST: axeos.host},
+        options={CONF_PUSH_UPDATES: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    await _async_wait_for(lambda: coordinator.push_connected)
+    requests = axeos.info_requests
+
+    for _ in range(20):
+        await axeos.async_send(
+            "I (81234) power_management: Vin: 5.05V, Vout: 1.15V, Power: 15.10W"
+        )
+    await axeos.async_send('{"hashRate": 512.5}')
+    await _async_wait_for(lambda: coordinator.data["hashRate"] == 512.5)
+    assert axeos.info_requests == requests
+
+    axeos.info["overheat_mode"] = 1
+    await axeos.async_send(OVERHEAT)
+    await _async_wait_for(lambda: coordinator.data["overheat_mode"] == 1)
+    assert axeos.info_requests == requests + 1
+
+    # Polling takes over as soon as the stream drops
+    await axeos.async_close_websockets()
+    await _async_wait_for(lambda: not coordinator.push_connected)
+    assert coordinator.update_interval == coordinator.poll_interval
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,128 @@
+"""Tests for the shared fleet poller."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from custom_components.bitaxe import scheduler as scheduler_module
+from custom_components.bitaxe.api import BitaxeApiClient
+from custom_components.bitaxe.const import (
+    FLEET_POLL_DEADLINE,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+)
+from custom_components.bitaxe.coordinator import BitaxeDataUpdateCoordinator
+from custom_components.bitaxe.scheduler import BitaxeFleetScheduler
+
+from .axeos import system_info
+
+
+class FakeClock:
+    """Stand-in for the time module as seen by the scheduler."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary moment."""
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the scheduler module only."""
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    return clock
+
+
+def _coordinator(
+    hass: HomeAssistant, priority: str, polled: list[str]
+) -> BitaxeDataUpdateCoordinator:
+    """Return a coordinator of the given poll priority that records its refreshes."""
+    client = BitaxeApiClient("bitaxe.invalid", async_get_clientsession(hass))
+    coordinator = BitaxeDataUpdateCoordinator(hass, client)
+    coordinator.async_set_updated_data(system_info())
+    coordinator.critical = priority == PRIORITY_HIGH
+    coordinator.last_update_success = priority != PRIORITY_LOW
+
+    async def _async_refresh() -> None:
+        polled.append(priority)
+
+    coordinator.async_refresh = _async_refresh
+    return coordinator
+
+
+def _scheduler(
+    hass: HomeAssistant, due_at: float
+) -> tuple[BitaxeFleetScheduler, dict[str, BitaxeDataUpdateCoordinator], list[str]]:
+    """Return a single-worker scheduler with one miner of each priority due."""
+    scheduler = BitaxeFleetScheduler(hass, max_concurrency=1)
+    polled: list[str] = []
+    coordinators: dict[str, BitaxeDataUpdateCoordinator] = {}
+    # Added lowest priority first, so only the priority decides the order
+    for priority in (PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH):
+        coordinators[priority] = _coordinator(hass, priority, polled)
+        scheduler.async_add(priority, coordinators[priority])
+        scheduler._next_due[priority] = due_at
+    return scheduler, coordinators, polled
+
+
+async def test_polls_by_priority(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Due miners are polled most urgent first."""
+    scheduler, coordinators, polled = _scheduler(hass, clock.now)
+    assert coordinators[PRIORITY_LOW].poll_priority == PRIORITY_LOW
+
+    scheduler._async_tick(dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert polled == [PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW]
+    assert scheduler.polls == 3
+    assert all(stats.missed_deadlines == 0 for stats in scheduler.stats.values())
+
+    await scheduler.async_shutdown()
+
+
+async def test_late_polls_are_counted_and_shed(
+    hass: HomeAssistant, clock: FakeClock
+) -> None:
+    """Late polls count as missed; late polls of unreachable miners are skipped."""
+    scheduler, coordinators, polled = _scheduler(hass, clock.now - FLEET_POLL_DEADLINE - 1)
+
+    scheduler._async_tick(dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert polled == [PRIORITY_HIGH, PRIORITY_NORMAL]
+    for priority, coordinator in coordinators.items():
+        assert scheduler.stats[priority].missed_deadlines == 1
+        assert coordinator.missed_deadlines[priority] == 1
+    assert scheduler.stats[PRIORITY_LOW].shed == coordinators[PRIORITY_LOW].polls_shed == 1
+    assert scheduler.stats[PRIORITY_LOW].polls == 0
+
+    # The shed miner waits for its next interval instead of being queued again
+    scheduler._async_tick(dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert polled == [PRIORITY_HIGH, PRIORITY_NORMAL]
+
+    await scheduler.async_shutdown()
+
+
+async def test_next_poll_keeps_phase(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Intervals missed during a stall are skipped without shifting the phase."""
+    scheduler, coordinators, _ = _scheduler(hass, clock.now)
+    coordinator = coordinators[PRIORITY_NORMAL]
+    interval = coordinator.refresh_interval.total_seconds()
+
+    due_at = clock.now
+    clock.now += 2.5 * interval
+    scheduler._schedule_next(PRIORITY_NORMAL, coordinator)
+    assert scheduler._next_due[PRIORITY_NORMAL] == due_at + 3 * interval
+
+    # A poll just in time is next due one interval later
+    clock.now = due_at + 3 * interval
+    scheduler._schedule_next(PRIORITY_NORMAL, coordinator)
+    assert scheduler._next_due[PRIORITY_NORMAL] == due_at + 4 * interval
+
+    await scheduler.async_shutdown()
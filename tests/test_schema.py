@@ -0,0 +1,114 @@
+"""Tests for the payload schema index and the sensor planner."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bitaxe.const import CONF_HOST, DOMAIN, REQUEST_CACHE_DATA_KEY
+from custom_components.bitaxe.schema import BitaxeSchema, BitaxeSchemaIndex
+
+from .axeos import StandInAxeOS, system_info
+
+
+async def test_index_follows_entries(hass: HomeAssistant) -> None:
+    """Each entry uses the schema of its payload; unused schemas are dropped."""
+    index = BitaxeSchemaIndex(hass)
+    await index.async_load([])
+    schema = index.async_get("first", system_info())
+    # Another board with the same firmware and ASIC has its own schema
+    other = index.async_get("second", system_info(boardVersion="601", temp2=48.0))
+    assert other is not schema
+    assert "temp2" in other.keys
+    assert index.async_get("third", system_info()) is schema
+
+    # Before the first refresh the entry's last schema is the hint
+    assert index.async_get("second", None) is other
+    assert index.async_get("fourth", {}) == BitaxeSchema(frozenset())
+
+    index.async_get("second", system_info(version="v2.6.0", boardVersion="601"))
+    assert set(index._data_to_save()["schemas"]) == {
+        "v2.5.0|BM1370|unknown",
+        "v2.6.0|BM1370|601",
+    }
+    index.async_remove("first")
+    index.async_remove("third")
+    assert set(index._data_to_save()["schemas"]) == {"v2.6.0|BM1370|601"}
+
+
+async def test_index_drops_removed_entries_on_load(
+    hass: HomeAssistant, hass_storage: dict
+) -> None:
+    """Schemas of entries removed while Home Assistant was down are dropped."""
+    index = BitaxeSchemaIndex(hass)
+    await index.async_load([])
+    index.async_get("kept", system_info())
+    index.async_get("removed", system_info(boardVersion="601"))
+    hass_storage[index._store.key] = {
+        "version": index._store.version,
+        "minor_version": 1,
+        "key": index._store.key,
+        "data": index._data_to_save(),
+    }
+
+    reloaded = BitaxeSchemaIndex(hass)
+    await reloaded.async_load(["kept"])
+    assert reloaded._data_to_save() == {
+        "schemas": {"v2.5.0|BM1370|unknown": index.async_get("kept", None).as_dict()},
+        "entries": {"kept": "v2.5.0|BM1370|unknown"},
+    }
+
+
+async def test_planner_uses_own_payload(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Miners sharing a schema ID only get sensors for keys they report."""
+    registry = er.async_get(hass)
+    entries = []
+    for info in (system_info(temp2=48.0), system_info()):
+        axeos.info = info
+        entry = MockConfigEntry(domain=DOMAIN, title="bitaxe", data={CONF_HOST: axeos.host})
+        entry.add_to_hass(hass)
+        if (cache := hass.data.get(REQUEST_CACHE_DATA_KEY)) is not None:
+            cache.invalidate(axeos.host)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entries.append(entry)
+
+    with_temp2, without = entries
+    assert registry.async_get_entity_id("sensor", DOMAIN, f"{with_temp2.entry_id}_temp2")
+    assert registry.async_get_entity_id("sensor", DOMAIN, f"{without.entry_id}_temp2") is None
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_planner_follows_keys_of_its_miner(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Keys appearing on one miner add its sensors."""
+    entry = MockConfigEntry(domain=DOMAIN, title="bitaxe", data={CONF_HOST: axeos.host})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    registry = er.async_get(hass)
+    assert registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_temp2") is None
+
+    axeos.info = system_info(temp2=48.0)
+    coordinator.client.invalidate_cache()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_temp2")
+    assert hass.states.get(entity_id).state == "48.0"
+
+    # A key disappearing leaves its sensor, which reports unknown
+    axeos.info = system_info()
+    coordinator.client.invalidate_cache()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "unknown"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
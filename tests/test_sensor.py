@@ -0,0 +1,155 @@
+"""Tests for the Bitaxe sensors."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bitaxe.const import (
+    CONF_DEADBANDS,
+    CONF_HOST,
+    CONF_PER_ASIC_SENSORS,
+    DOMAIN,
+    FLEET_TOTALS_DATA_KEY,
+    REQUEST_CACHE_DATA_KEY,
+)
+
+from .axeos import StandInAxeOS, system_info
+
+
+async def test_per_asic_sensors_follow_option(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Turning the option on enables the per-ASIC sensors registered before."""
+    axeos.info = system_info(
+        asicCount=2,
+        asicTemps=[55.1, 56.3],
+        hashrateMonitor={
+            "asics": [{"total": 250.0, "errorCount": 0}, {"total": 248.2, "errorCount": 1}]
+        },
+    )
+    entry = MockConfigEntry(domain=DOMAIN, title="bitaxe", data={CONF_HOST: axeos.host})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_asicTemp2")
+    assert entity_id is not None
+    assert registry.async_get(entity_id).disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    errors = hass.states.get(
+        registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_asic_errors_stats")
+    )
+    assert errors.state == "0.5"
+    assert errors.attributes["max"] == 1
+
+    hass.config_entries.async_update_entry(entry, options={CONF_PER_ASIC_SENSORS: True})
+    await hass.async_block_till_done()
+    assert registry.async_get(entity_id).disabled_by is None
+    assert hass.states.get(entity_id).state == "56.3"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_asic_stats_deadband(hass: HomeAssistant, axeos: StandInAxeOS) -> None:
+    """The aggregate is written when the mean or an attribute leaves the deadband."""
+    axeos.info = system_info(asicCount=2, asicTemps=[55.1, 56.3])
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="bitaxe",
+        data={CONF_HOST: axeos.host},
+        options={CONF_DEADBANDS: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_asic_temp_stats"
+    )
+
+    async def _refresh(temps: list[float]) -> str:
+        axeos.info["asicTemps"] = temps
+        coordinator.client.invalidate_cache()
+        await coordinator.async_refresh()
+        return hass.states.get(entity_id).state
+
+    assert hass.states.get(entity_id).state == "55.7"
+    assert await _refresh([55.3, 56.4]) == "55.7"
+    # The mean barely moves, but the spread does
+    assert await _refresh([54.4, 57.4]) == "55.9"
+    assert await _refresh([56.4, 57.4]) == "56.9"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_energy_ignores_failed_refresh(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """A failed refresh keeps the last payload, which is not a new reading."""
+    entry = MockConfigEntry(domain=DOMAIN, title="bitaxe", data={CONF_HOST: axeos.host})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_energy"
+    )
+    energy = hass.data["entity_components"]["sensor"].get_entity(entity_id)
+    coordinator.client.invalidate_cache()
+    await coordinator.async_refresh()
+    sampled = energy.extra_restore_state_data
+
+    axeos.offline = True
+    coordinator.client.invalidate_cache()
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert energy.extra_restore_state_data == sampled
+    assert hass.states.get(entity_id).state == "unavailable"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_cached_payload_is_not_reported(
+    hass: HomeAssistant, axeos: StandInAxeOS
+) -> None:
+    """Sensors set up from the cached payload stay unavailable until the miner answers."""
+    entry = MockConfigEntry(domain=DOMAIN, title="bitaxe", data={CONF_HOST: axeos.host})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    axeos.offline = True
+    hass.data[REQUEST_CACHE_DATA_KEY].invalidate(axeos.host)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_hashRate"
+    )
+    assert hass.states.get(entity_id).state == "unavailable"
+    totals = hass.data[FLEET_TOTALS_DATA_KEY].totals[None]
+    assert totals.online == 0
+    assert totals.hash_rate == 0.0
+
+    axeos.offline = False
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.client.breaker.record_success()
+    coordinator.client.invalidate_cache()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == str(axeos.info["hashRate"])
+    assert totals.online == 1
+    # Formatted by older firmware
+    best_diff = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_bestDiff"
+    )
+    assert float(hass.states.get(best_diff).state) == 4.29e9
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,106 @@
+"""Tests for the bounded time series of recent samples."""
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+
+from custom_components.bitaxe.const import HISTORY_METRICS
+from custom_components.bitaxe.timeseries import BitaxeRingBuffer, BitaxeTimeSeries
+
+
+def test_ring_buffer_matches_window_statistics() -> None:
+    """The rolling statistics equal those of the samples still in the buffer."""
+    rng = random.Random(0)
+    buffer = BitaxeRingBuffer(16)
+    values: list[float] = []
+    # Enough samples to wrap several times and resum the running sums
+    for when in range(200):
+        value = rng.uniform(40, 70)
+        buffer.append(float(when), value)
+        values = [*values, value][-16:]
+        assert len(buffer) == len(values)
+        assert buffer.min == min(values)
+        assert buffer.max == max(values)
+        assert buffer.mean == pytest.approx(statistics.fmean(values))
+        assert buffer.stddev == pytest.approx(statistics.pstdev(values), abs=1e-9)
+    assert buffer.first == (184.0, values[0])
+    assert buffer.last == (199.0, values[-1])
+
+
+def test_ring_buffer_evicts_old_samples() -> None:
+    """Samples before the cutoff are dropped, with their minimum and maximum."""
+    buffer = BitaxeRingBuffer(8)
+    for when, value in enumerate((1.0, 9.0, 5.0, 3.0)):
+        buffer.append(float(when), value)
+    buffer.evict_before(2.0)
+    assert len(buffer) == 2
+    assert (buffer.min, buffer.max, buffer.mean) == (3.0, 5.0, 4.0)
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.first is buffer.last is None
+    assert buffer.as_dict() == {
+        "count": 0,
+        "mean": None,
+        "min": None,
+        "max": None,
+        "stddev": None,
+    }
+
+
+def test_time_series_window_and_rates() -> None:
+    """Statistics cover the window; counter rates are per minute."""
+    series = BitaxeTimeSeries(capacity=100, window=60)
+    for second in range(0, 121, 10):
+        series.add(
+            {
+                "hashRate": 500.0,
+                "power": 10.0 if second < 60 else 15.0,
+                "temp": 55,
+                "sharesAccepted": second * 2,
+                "sharesRejected": second // 10,
+                # Ignored: not a number
+                "ASICModel": "BM1370",
+            },
+            now=float(second),
+        )
+    assert set(series.as_dict()) == set(HISTORY_METRICS)
+    # Samples from 60 s on remain
+    assert len(series.metrics["power"]) == 7
+    assert series.metrics["power"].mean == 15.0
+    assert series.shares_per_minute == 120.0
+    assert series.reject_ratio == pytest.approx(100 * 6 / 126, abs=0.01)
+    assert series.efficiency == 30.0
+
+
+def test_time_series_spans_window_at_fastest_refresh() -> None:
+    """The buffers grow to cover the window when samples come more often."""
+    assert BitaxeTimeSeries(capacity=100, window=60).capacity == 100
+    series = BitaxeTimeSeries(capacity=10, window=60, min_spacing=5)
+    assert series.capacity == 13
+    for second in range(0, 121, 5):
+        series.add({"power": float(second)}, now=float(second))
+    assert series.metrics["power"].first == (60.0, 60.0)
+
+
+def test_time_series_counter_restart() -> None:
+    """A counter going backwards starts over instead of a negative rate."""
+    series = BitaxeTimeSeries(capacity=10)
+    series.add({"sharesAccepted": 1000}, now=0.0)
+    series.add({"sharesAccepted": 1060}, now=60.0)
+    series.add({"sharesAccepted": 5}, now=90.0)
+    assert series.rate("sharesAccepted") is None
+    series.add({"sharesAccepted": 35}, now=120.0)
+    assert series.rate("sharesAccepted") == 60.0
+
+
+def test_time_series_without_data() -> None:
+    """Missing, boolean and zero hash rate readings give no statistics."""
+    series = BitaxeTimeSeries(capacity=10)
+    series.add({"power": True, "hashRate": 0.0}, now=0.0)
+    assert len(series.metrics["power"]) == 0
+    assert series.efficiency is None
+    assert series.shares_per_minute is None
+    assert series.reject_ratio is None
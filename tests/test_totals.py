@@ -0,0 +1,89 @@
+"""Tests for the fleet totals."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.bitaxe import totals as totals_module
+from custom_components.bitaxe.api import BitaxeApiClient
+from custom_components.bitaxe.coordinator import BitaxeDataUpdateCoordinator
+from custom_components.bitaxe.totals import BitaxeFleetTotals, parse_tags
+
+from .axeos import system_info
+
+
+def _coordinator(hass: HomeAssistant, **changes: float) -> BitaxeDataUpdateCoordinator:
+    """Return a coordinator that has refreshed a payload, without a miner."""
+    client = BitaxeApiClient("bitaxe.invalid", async_get_clientsession(hass))
+    coordinator = BitaxeDataUpdateCoordinator(hass, client)
+    coordinator.async_set_updated_data(system_info(**changes))
+    return coordinator
+
+
+async def test_miners_and_tags(hass: HomeAssistant) -> None:
+    """Miners add to the fleet and their tags, and are taken out again."""
+    fleet = BitaxeFleetTotals(hass)
+    notified = []
+    fleet.async_add_listener(lambda: notified.append(True))
+    first = _coordinator(hass, hashRate=500.0, power=15.0, sharesAccepted=100)
+    second = _coordinator(hass, hashRate=1000.0, power=20.0, sharesAccepted=50)
+    fleet.async_add_miner("first", first, parse_tags("garage, gamma"))
+    remove_second = fleet.async_add_miner("second", second, parse_tags("garage"))
+
+    garage, gamma = fleet.totals["garage"], fleet.totals["gamma"]
+    assert fleet.totals[None].hash_rate == garage.hash_rate == 1500.0
+    assert fleet.totals[None].shares_accepted == 150
+    assert (garage.miners, garage.online) == (2, 2)
+    assert (gamma.miners, gamma.hash_rate) == (1, 500.0)
+    assert fleet.totals[None].efficiency == round(35.0 / 1.5, 2)
+
+    # Changes of many miners result in one notification
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert len(notified) == 1
+
+    # An unreachable miner no longer adds to the rates, but keeps its counters
+    second.last_update_success = False
+    second.async_update_listeners()
+    assert (garage.online, garage.hash_rate, garage.power) == (1, 500.0, 15.0)
+    assert garage.shares_accepted == 150
+
+    remove_second()
+    assert fleet.totals[None].miners == garage.miners == 1
+    assert fleet.totals[None].shares_accepted == 100
+    second.async_set_updated_data(system_info(hashRate=2000.0))
+    assert fleet.totals[None].hash_rate == 500.0
+
+    first.last_update_success = False
+    first.async_update_listeners()
+    assert fleet.totals[None].online == 0
+    assert fleet.totals[None].efficiency is None
+
+
+async def test_sums_are_recomputed(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Float errors of the incremental updates do not add up."""
+    monkeypatch.setattr(totals_module, "FLEET_TOTALS_RESUM_UPDATES", 10)
+    fleet = BitaxeFleetTotals(hass)
+    first = _coordinator(hass, hashRate=0.1)
+    second = _coordinator(hass, hashRate=0.2)
+    fleet.async_add_miner("first", first)
+    fleet.async_add_miner("second", second)
+
+    for step in range(2, 11):
+        first.async_set_updated_data(system_info(hashRate=0.1 * step))
+    first.async_set_updated_data(system_info(hashRate=0.7))
+    # Summed again, in the order the miners were added
+    assert fleet.totals[None].hash_rate == 0.0 + 0.7 + 0.2
+
+
+def test_parse_tags() -> None:
+    """Tags are trimmed, and empty or repeated ones dropped."""
+    assert parse_tags(" garage,,gamma , garage") == ("garage", "gamma")
+    assert parse_tags("") == ()
@@ -0,0 +1,91 @@
+"""Tests for the frequency and voltage search."""
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from custom_components.bitaxe.const import (
+    AUTOTUNE_EFFICIENCY_TOLERANCE,
+    AUTOTUNE_FREQUENCY_SPREAD,
+    AUTOTUNE_FREQUENCY_STEP,
+    AUTOTUNE_MAX_HASHRATE_CV,
+    AUTOTUNE_MAX_STEPS,
+    AUTOTUNE_MAX_VR_TEMP,
+    AUTOTUNE_MIN_HASHRATE_RATIO,
+    AUTOTUNE_VOLTAGE_SPREAD,
+    AUTOTUNE_VOLTAGE_STEP,
+)
+from custom_components.bitaxe.tuning import (
+    BitaxeSimulatedMiner,
+    TuningBounds,
+    TuningSearch,
+    simulate,
+    tuning_grid,
+)
+
+START = (525, 1150)
+
+
+def _search(max_temp: float, max_power: float | None) -> TuningSearch:
+    """Return a search over the grid around START, with the default limits."""
+    return TuningSearch(
+        tuning_grid(None, START[0], AUTOTUNE_FREQUENCY_STEP, AUTOTUNE_FREQUENCY_SPREAD),
+        tuning_grid(None, START[1], AUTOTUNE_VOLTAGE_STEP, AUTOTUNE_VOLTAGE_SPREAD),
+        START,
+        TuningBounds(
+            max_temp=max_temp,
+            max_power=max_power,
+            max_vr_temp=AUTOTUNE_MAX_VR_TEMP,
+            min_hashrate_ratio=AUTOTUNE_MIN_HASHRATE_RATIO,
+            max_hashrate_cv=AUTOTUNE_MAX_HASHRATE_CV,
+        ),
+        AUTOTUNE_MAX_STEPS,
+        AUTOTUNE_EFFICIENCY_TOLERANCE,
+    )
+
+
+@pytest.mark.parametrize(("max_temp", "max_power"), [(63, 40), (61, None), (70, 19)])
+def test_search_converges(max_temp: float, max_power: float | None) -> None:
+    """The search ends at the most efficient acceptable setting of the grid."""
+    miner = BitaxeSimulatedMiner(noise=0.0)
+    search = _search(max_temp, max_power)
+    best = simulate(search, miner)
+
+    assert search.done
+    assert len(search.history) < AUTOTUNE_MAX_STEPS
+    assert best is not None
+    assert best.acceptable(search.bounds)
+    assert best.efficiency <= miner.measure(*START).efficiency
+
+    # Every setting of the grid, measured on the same noise-free model
+    optimum = min(
+        measurement.efficiency
+        for frequency in search.frequencies
+        for voltage in search.voltages
+        if (measurement := miner.measure(frequency, voltage)).acceptable(search.bounds)
+    )
+    assert best.efficiency == pytest.approx(optimum, rel=AUTOTUNE_EFFICIENCY_TOLERANCE)
+
+
+def test_grid_within_limits() -> None:
+    """Without listed options the grid around the setting stays within the limits."""
+    assert tuning_grid(None, 1350, 50, 100, (900, 1400)) == [1250, 1300, 1350, 1400]
+    # Listed options are the limits of the miner itself
+    assert tuning_grid([1100, 1200], 1150, 50, 100, (900, 1150)) == [1100, 1150, 1200]
+
+
+def test_tuning_loads_without_home_assistant() -> None:
+    """The module can be loaded on its own, as the benchmarks do."""
+    path = Path(__file__).parent.parent / "custom_components" / "bitaxe" / "tuning.py"
+    script = (
+        "import importlib.util, sys\n"
+        f"spec = importlib.util.spec_from_file_location('tuning', {str(path)!r})\n"
+        "module = importlib.util.module_from_spec(spec)\n"
+        "sys.modules['tuning'] = module\n"
+        "spec.loader.exec_module(module)\n"
+        "assert not any(name.startswith('homeassistant') for name in sys.modules)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)